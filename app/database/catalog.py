@@ -0,0 +1,177 @@
+"""Incremental maintenance of the ``project_catalog`` read model.
+
+After every flush, the ids of projects whose catalog row may have changed are
+collected from the session (projects, their milestones, their professor and
+the professor's user name, including deleted professors and users) and those
+rows are recomputed from the base tables
+with a single ``INSERT ... SELECT`` on the same connection, so the catalog
+commits or rolls back together with the change that caused it.
+
+Bulk statements (``db.execute(insert(...))``, ``query.update()``) bypass the
+flush and must call ``refresh_catalog`` or ``rebuild_catalog`` themselves.
+"""
+
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, select
+from sqlalchemy.orm import Session
+
+from app.database.models.catalog_models import ProjectCatalogEntry
+from app.database.models.professor_models import Professor
+from app.database.models.project_models import Milestone, Project
+from app.database.models.user_models import User
+
+CATALOG_COLUMNS = (
+    "project_id",
+    "title",
+    "summary",
+    "professor_name",
+    "department",
+    "year",
+    "tags",
+    "deadline",
+    "status",
+)
+PROJECT_ATTRIBUTES = ("title", "description", "year", "tags", "status", "professor_id")
+MILESTONE_ATTRIBUTES = ("due_date", "project_id")
+PROFESSOR_ATTRIBUTES = ("department", "user_id")
+REFRESH_CHUNK_SIZE = 500
+
+
+def catalog_source():
+    """Select computing catalog rows from the base tables."""
+    deadline = (
+        select(func.max(Milestone.due_date))
+        .where(Milestone.project_id == Project.id)
+        .correlate(Project)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Project.id,
+            Project.title,
+            Project.description,
+            User.full_name,
+            Professor.department,
+            Project.year,
+            Project.tags,
+            deadline,
+            Project.status,
+        )
+        .select_from(Project)
+        .outerjoin(Professor, Professor.id == Project.professor_id)
+        .outerjoin(User, User.id == Professor.user_id)
+    )
+
+
+def _insert_from(source):
+    source = source.add_columns(literal(datetime.now(timezone.utc)))
+    return insert(ProjectCatalogEntry).from_select(
+        list(CATALOG_COLUMNS) + ["refreshed_at"], source
+    )
+
+
+def refresh_catalog(connection, project_ids: Iterable[int]):
+    """Recompute the catalog rows of the given projects; deleted projects drop out."""
+    project_ids = sorted(set(project_ids))
+    for start in range(0, len(project_ids), REFRESH_CHUNK_SIZE):
+        chunk = project_ids[start : start + REFRESH_CHUNK_SIZE]
+        connection.execute(
+            delete(ProjectCatalogEntry).where(ProjectCatalogEntry.project_id.in_(chunk))
+        )
+        connection.execute(_insert_from(catalog_source().where(Project.id.in_(chunk))))
+
+
+def rebuild_catalog(db: Session) -> int:
+    """Recompute the whole catalog. Returns the number of rows written."""
+    db.execute(delete(ProjectCatalogEntry))
+    db.execute(_insert_from(catalog_source()))
+    db.commit()
+    return db.query(func.count(ProjectCatalogEntry.project_id)).scalar()
+
+
+def check_catalog(db: Session) -> dict:
+    """Compare the catalog with the base tables without changing anything."""
+    expected = {row[0]: tuple(row) for row in db.execute(catalog_source())}
+    actual = {
+        row[0]: tuple(row)
+        for row in db.execute(
+            select(*(getattr(ProjectCatalogEntry, name) for name in CATALOG_COLUMNS))
+        )
+    }
+    return {
+        "rows": len(actual),
+        "missing": sorted(expected.keys() - actual.keys()),
+        "extra": sorted(actual.keys() - expected.keys()),
+        "stale": sorted(
+            project_id
+            for project_id in expected.keys() & actual.keys()
+            if expected[project_id] != actual[project_id]
+        ),
+    }
+
+
+def _changed(instance, attributes) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+def _previous_value(instance, attribute):
+    deleted = inspect(instance).attrs[attribute].history.deleted
+    return deleted[0] if deleted else None
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session, flush_context):
+    project_ids = set()
+    professor_ids = set()
+    user_ids = set()
+
+    for instance in chain(session.new, session.deleted):
+        if isinstance(instance, Project):
+            project_ids.add(instance.id)
+        elif isinstance(instance, Milestone):
+            project_ids.add(instance.project_id)
+
+    # Rows still pointing at a deleted professor or user lose its name and
+    # department; rows whose foreign key the flush set to NULL are dirty below
+    for instance in session.deleted:
+        if isinstance(instance, Professor):
+            professor_ids.add(instance.id)
+        elif isinstance(instance, User):
+            user_ids.add(instance.id)
+
+    for instance in session.dirty:
+        if isinstance(instance, Project) and _changed(instance, PROJECT_ATTRIBUTES):
+            project_ids.add(instance.id)
+        elif isinstance(instance, Milestone) and _changed(instance, MILESTONE_ATTRIBUTES):
+            project_ids.add(instance.project_id)
+            # A milestone moved to another project changes both deadlines
+            project_ids.add(_previous_value(instance, "project_id"))
+        elif isinstance(instance, Professor) and _changed(instance, PROFESSOR_ATTRIBUTES):
+            professor_ids.add(instance.id)
+        elif isinstance(instance, User) and _changed(instance, ("full_name",)):
+            user_ids.add(instance.id)
+
+    if not (project_ids or professor_ids or user_ids):
+        return
+
+    connection = session.connection()
+    if user_ids:
+        professor_ids.update(
+            connection.execute(
+                select(Professor.id).where(Professor.user_id.in_(user_ids))
+            ).scalars()
+        )
+    if professor_ids:
+        project_ids.update(
+            connection.execute(
+                select(Project.id).where(Project.professor_id.in_(professor_ids))
+            ).scalars()
+        )
+
+    project_ids.discard(None)
+    if project_ids:
+        refresh_catalog(connection, project_ids)
@@ -0,0 +1,108 @@
+"""Per-request database instrumentation.
+
+Statement count, total DB time and ORM rows loaded are collected through
+SQLAlchemy events and attached to the current request. Routes can declare a
+query budget with the ``query_budget`` dependency.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.utils.logger import get_logger
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    budget: Optional[int] = None
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a route issues more statements than its budget."""
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats for the request being handled, or None outside a request."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _on_load(target, context):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.rows += 1
+
+
+def instrument_engine(engine, base=None):
+    """Attach the statement and row counters to an engine and declarative base."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if base is not None:
+        event.listen(base, "load", _on_load, propagate=True)
+
+
+def query_budget(max_queries: int):
+    """Dependency declaring the maximum number of statements a route may issue.
+
+    Usage: ``@router.get(..., dependencies=[Depends(query_budget(5))])``.
+    A budget declared on the route overrides one declared on its router.
+    """
+
+    def _set_budget():
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+
+    return _set_budget
+
+
+async def db_metrics_middleware(request: Request, call_next):
+    """Track DB usage for each request and enforce the route's query budget."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    if settings.DB_METRICS_HEADERS:
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["X-DB-Time-ms"] = f"{stats.db_time * 1000:.2f}"
+        response.headers["X-DB-Rows"] = str(stats.rows)
+
+    if stats.budget is not None and stats.queries > stats.budget:
+        message = (
+            f"{request.method} {request.url.path} issued {stats.queries} queries "
+            f"(budget {stats.budget})"
+        )
+        if settings.DB_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    return response
@@ -0,0 +1,42 @@
+"""Apply Alembic migrations to the configured database."""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.database.db import engine
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Revision matching the schema that Base.metadata.create_all used to build
+BASELINE_REVISION = "0001"
+
+
+def get_alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade_database():
+    """Upgrade the database to the latest revision.
+
+    Databases created before migrations existed (tables present but no
+    ``alembic_version``) are stamped at the baseline revision first.
+    """
+    config = get_alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        logger.info(f"Stamping existing schema at revision {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    upgrade_database()
@@ -1,4 +1,6 @@
 from .admin_models import Admin
+from .catalog_models import ProjectCatalogEntry
+from .outbox_models import OutboxMessage
 from .professor_models import Professor
 from .project_models import (
     Project,
@@ -9,6 +11,7 @@ from .project_models import (
     ProjectResource,
     SubmissionDocument,
 )
+from .storage_models import StoredBlob
 from .student_models import Student
 from .user_models import User
 
@@ -17,11 +20,17 @@ __all__ = [
     "Milestone",
     "Professor",
     "MilestoneSubmission",
+    "OutboxMessage",
     "Project",
+    "ProjectCatalogEntry",
     "ProjectTeam",
     "TeamMember",
     "ProjectResource",
     "SubmissionDocument",
+    "StoredBlob",
     "Student",
     "User",
 ]
+
+# Registers the session hooks that keep project_catalog up to date
+from app.database import catalog  # noqa: E402,F401
@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Index, Integer, JSON, String, Text
+
+from app.database.db import Base
+from app.schemas.enum_schemas import DepartmentEnum, ProjectStatusEnum, YearEnum
+
+
+class ProjectCatalogEntry(Base):
+    """Denormalized, read-only view of a project for the student catalog.
+
+    Maintained by ``app.database.catalog`` whenever a project, its milestones
+    or its professor change; never written to directly.
+    """
+
+    __tablename__ = "project_catalog"
+
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    title = Column(String, nullable=False)
+    summary = Column(Text, nullable=False)
+    professor_name = Column(String, nullable=True)
+    department = Column(Enum(DepartmentEnum), nullable=True)
+    year = Column(Enum(YearEnum), nullable=False)
+    tags = Column(JSON, nullable=True)
+    deadline = Column(Date, nullable=True)
+    status = Column(Enum(ProjectStatusEnum), nullable=True)
+    refreshed_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_project_catalog_status_project_id", "status", "project_id"),
+    )
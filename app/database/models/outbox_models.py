@@ -0,0 +1,41 @@
+import enum
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String, Text
+
+from app.database.db import Base
+
+
+def utcnow() -> datetime:
+    """Naive UTC timestamp, comparable across SQLite and Postgres columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class OutboxStatusEnum(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class OutboxMessage(Base):
+    """Deferred side effect, written in the transaction of the change causing it."""
+
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    idempotency_key = Column(String, unique=True, nullable=True)
+    status = Column(Enum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=utcnow)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_messages_status_available_at", "status", "available_at"),
+    )
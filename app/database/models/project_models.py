@@ -7,6 +7,7 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -28,6 +29,7 @@ class Project(Base):
     status = Column(
         Enum(ProjectStatusEnum),
         default=ProjectStatusEnum.OPEN,
+        index=True,
     )
 
     professor_id = Column(Integer, ForeignKey("professors.id"))
@@ -39,14 +41,17 @@ class Project(Base):
     resources = relationship("ProjectResource", back_populates="project", cascade="all, delete")
     team_applications = relationship("TeamApplication", back_populates="project", cascade="all, delete")
 
+    __table_args__ = (Index("ix_projects_professor_id_status", "professor_id", "status"),)
+
 
 class ProjectResource(Base):
     __tablename__ = "project_resources"
 
     id = Column(Integer, primary_key=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)
     uploaded_at = Column(DateTime, default=datetime.now(timezone.utc))
     
     project = relationship("Project", back_populates="resources")
@@ -65,12 +70,14 @@ class Milestone(Base):
     project = relationship("Project", back_populates="milestones")
     team_submission = relationship("MilestoneSubmission", back_populates="milestone", uselist=False)
 
+    __table_args__ = (Index("ix_milestones_project_id_due_date", "project_id", "due_date"),)
+
 
 class MilestoneSubmission(Base):
     __tablename__ = "milestone_submissions"
 
     id = Column(Integer, primary_key=True)
-    team_id = Column(Integer, ForeignKey("project_teams.id"))
+    team_id = Column(Integer, ForeignKey("project_teams.id"), index=True)
     milestone_id = Column(Integer, ForeignKey("milestones.id"), unique=True)
     submitted_at = Column(DateTime, default=datetime.utcnow)
     grade = Column(Float, nullable=True)
@@ -85,9 +92,10 @@ class SubmissionDocument(Base):
     __tablename__ = "submission_documents"
 
     id = Column(Integer, primary_key=True)
-    submission_id = Column(Integer, ForeignKey("milestone_submissions.id"))
+    submission_id = Column(Integer, ForeignKey("milestone_submissions.id"), index=True)
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True, index=True)
     uploaded_at = Column(DateTime, default=datetime.now(timezone.utc))
 
     submission = relationship("MilestoneSubmission", back_populates="documents")
@@ -99,7 +107,7 @@ class ProjectTeam(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     project_id = Column(Integer, ForeignKey("projects.id"), unique=True)
-    leader_id = Column(Integer, ForeignKey("students.id"))
+    leader_id = Column(Integer, ForeignKey("students.id"), index=True)
     is_locked = Column(Boolean, default=False)
     status = Column(
         Enum(TeamStatusEnum),
@@ -122,18 +130,20 @@ class TeamMember(Base):
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("project_teams.id"))
-    student_id = Column(Integer, ForeignKey("students.id"))
+    student_id = Column(Integer, ForeignKey("students.id"), index=True)
 
     team = relationship("ProjectTeam", back_populates="members")
     student = relationship("Student")
 
+    __table_args__ = (Index("ix_team_members_team_id_student_id", "team_id", "student_id"),)
+
 
 class TeamApplication(Base):
     __tablename__ = "team_applications"
 
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    team_id = Column(Integer, ForeignKey("project_teams.id"))
+    team_id = Column(Integer, ForeignKey("project_teams.id"), index=True)
     status = Column(
         Enum(TeamStatusEnum),
         default=TeamStatusEnum.PENDING,
@@ -144,13 +154,17 @@ class TeamApplication(Base):
     project = relationship("Project", back_populates="team_applications")
     team = relationship("ProjectTeam", back_populates="team_applications")
 
+    __table_args__ = (
+        Index("ix_team_applications_project_id_team_id", "project_id", "team_id"),
+    )
+
 
 class StudentTeamApplication(Base):
     __tablename__ = "student_team_applications"
 
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey("project_teams.id"))
-    student_id = Column(Integer, ForeignKey("students.id"))
+    student_id = Column(Integer, ForeignKey("students.id"), index=True)
     status = Column(
         Enum(TeamStatusEnum),
         default=TeamStatusEnum.PENDING,
@@ -160,3 +174,9 @@ class StudentTeamApplication(Base):
 
     team = relationship("ProjectTeam")
     student = relationship("Student")
+
+    __table_args__ = (
+        Index(
+            "ix_student_team_applications_team_id_student_id", "team_id", "student_id"
+        ),
+    )
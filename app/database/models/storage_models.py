@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from app.database.db import Base
+
+
+class StoredBlob(Base):
+    """File content stored once by SHA-256 and shared by every row referencing it."""
+
+    __tablename__ = "stored_blobs"
+
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), unique=True, nullable=False, index=True)
+    size = Column(BigInteger, nullable=False)
+    storage_key = Column(String, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
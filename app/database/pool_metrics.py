@@ -0,0 +1,85 @@
+"""Connection pool metrics.
+
+``InstrumentedQueuePool`` times every connection checkout and records overflow
+connections and checkout timeouts, so the pool can be sized from real data.
+"""
+
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.utils.logger import get_logger
+
+# Not __name__: SQLAlchemy logs pool internals under "<module>.InstrumentedQueuePool"
+logger = get_logger("app.database.pool")
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection acquisition."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait: float, overflowed: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            avg_wait = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports wait time, overflow and timeouts to ``pool_metrics``."""
+
+    def _do_get(self):
+        overflow_before = self.overflow()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            logger.warning(
+                f"Connection pool exhausted after {time.perf_counter() - started:.3f}s "
+                f"(checked out: {self.checkedout()}, overflow: {self.overflow()})"
+            )
+            raise
+
+        # overflow() counts up from -pool_size; only positive values are overflow
+        overflowed = self.overflow() > max(overflow_before, 0)
+        pool_metrics.record_checkout(time.perf_counter() - started, overflowed)
+        if overflowed:
+            logger.warning(
+                f"Opened overflow connection (checked out: {self.checkedout()}, "
+                f"idle: {self.checkedin()}, overflow: {self.overflow()})"
+            )
+        return connection
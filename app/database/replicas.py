@@ -0,0 +1,218 @@
+"""Routing of read-only sessions to read replicas.
+
+``ReplicaSet`` picks a replica for a read session (round-robin or the one
+with the fewest checked-out connections) among those whose replication lag is
+below DB_REPLICA_MAX_LAG_SECONDS, and falls back to the primary when none is.
+Lag is measured at most every DB_REPLICA_LAG_CHECK_SECONDS per replica, on a
+connection of its own so it does not count against request query budgets.
+
+A client that just wrote (any non-GET request) is pinned to the primary for
+DB_READ_YOUR_WRITES_SECONDS, so it reads its own writes even while replicas
+catch up. Pins are keyed by the bearer token and kept in process memory: with
+several API processes behind a load balancer, use sticky sessions for the
+guarantee to hold across them.
+
+``RoutingSession`` sends statements to the engine chosen for the session,
+except flushes and DML, which always go to the primary.
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+MAX_PINS = 10000
+
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def measure_lag(engine: Engine) -> float:
+    """Replication lag of a replica in seconds (0 for databases without replication)."""
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as connection:
+        return float(connection.execute(POSTGRES_LAG_QUERY).scalar() or 0.0)
+
+
+class Replica:
+    def __init__(self, engine: Engine, name: str):
+        self.engine = engine
+        self.name = name
+        # Lag checks use short-lived connections outside the replica's pool
+        self.probe = create_engine(engine.url, poolclass=NullPool)
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self.error: Optional[str] = None
+        self.reads = 0
+        self._lock = threading.Lock()
+
+    def current_lag(self, interval: float) -> float:
+        """Last measured lag, re-measured when older than ``interval``; inf if unreachable."""
+        # One request re-measures; concurrent ones use the previous value
+        if time.monotonic() - self.checked_at >= interval and self._lock.acquire(blocking=False):
+            try:
+                self.lag = measure_lag(self.probe)
+                self.error = None
+            except Exception as exc:
+                self.lag = float("inf")
+                self.error = f"{type(exc).__name__}: {exc}"
+                logger.warning(f"Replica {self.name} is unavailable: {self.error}")
+            finally:
+                self.checked_at = time.monotonic()
+                self._lock.release()
+        return self.lag if self.lag is not None else float("inf")
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: List[Engine],
+        policy: str = "round_robin",
+        max_lag: float = 5.0,
+        lag_check_interval: float = 5.0,
+        pin_seconds: float = 10.0,
+    ):
+        if policy not in ("round_robin", "least_connections"):
+            raise RuntimeError(f"Unknown DB_REPLICA_POLICY {policy!r}")
+        self.replicas = [
+            Replica(engine, engine.url.render_as_string(hide_password=True))
+            for engine in engines
+        ]
+        self.policy = policy
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.pin_seconds = pin_seconds
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self.lag_fallbacks = 0
+        self._pins: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+
+    def pin(self, key: Optional[str]):
+        """Send the reads of ``key`` to the primary for the next ``pin_seconds``."""
+        if not key or not self.replicas or self.pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pins) >= MAX_PINS:
+                self._pins = {k: until for k, until in self._pins.items() if until > now}
+            self._pins[key] = now + self.pin_seconds
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        until = self._pins.get(key)
+        return until is not None and until > time.monotonic()
+
+    def engine_for(self, pin_key: Optional[str] = None) -> Optional[Engine]:
+        """Engine to read from, or None for the primary."""
+        if not self.replicas:
+            return None
+        if self.is_pinned(pin_key):
+            self.pinned_reads += 1
+            return None
+
+        candidates = [
+            replica
+            for replica in self.replicas
+            if replica.current_lag(self.lag_check_interval) <= self.max_lag
+        ]
+        if not candidates:
+            self.lag_fallbacks += 1
+            return None
+
+        if self.policy == "least_connections":
+            replica = min(candidates, key=lambda replica: replica.engine.pool.checkedout())
+        else:
+            replica = candidates[next(self._turn) % len(candidates)]
+        replica.reads += 1
+        return replica.engine
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "max_lag_seconds": self.max_lag,
+            "pinned_clients": sum(1 for key in list(self._pins) if self.is_pinned(key)),
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "lag_fallbacks": self.lag_fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "lag_seconds": replica.lag,
+                    "error": replica.error,
+                    "reads": replica.reads,
+                    "checked_out": replica.engine.pool.checkedout(),
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+def pin_key(request) -> Optional[str]:
+    """Read-your-writes key of a request's client: a digest of its bearer token."""
+    authorization = request.headers.get("authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    return hashlib.blake2b(authorization[7:].encode(), digest_size=16).hexdigest()
+
+
+class RoutingSession(Session):
+    """Session reading from the engine chosen by ``replica_set`` for its client.
+
+    The choice is made on first use and kept for the life of the session, so
+    every read of a request sees the same replica.
+    """
+
+    def __init__(self, *args, primary: Engine, replica_set: ReplicaSet, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica_set = replica_set
+        self._read_bind: Optional[Engine] = None
+
+    @property
+    def reads_from_replica(self) -> bool:
+        return self._read_bind is not None and self._read_bind is not self.primary
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            return self.primary
+        if self._read_bind is None:
+            self._read_bind = self.replica_set.engine_for(self.info.get("pin_key"))
+            if self._read_bind is None:
+                self._read_bind = self.primary
+                self.replica_set.primary_reads += 1
+        return self._read_bind
+
+
+def read_your_writes_middleware(replica_set: ReplicaSet):
+    """Middleware pinning clients to the primary after a write request."""
+
+    async def middleware(request, call_next):
+        response = await call_next(request)
+        if request.method not in READ_METHODS:
+            replica_set.pin(pin_key(request))
+        return response
+
+    return middleware
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Header, Query, UploadFile
 from sqlalchemy.orm import Session
 from app.schemas.user_schemas import UserCreate
-from app.database.db import get_db
+from app.database.db import engine, get_db, replica_set
+from app.database.pool_metrics import pool_metrics
 from app.database.models.user_models import User, RoleEnum
 from app.database.models.admin_models import Admin
 from app.services.auth_service import register_user
+from app.services import storage_service
+from app.services.notification_service import notification_hub
+from app.services.outbox_service import outbox_stats
+from app.services.import_service import ImportFormatError, detect_format, import_users
+from app.utils import dependencies
+from app.utils.identity_cache import identity_cache
+from app.utils.response_cache import response_cache
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
 
@@ -43,4 +53,91 @@ def init_superadmin(x_secret_key: str = Header(..., alias="X-Secret-Key"), db: S
     admin = Admin(user_id=user.id)
     db.add(admin)
     db.commit()
-    return {"detail": "SuperAdmin created"}
\ No newline at end of file
+    return {"detail": "SuperAdmin created"}
+
+
+@router.get("/db/pool")
+def get_pool_status(current_user: User = Depends(dependencies.get_current_user)):
+    """Report connection pool usage for sizing the pool"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view pool metrics")
+
+    return pool_metrics.snapshot(engine.pool)
+
+
+@router.get("/db/replicas")
+def get_replica_status(current_user: User = Depends(dependencies.get_current_user)):
+    """Report replica lag and how reads were routed"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view replica metrics")
+
+    return replica_set.stats()
+
+
+@router.get("/cache/identity")
+def get_identity_cache_stats(current_user: User = Depends(dependencies.get_current_user)):
+    """Report hit/miss counters of the authenticated-user cache"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view cache metrics")
+
+    return identity_cache.stats()
+
+
+@router.get("/cache/responses")
+def get_response_cache_stats(current_user: User = Depends(dependencies.get_current_user)):
+    """Report hit rate and memory use of the HTTP response cache"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view cache metrics")
+
+    return response_cache.stats()
+
+
+@router.get("/notifications")
+def get_notification_stats(current_user: User = Depends(dependencies.get_current_user)):
+    """Report connections and delivery counters of this process's notification hub"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view notification metrics")
+
+    return notification_hub.stats()
+
+
+@router.get("/outbox")
+def get_outbox_stats(
+    current_user: User = Depends(dependencies.get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Report outbox queue depth per status and this process's worker counters"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view outbox metrics")
+
+    return outbox_stats(db)
+
+
+@router.get("/storage")
+def get_storage_stats(
+    current_user: User = Depends(dependencies.get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Report stored vs. referenced bytes of deduplicated uploads"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can view storage metrics")
+
+    return storage_service.storage_stats(db)
+
+
+@router.post("/users/import")
+def import_users_route(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or json; defaults to the file extension"),
+    current_user: User = Depends(dependencies.get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Create students and professors in bulk from a CSV or JSON file"""
+    if current_user.role != RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admins can import users")
+
+    try:
+        file_format = detect_format(file.filename, format)
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return import_users(db, file.file, file_format)
@@ -3,17 +3,16 @@ from sqlalchemy.orm import Session
 
 from app.database.db import get_db
 from app.schemas.user_schemas import Token, UserCreate, UserLogin
-from app.services.auth_service import login_user, register_user
+from app.services.auth_service import login_user, register_and_login
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
 
 @router.post("/register", response_model=Token)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    register_user(user_data, db)
-    return login_user(UserLogin(email=user_data.email, password=user_data.password), db)
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    return await register_and_login(user_data, db)
 
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    return login_user(user, db)
+async def login(user: UserLogin, db: Session = Depends(get_db)):
+    return await login_user(user, db)
@@ -0,0 +1,113 @@
+"""Real-time notification streams (WebSocket and Server-Sent Events).
+
+Browsers cannot set an Authorization header on WebSocket or EventSource
+connections, so both endpoints also accept the access token as ``?token=``.
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, WebSocket, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.websockets import WebSocketDisconnect
+
+from app.database.db import SessionLocal
+from app.services.notification_service import Subscriber, notification_hub
+from app.utils.dependencies import get_user_from_token
+from app.utils.settings import settings
+
+router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
+
+
+def _authenticate(token: Optional[str]) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+        return user.id if user else None
+    finally:
+        db.close()
+
+
+def _bearer_token(authorization: Optional[str], token: Optional[str]) -> Optional[str]:
+    if token:
+        return token
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return None
+
+
+async def _send_events(websocket: WebSocket, subscriber: Subscriber):
+    while True:
+        await websocket.send_json(await subscriber.next_event())
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    # Clients have nothing to say; reading only notices when they go away
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/ws")
+async def notifications_websocket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """Push the current user's notifications as JSON messages"""
+    user_id = await run_in_threadpool(_authenticate, token)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = notification_hub.subscribe(user_id)
+    tasks = [
+        asyncio.create_task(_send_events(websocket, subscriber)),
+        asyncio.create_task(_wait_for_disconnect(websocket)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        notification_hub.unsubscribe(subscriber)
+
+
+async def _event_stream(request: Request, user_id: int):
+    subscriber = notification_hub.subscribe(user_id)
+    try:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.next_event(), settings.NOTIFICATIONS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment line; keeps proxies from closing an idle stream
+                yield ": ping\n\n"
+                continue
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        notification_hub.unsubscribe(subscriber)
+
+
+@router.get("/stream")
+async def notifications_stream(
+    request: Request,
+    token: Optional[str] = Query(None),
+    authorization: Optional[str] = Header(None),
+):
+    """Push the current user's notifications as Server-Sent Events"""
+    user_id = await run_in_threadpool(_authenticate, _bearer_token(authorization, token))
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return StreamingResponse(
+        _event_stream(request, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,13 @@
 """Milestone-related routes."""
 
-from fastapi import APIRouter, Depends, File, Form, UploadFile
+from datetime import date
+
+from fastapi import APIRouter, Depends, File, Form, Query, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.database.db import get_db
+from app.database.db import get_db, get_read_db
+from app.database.instrumentation import query_budget
 from app.utils.dependencies import get_current_professor, get_current_student
 from app.schemas.project_schemas import (
     MilestoneCreate,
@@ -19,6 +22,7 @@ from app.services.project.milestone_service import (
     get_milestone_submissions,
     update_milestone_submission_grade
 )
+from app.services.project.gradebook_service import export_gradebook
 
 router = APIRouter()
 
@@ -46,7 +50,7 @@ def provide_milestone_feedback_route(
 
 
 @router.post("/milestones/submit", response_model=dict)
-async def submit_milestone_endpoint(
+def submit_milestone_endpoint(
     milestone_id: int = Form(...),
     team_id: int = Form(...),
     submission_text: str = Form(""),
@@ -76,14 +80,35 @@ def get_student_milestones_endpoint(
     return get_student_active_milestones(db, student.id)
 
 
-@router.get("/professor/submissions", response_model=List[dict])
+@router.get(
+    "/professor/submissions",
+    response_model=List[dict],
+    dependencies=[Depends(query_budget(5))],
+)
 def get_professor_submissions_endpoint(
     project_id: Optional[int] = None,
+    is_graded: Optional[bool] = None,
+    submitted_from: Optional[date] = None,
+    submitted_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    professor = Depends(get_current_professor)
+):
+    """Get all milestone submissions for a professor, optionally filtered by
+    project, grading state and submission date"""
+    return get_milestone_submissions(
+        db, professor.id, project_id, is_graded, submitted_from, submitted_to
+    )
+
+
+@router.get("/professor/gradebook")
+def export_gradebook_endpoint(
+    project_id: Optional[int] = None,
+    format: str = Query("csv", description="csv, xlsx or ndjson"),
     db: Session = Depends(get_db),
     professor = Depends(get_current_professor)
 ):
-    """Get all milestone submissions for a professor, optionally filtered by project"""
-    return get_milestone_submissions(db, professor.id, project_id)
+    """Download the gradebook of the professor's projects, optionally for one project"""
+    return export_gradebook(db, professor.id, project_id, format)
 
 
 @router.post("/submissions/{submission_id}/grade", response_model=dict)
@@ -1,11 +1,12 @@
 # api/project_routes.py
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
 
-from app.database.db import get_db
+from app.database.db import get_db, get_read_db
+from app.database.instrumentation import query_budget
 from app.database.models.professor_models import Professor
 # from app.database.models.project_models import TeamApplication
 from app.database.models.student_models import Student
@@ -26,7 +27,12 @@ from app.schemas.project_schemas import (
     TeamApplicationRequest,
     MilestoneOut,
 )
-from app.schemas.enum_schemas import ProjectStatusEnum, TeamStatusEnum
+from app.schemas.enum_schemas import (
+    DepartmentEnum,
+    ProjectStatusEnum,
+    TeamStatusEnum,
+    YearEnum,
+)
 from app.services.project_service import (
     add_milestone_to_project,
     add_resource_to_project,
@@ -44,6 +50,7 @@ from app.services.project_service import (
     update_team_status,
     provide_milestone_feedback,
     get_available_projects_for_student,
+    search_projects_for_student,
     get_student_teams,
     get_team_applications_by_student,
     withdraw_team_application,
@@ -60,6 +67,15 @@ from app.services.project_service import (
     add_project_milestone,
     submit_milestone_feedback,
 )
+from app.services.matching_service import (
+    recommend_projects,
+    recommend_teammates,
+    recommend_teams,
+)
+
+from app.utils.pagination import PageParams, pagination_params, set_next_cursor
+from app.utils.response_cache import response_cache
+from app.utils.settings import settings
 
 from app.routes.project.milestone_routes import router as milestone_router
 
@@ -69,30 +85,43 @@ router = APIRouter(prefix="/api/projects", tags=["Projects"])
 router.include_router(milestone_router)
 
 @router.post("/create", response_model=ProjectOut)
-async def create_project_route(
+def create_project_route(
     project: ProjectCreate,
     db: Session = Depends(get_db),
     professor=Depends(get_current_professor),
 ):
     """Create a new project with milestones"""
-    return await create_project(db, project, professor.id)
+    return create_project(db, project, professor.id)
 
 
 @router.get("/list", response_model=List[ProjectOut])
 def get_professor_projects(
-    db: Session = Depends(get_db), professor=Depends(get_current_professor)
+    response: Response,
+    status: Optional[ProjectStatusEnum] = None,
+    year: Optional[YearEnum] = None,
+    tags: Optional[List[str]] = Query(None),
+    page: PageParams = Depends(pagination_params),
+    db: Session = Depends(get_db),
+    professor=Depends(get_current_professor),
 ):
-    """Get all projects created by the professor"""
-    return get_all_projects_by_professor(db, professor.id)
+    """Get a page of projects created by the professor"""
+    projects = get_all_projects_by_professor(
+        db, professor.id, page, status=status, year=year, tags=tags
+    )
+    return set_next_cursor(response, projects)
 
 
 @router.get("/get/{project_id}", response_model=Dict[str, Any])
-def get_project(project_id: int, db: Session = Depends(get_db)):
+def get_project(project_id: int, request: Request, db: Session = Depends(get_read_db)):
     """Get detailed project information including team, milestones, and resources"""
-    detailed_project = get_detailed_project(db, project_id)
-    if not detailed_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return detailed_project
+
+    def build():
+        detailed_project = get_detailed_project(db, project_id)
+        if not detailed_project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return detailed_project
+
+    return response_cache.respond(request, "project", project_id, build, db)
 
 
 @router.patch("/update/{project_id}/status")
@@ -129,24 +158,25 @@ def update_project_route(
 
 
 @router.post("/resources/{project_id}", response_model=ProjectResourceOut)
-async def upload_resource(
+def upload_resource(
     project_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     professor=Depends(get_current_professor),
 ):
     """Upload a resource file to the project"""
-    return await add_resource_to_project(db, project_id, file, professor.id)
+    return add_resource_to_project(db, project_id, file, professor.id)
 
 
 @router.get("/download/{project_id}/resources/{resource_id}")
-async def download_resource_route(
+def download_resource_route(
     project_id: int,
     resource_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """Download a project resource"""
-    return await download_resource(db, project_id, resource_id)
+    return download_resource(db, project_id, resource_id, request.headers)
 
 
 @router.post("/create/{project_id}/team", response_model=ProjectOut)
@@ -238,14 +268,73 @@ def approve_application_route(
 
 
 # Student project endpoints
-@router.get("/available", response_model=List[Dict[str, Any]])
+@router.get(
+    "/available",
+    response_model=List[Dict[str, Any]],
+    dependencies=[Depends(query_budget(5))],
+)
 def get_available_projects(
-    db: Session = Depends(get_db), student=Depends(get_current_student)
+    db: Session = Depends(get_read_db), student=Depends(get_current_student)
 ):
     """Get all available projects that the student is eligible for"""
     return get_available_projects_for_student(db, student.id)
 
 
+@router.get("/search", response_model=List[Dict[str, Any]])
+def search_projects_route(
+    q: Optional[str] = None,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+    status: Optional[ProjectStatusEnum] = None,
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    student=Depends(get_current_student),
+):
+    """Search projects by title, description and tags, best matches first"""
+    return search_projects_for_student(
+        db,
+        student.id,
+        q,
+        limit,
+        department=department,
+        year=year,
+        status=status,
+        tags=tags,
+    )
+
+
+@router.get("/recommendations/projects", response_model=List[Dict[str, Any]])
+def recommend_projects_route(
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    student=Depends(get_current_student),
+):
+    """Open projects whose tags best match the student's skills and interests"""
+    return recommend_projects(db, student, limit)
+
+
+@router.get("/recommendations/teams", response_model=List[Dict[str, Any]])
+def recommend_teams_route(
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    student=Depends(get_current_student),
+):
+    """Teams with open spots whose members and project best match the student"""
+    return recommend_teams(db, student, limit)
+
+
+@router.get("/recommendations/teammates", response_model=List[Dict[str, Any]])
+def recommend_teammates_route(
+    team_id: Optional[int] = None,
+    limit: int = Query(10, ge=1, le=settings.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    student=Depends(get_current_student),
+):
+    """Students matching the student's profile, or the given team's profile"""
+    return recommend_teammates(db, student, limit, team_id=team_id)
+
+
 @router.get("/student/teams", response_model=List[ProjectTeamOut])
 def get_student_teams_route(
     db: Session = Depends(get_db), student=Depends(get_current_student)
@@ -283,7 +372,10 @@ def get_active_projects(
 # Collaborator Finder endpoints
 @router.get("/teams/all", response_model=List[dict])
 def get_all_teams_endpoint(
-    db: Session = Depends(get_db),
+    response: Response,
+    status: Optional[TeamStatusEnum] = None,
+    page: PageParams = Depends(pagination_params),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get all teams available for collaboration"""
@@ -292,11 +384,15 @@ def get_all_teams_endpoint(
     if not student:
         raise HTTPException(status_code=403, detail="Only students can access this endpoint")
     
-    return get_all_teams(db)
+    return set_next_cursor(response, get_all_teams(db, page, status))
 
 
 @router.get("/students/all", response_model=List[dict])
 def get_all_students_endpoint(
+    response: Response,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+    page: PageParams = Depends(pagination_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -306,7 +402,8 @@ def get_all_students_endpoint(
     if not student:
         raise HTTPException(status_code=403, detail="Only students can access this endpoint")
     
-    return get_all_students_with_details(db)
+    students = get_all_students_with_details(db, page, department, year)
+    return set_next_cursor(response, students)
 
 
 @router.get("/teams/student", response_model=List[dict])
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
 
 from app.database.db import get_db
 from app.database.models.admin_models import Admin
 from app.database.models.professor_models import Professor
-from app.database.models.student_models import Student
+from app.schemas.enum_schemas import DepartmentEnum, YearEnum
 from app.services import user_service
+from app.utils.pagination import PageParams, pagination_params, set_next_cursor
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
 @router.get("/users")
-def get_users(db: Session = Depends(get_db)):
-    return user_service.get_users(db)
+def get_users(
+    response: Response,
+    page: PageParams = Depends(pagination_params),
+    db: Session = Depends(get_db),
+):
+    return set_next_cursor(response, user_service.get_users(db, page))
 
 
 @router.delete("/users/{id}")
@@ -21,8 +28,15 @@ def delete_user(id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/students")
-def get_students(db: Session = Depends(get_db)):
-    return db.query(Student).all()
+def get_students(
+    response: Response,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+    page: PageParams = Depends(pagination_params),
+    db: Session = Depends(get_db),
+):
+    students = user_service.get_students(db, page, department, year)
+    return set_next_cursor(response, students)
 
 
 @router.get("/professors")
@@ -1,22 +1,31 @@
+from typing import Optional
+
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.database.models.professor_models import Professor
 from app.database.models.student_models import Student
 from app.database.models.user_models import User
 from app.schemas.user_schemas import RoleEnum, UserCreate, UserLogin
+from app.services.matching_service import matching_engine
 from app.utils.logger import get_logger
-from app.utils.security import create_access_token, hash_password, verify_password
+from app.utils.security import (
+    create_access_token,
+    hash_password,
+    hash_password_async,
+    verify_and_update_password,
+)
 
 logger = get_logger(__name__)
 
 
-def register_user(user_data: UserCreate, db: Session):
+def register_user(user_data: UserCreate, db: Session, hashed_password: Optional[str] = None):
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed = hash_password(user_data.password)
+    hashed = hashed_password or hash_password(user_data.password)
     user = User(
         username=user_data.username,
         email=user_data.email,
@@ -39,17 +48,52 @@ def register_user(user_data: UserCreate, db: Session):
         )
         db.add(professor)
     db.commit()
+    if user_data.role == RoleEnum.student:
+        matching_engine.update_student(student)
     logger.info("User Created")
     return user
 
 
-def login_user(user_data: UserLogin, db: Session):
-    user = db.query(User).filter(User.email == user_data.email).first()
-    logger.info(f"UserData: {user_data}")
-    if not user or not verify_password(user_data.password, user.hashed_password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
+def issue_token(user: User):
     token = create_access_token(
         {"sub": str(user.id), "role": user.role, "full_name": user.full_name}
     )
     return {"access_token": token}
+
+
+async def register_and_login(user_data: UserCreate, db: Session):
+    """Register a user, hashing the password on the password pool"""
+    # Reject taken emails before spending a bcrypt hash on them
+    if await run_in_threadpool(_get_user_by_email, db, user_data.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    hashed = await hash_password_async(user_data.password)
+    user = await run_in_threadpool(register_user, user_data, db, hashed)
+    return issue_token(user)
+
+
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _update_password_hash(db: Session, user: User, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
+
+
+async def login_user(user_data: UserLogin, db: Session):
+    user = await run_in_threadpool(_get_user_by_email, db, user_data.email)
+    logger.info(f"Login attempt: {user_data.email}")
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, new_hash = await verify_and_update_password(
+        user_data.password, user.hashed_password
+    )
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Transparently upgrade hashes made with a different bcrypt cost
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, db, user, new_hash)
+
+    return issue_token(user)
@@ -0,0 +1,315 @@
+"""Bulk import of student and professor accounts from CSV or JSON.
+
+Rows are read from the file as a stream and validated with ``UserCreate``,
+the schema used by ``/api/auth/register``. Valid rows are processed in chunks:
+duplicates are found with one query per chunk, the chunk's passwords are
+hashed in parallel on the import hash pool, and users plus their ``Student`` /
+``Professor`` rows are inserted with executemany and committed together.
+New students are then added to the loaded recommendation matrix.
+A chunk that hits a conflict (e.g. a concurrent registration) is retried row
+by row in savepoints, so one bad row never costs the rest of the chunk.
+
+CSV files need a header row with the ``UserCreate`` field names; empty cells
+count as missing. JSON files hold either an array of objects or one object
+per line (JSON Lines). A malformed file stops the import at that point; the
+report says so in ``aborted`` and covers the rows read up to there.
+"""
+
+import codecs
+import csv
+import json
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.models.professor_models import Professor
+from app.database.models.student_models import Student
+from app.database.models.user_models import User
+from app.schemas.user_schemas import RoleEnum, UserCreate
+from app.services.matching_service import matching_engine
+from app.utils.logger import get_logger
+from app.utils.security import hash_passwords
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+IMPORTABLE_ROLES = {RoleEnum.student, RoleEnum.professor}
+JSON_READ_SIZE = 64 * 1024
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename: Optional[str], format: Optional[str] = None) -> str:
+    if format:
+        format = format.lower()
+    elif filename and "." in filename:
+        format = filename.rsplit(".", 1)[1].lower()
+    if format in ("json", "jsonl", "ndjson"):
+        return "json"
+    if format == "csv":
+        return "csv"
+    raise ImportFormatError("Unsupported import format, expected CSV or JSON")
+
+
+def _iter_csv(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    text = codecs.getreader("utf-8-sig")(stream)
+    reader = csv.DictReader(text)
+    for record in reader:
+        # Line of the row in the file; the header is line 1
+        yield reader.line_num, {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key is not None and value is not None and value.strip() != ""
+        }
+
+
+def _iter_json(stream: BinaryIO) -> Iterator[Tuple[int, object]]:
+    """Objects of a JSON array or of JSON Lines, decoded incrementally."""
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    position = 0
+    in_array = None
+    number = 0
+    finished = False
+
+    while True:
+        chunk = stream.read(JSON_READ_SIZE)
+        buffer = buffer[position:] + reader.decode(chunk or b"", final=not chunk)
+        position = 0
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                if buffer[position] == "," and not in_array:
+                    raise ImportFormatError("Invalid JSON: unexpected ','")
+                position += 1
+            if position == len(buffer):
+                break
+            if in_array is None:
+                in_array = buffer[position] == "["
+                if in_array:
+                    position += 1
+                continue
+            if in_array and buffer[position] == "]":
+                finished = True
+                position += 1
+                break
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as exc:
+                if not chunk:
+                    raise ImportFormatError(f"Invalid JSON: {exc.msg}") from exc
+                break  # the value continues in the next chunk
+            number += 1
+            position = end
+            yield number, record
+        if finished:
+            if buffer[position:].strip():
+                raise ImportFormatError("Invalid JSON: data after the closing ']'")
+            return
+        if not chunk:
+            if in_array:
+                raise ImportFormatError("Invalid JSON: missing closing ']'")
+            return
+
+
+def iter_records(stream: BinaryIO, format: str) -> Iterator[Tuple[int, object]]:
+    """(row number, raw record) pairs; rows are CSV lines or JSON object positions."""
+    return _iter_csv(stream) if format == "csv" else _iter_json(stream)
+
+
+def _validation_errors(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+def _profile_row(user_id: int, user_data: UserCreate) -> dict:
+    if user_data.role == RoleEnum.student:
+        return {"user_id": user_id, "department": user_data.department, "year": user_data.year}
+    return {"user_id": user_id, "department": user_data.department, "title": user_data.title}
+
+
+class UserImporter:
+    def __init__(self, db: Session, chunk_size: int):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.total = 0
+        self.created = 0
+        self.errors: List[dict] = []
+        self.aborted: Optional[str] = None
+        self.seen_emails = set()
+        self.seen_usernames = set()
+
+    def fail(self, row: int, record: object, messages: List[str]):
+        email = record.get("email") if isinstance(record, dict) else None
+        self.errors.append({"row": row, "email": email, "errors": messages})
+
+    def validate(self, row: int, record: object) -> Optional[UserCreate]:
+        if not isinstance(record, dict):
+            self.fail(row, record, ["row: expected an object"])
+            return None
+        try:
+            user_data = UserCreate.model_validate(record)
+        except ValidationError as exc:
+            self.fail(row, record, _validation_errors(exc))
+            return None
+
+        messages = []
+        if user_data.role not in IMPORTABLE_ROLES:
+            messages.append("role: only students and professors can be imported")
+        if user_data.email.lower() in self.seen_emails:
+            messages.append("email: duplicated in the file")
+        if user_data.username in self.seen_usernames:
+            messages.append("username: duplicated in the file")
+        if messages:
+            self.fail(row, record, messages)
+            return None
+        self.seen_emails.add(user_data.email.lower())
+        self.seen_usernames.add(user_data.username)
+        return user_data
+
+    def _existing(self, chunk: List[Tuple[int, UserCreate]]) -> Tuple[set, set]:
+        emails = [user_data.email for _, user_data in chunk]
+        usernames = [user_data.username for _, user_data in chunk]
+        rows = self.db.execute(
+            select(User.email, User.username).where(
+                User.email.in_(emails) | User.username.in_(usernames)
+            )
+        ).all()
+        return {email for email, _ in rows}, {username for _, username in rows}
+
+    def _insert(self, chunk: List[Tuple[int, UserCreate]], hashes: List[str]) -> List[int]:
+        """Insert the chunk's users and profiles; returns the new students' user ids."""
+        self.db.execute(
+            insert(User),
+            [
+                {
+                    "username": user_data.username,
+                    "full_name": user_data.fullname,
+                    "email": user_data.email,
+                    "hashed_password": hashed,
+                    "role": user_data.role,
+                }
+                for (_, user_data), hashed in zip(chunk, hashes)
+            ],
+        )
+        user_ids = dict(
+            self.db.execute(
+                select(User.email, User.id).where(
+                    User.email.in_([user_data.email for _, user_data in chunk])
+                )
+            ).all()
+        )
+        for model, role in ((Student, RoleEnum.student), (Professor, RoleEnum.professor)):
+            rows = [
+                _profile_row(user_ids[user_data.email], user_data)
+                for _, user_data in chunk
+                if user_data.role == role
+            ]
+            if rows:
+                self.db.execute(insert(model), rows)
+        return [
+            user_ids[user_data.email]
+            for _, user_data in chunk
+            if user_data.role == RoleEnum.student
+        ]
+
+    def _index_students(self, user_ids: List[int]):
+        """Add committed students to the recommendation matrix, if it is loaded."""
+        if not user_ids or not matching_engine.loaded:
+            return
+        matching_engine.update_students(
+            self.db.execute(
+                select(Student.id, Student.skills, Student.interests).where(
+                    Student.user_id.in_(user_ids)
+                )
+            ).all()
+        )
+
+    def flush(self, chunk: List[Tuple[int, UserCreate]]):
+        if not chunk:
+            return
+        existing_emails, existing_usernames = self._existing(chunk)
+        new_rows = []
+        for row, user_data in chunk:
+            messages = []
+            if user_data.email in existing_emails:
+                messages.append("email: already registered")
+            if user_data.username in existing_usernames:
+                messages.append("username: already taken")
+            if messages:
+                self.errors.append({"row": row, "email": user_data.email, "errors": messages})
+            else:
+                new_rows.append((row, user_data))
+        if not new_rows:
+            return
+
+        hashes = hash_passwords([user_data.password for _, user_data in new_rows])
+        try:
+            student_user_ids = self._insert(new_rows, hashes)
+            self.db.commit()
+            self.created += len(new_rows)
+            self._index_students(student_user_ids)
+            return
+        except IntegrityError:
+            self.db.rollback()
+
+        # Someone registered one of these users meanwhile; find out which row by row
+        student_user_ids = []
+        for (row, user_data), hashed in zip(new_rows, hashes):
+            try:
+                with self.db.begin_nested():
+                    student_user_ids += self._insert([(row, user_data)], [hashed])
+                self.created += 1
+            except IntegrityError:
+                self.errors.append(
+                    {"row": row, "email": user_data.email, "errors": ["email or username already taken"]}
+                )
+        self.db.commit()
+        self._index_students(student_user_ids)
+
+    def run(self, records: Iterator[Tuple[int, object]]) -> dict:
+        chunk: List[Tuple[int, UserCreate]] = []
+        try:
+            for row, record in records:
+                self.total += 1
+                user_data = self.validate(row, record)
+                if user_data is not None:
+                    chunk.append((row, user_data))
+                if len(chunk) >= self.chunk_size:
+                    self.flush(chunk)
+                    chunk = []
+        except UnicodeDecodeError:
+            self.aborted = "The file is not valid UTF-8"
+        except csv.Error as exc:
+            self.aborted = f"Invalid CSV: {exc}"
+        except ImportFormatError as exc:
+            self.aborted = str(exc)
+        # Rows read before a malformed part of the file are still imported
+        self.flush(chunk)
+        return self.report()
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": len(self.errors),
+            "aborted": self.aborted,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+
+def import_users(
+    db: Session, stream: BinaryIO, format: str, chunk_size: Optional[int] = None
+) -> dict:
+    """Create the users listed in a CSV/JSON stream and report per-row errors."""
+    importer = UserImporter(db, chunk_size or settings.IMPORT_CHUNK_SIZE)
+    report = importer.run(iter_records(stream, format))
+    logger.info(f"Imported {report['created']} of {report['total']} users")
+    return report
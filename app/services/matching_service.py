@@ -0,0 +1,351 @@
+"""Skill/interest based recommendations of projects, teams and teammates.
+
+Every student is a row of a dense feature matrix over the vocabulary of
+skills and interests (skills weigh more than interests). Projects and teams
+are vectorized the same way from their tags and members' profiles, and
+candidates are ranked by TF-IDF weighted cosine similarity, computed for all
+students at once with NumPy, so rare skills count for more than common ones.
+
+The matrix is loaded once per process on first use and updated in place when
+a student is created or its profile changes (``update_student``,
+``update_students``, ``remove_student``). Like the search fallback index, it
+assumes a single API process.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload
+
+from app.database.models.catalog_models import ProjectCatalogEntry
+from app.database.models.project_models import ProjectTeam, TeamMember
+from app.database.models.student_models import Student
+from app.schemas.enum_schemas import ProjectStatusEnum
+
+SKILL_WEIGHT = 1.0
+INTEREST_WEIGHT = 0.6
+TAG_WEIGHT = 1.0
+TEAM_MAX_SIZE = 4
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(str(term).lower().split())
+
+
+def student_terms(skills, interests) -> Dict[str, float]:
+    """Weighted terms of a profile; a term listed as both keeps the higher weight."""
+    terms: Dict[str, float] = {}
+    for values, weight in ((interests, INTEREST_WEIGHT), (skills, SKILL_WEIGHT)):
+        for value in values or []:
+            term = normalize_term(value)
+            if term:
+                terms[term] = max(terms.get(term, 0.0), weight)
+    return terms
+
+
+def tag_terms(tags) -> Dict[str, float]:
+    return {normalize_term(tag): TAG_WEIGHT for tag in tags or [] if normalize_term(tag)}
+
+
+class MatchingEngine:
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.row_count = 0
+        self.student_ids = np.zeros(0, dtype=np.int64)
+        self.row_of: Dict[int, int] = {}
+        self.terms_of: Dict[int, Dict[str, float]] = {}
+        self.document_frequency = np.zeros(0, dtype=np.float32)
+        self.loaded = False
+        self._row_norms: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+
+    def load(self, db: Session):
+        """Build the matrix from every student profile, once per process."""
+        with self._lock:
+            if self.loaded:
+                return
+            for student_id, skills, interests in db.query(
+                Student.id, Student.skills, Student.interests
+            ):
+                self._set_row(student_id, student_terms(skills, interests))
+            self.loaded = True
+
+    def _ensure_capacity(self, rows: int, columns: int):
+        capacity_rows, capacity_columns = self.matrix.shape
+        if rows <= capacity_rows and columns <= capacity_columns:
+            return
+        # Grow geometrically so incremental updates stay amortized O(1)
+        new_rows = max(rows, capacity_rows * 2, 1024) if rows > capacity_rows else capacity_rows
+        new_columns = (
+            max(columns, capacity_columns * 2, 64) if columns > capacity_columns else capacity_columns
+        )
+        matrix = np.zeros((new_rows, new_columns), dtype=np.float32)
+        matrix[:capacity_rows, :capacity_columns] = self.matrix
+        self.matrix = matrix
+
+        student_ids = np.full(new_rows, -1, dtype=np.int64)
+        student_ids[: len(self.student_ids)] = self.student_ids
+        self.student_ids = student_ids
+
+        document_frequency = np.zeros(new_columns, dtype=np.float32)
+        document_frequency[: len(self.document_frequency)] = self.document_frequency
+        self.document_frequency = document_frequency
+
+    def _column(self, term: str) -> int:
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = len(self.vocabulary)
+            self._ensure_capacity(self.row_count, column + 1)
+            self.vocabulary[term] = column
+        return column
+
+    def _set_row(self, student_id: int, terms: Dict[str, float]):
+        row = self.row_of.get(student_id)
+        if row is None:
+            row = self.row_count
+            self._ensure_capacity(row + 1, len(self.vocabulary))
+            self.row_of[student_id] = row
+            self.student_ids[row] = student_id
+            self.row_count += 1
+        else:
+            self.document_frequency[self.matrix[row] > 0] -= 1
+            self.matrix[row] = 0
+
+        for term, weight in terms.items():
+            column = self._column(term)  # may reallocate the matrix
+            self.matrix[row, column] = weight
+        self.document_frequency[self.matrix[row] > 0] += 1
+        self.terms_of[student_id] = terms
+        self._row_norms = None
+
+    def update_student(self, student: Student):
+        """Reflect a committed profile change; a no-op until the matrix is loaded."""
+        self.update_students([(student.id, student.skills, student.interests)])
+
+    def update_students(self, rows: Iterable[Tuple[int, list, list]]):
+        """Reflect committed (student id, skills, interests) rows, e.g. new students."""
+        with self._lock:
+            if self.loaded:
+                for student_id, skills, interests in rows:
+                    self._set_row(student_id, student_terms(skills, interests))
+
+    def remove_student(self, student_id: int):
+        with self._lock:
+            if not self.loaded or student_id not in self.row_of:
+                return
+            # The row is kept but zeroed and unassigned, so it never scores
+            self._set_row(student_id, {})
+            self.student_ids[self.row_of.pop(student_id)] = -1
+            self.terms_of.pop(student_id, None)
+
+    def _idf(self) -> np.ndarray:
+        students = len(self.row_of)
+        columns = len(self.vocabulary)
+        return (
+            np.log((1 + students) / (1 + self.document_frequency[:columns])) + 1
+        ).astype(np.float32)
+
+    def _unseen_idf(self) -> float:
+        return math.log(1 + len(self.row_of)) + 1
+
+    def _vectorize(self, terms: Dict[str, float], idf: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Query vector over the vocabulary plus its TF-IDF norm, which also
+        counts terms no student has."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        unseen = 0.0
+        for term, weight in terms.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                unseen += (weight * self._unseen_idf()) ** 2
+            else:
+                vector[column] = weight
+        norm = math.sqrt(float(np.sum((vector * idf) ** 2)) + unseen)
+        return vector, norm
+
+    def _student_scores(self, terms: Dict[str, float]) -> np.ndarray:
+        """Cosine similarity of every matrix row to the given terms."""
+        rows, columns = self.row_count, len(self.vocabulary)
+        idf = self._idf()
+        vector, norm = self._vectorize(terms, idf)
+        if norm == 0 or rows == 0:
+            return np.zeros(rows, dtype=np.float32)
+
+        matrix = self.matrix[:rows, :columns]
+        if self._row_norms is None:
+            self._row_norms = np.sqrt((matrix * matrix) @ (idf * idf))
+        dots = matrix @ (vector * idf * idf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = dots / (self._row_norms * norm)
+        return np.nan_to_num(scores, nan=0.0)
+
+    def top_students(
+        self, terms: Dict[str, float], limit: int, exclude: Iterable[int] = ()
+    ) -> List[Tuple[int, float]]:
+        with self._lock:
+            scores = self._student_scores(terms)
+            for student_id in exclude:
+                row = self.row_of.get(student_id)
+                if row is not None:
+                    scores[row] = 0
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(int(self.student_ids[row]), float(scores[row])) for row in ranked]
+
+    def rank_profiles(
+        self, terms: Dict[str, float], profiles: List[Dict[str, float]], limit: int
+    ) -> List[Tuple[int, float]]:
+        """Rank arbitrary term profiles (projects, teams) against ``terms``.
+
+        Returns (index into ``profiles``, score) pairs, best first.
+        """
+        with self._lock:
+            if not profiles:
+                return []
+            idf = self._idf()
+            vector, norm = self._vectorize(terms, idf)
+            if norm == 0:
+                return []
+            vectors, norms = zip(*(self._vectorize(profile, idf) for profile in profiles))
+            norms = np.array(norms, dtype=np.float32)
+            dots = np.stack(vectors) @ (vector * idf * idf)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.nan_to_num(dots / (norms * norm), nan=0.0)
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(int(index), float(scores[index])) for index in ranked]
+
+
+matching_engine = MatchingEngine()
+
+
+def _matched(terms: Dict[str, float], other: Dict[str, float]) -> List[str]:
+    return sorted(terms.keys() & other.keys())
+
+
+def _team_terms(team: ProjectTeam) -> Dict[str, float]:
+    """A team's profile: its members' skills and interests plus its project's tags."""
+    terms: Dict[str, float] = {}
+    for member in team.members:
+        if member.student is None:
+            continue
+        for term, weight in student_terms(
+            member.student.skills, member.student.interests
+        ).items():
+            terms[term] = max(terms.get(term, 0.0), weight)
+    if team.project is not None:
+        for term, weight in tag_terms(team.project.tags).items():
+            terms[term] = max(terms.get(term, 0.0), weight)
+    return terms
+
+
+def recommend_projects(db: Session, student: Student, limit: int) -> List[dict]:
+    """Open projects whose tags best match the student's profile"""
+    matching_engine.load(db)
+    terms = student_terms(student.skills, student.interests)
+    entries = (
+        db.query(ProjectCatalogEntry)
+        .filter(ProjectCatalogEntry.status == ProjectStatusEnum.OPEN)
+        .all()
+    )
+    profiles = [tag_terms(entry.tags) for entry in entries]
+    return [
+        {
+            "id": entries[index].project_id,
+            "title": entries[index].title,
+            "professor": entries[index].professor_name,
+            "tags": entries[index].tags or [],
+            "score": round(score, 4),
+            "matched": _matched(terms, profiles[index]),
+        }
+        for index, score in matching_engine.rank_profiles(terms, profiles, limit)
+    ]
+
+
+def recommend_teams(db: Session, student: Student, limit: int) -> List[dict]:
+    """Unlocked teams with room left whose profile best matches the student"""
+    matching_engine.load(db)
+    terms = student_terms(student.skills, student.interests)
+    teams = [
+        team
+        for team in db.query(ProjectTeam)
+        .options(
+            joinedload(ProjectTeam.members).joinedload(TeamMember.student),
+            joinedload(ProjectTeam.project),
+        )
+        .filter(ProjectTeam.is_locked.isnot(True))
+        .all()
+        if len(team.members) < TEAM_MAX_SIZE
+        and all(member.student_id != student.id for member in team.members)
+    ]
+    profiles = [_team_terms(team) for team in teams]
+    return [
+        {
+            "id": teams[index].id,
+            "name": teams[index].name,
+            "project_id": teams[index].project_id,
+            "member_count": len(teams[index].members),
+            "score": round(score, 4),
+            "matched": _matched(terms, profiles[index]),
+        }
+        for index, score in matching_engine.rank_profiles(terms, profiles, limit)
+    ]
+
+
+def recommend_teammates(
+    db: Session, student: Student, limit: int, team_id: Optional[int] = None
+) -> List[dict]:
+    """Students who best match the student's profile, or a team's profile"""
+    matching_engine.load(db)
+    exclude = {student.id}
+    if team_id is None:
+        terms = student_terms(student.skills, student.interests)
+    else:
+        team = (
+            db.query(ProjectTeam)
+            .options(
+                joinedload(ProjectTeam.members).joinedload(TeamMember.student),
+                joinedload(ProjectTeam.project),
+            )
+            .filter(ProjectTeam.id == team_id)
+            .first()
+        )
+        if not team:
+            raise HTTPException(status_code=404, detail="Team not found")
+        member_ids = {member.student_id for member in team.members}
+        if student.id not in member_ids:
+            raise HTTPException(status_code=403, detail="You are not a member of this team")
+        exclude |= member_ids
+        terms = _team_terms(team)
+
+    matches = matching_engine.top_students(terms, limit, exclude=exclude)
+    students = {
+        candidate.id: candidate
+        for candidate in db.query(Student)
+        .options(joinedload(Student.user))
+        .filter(Student.id.in_([student_id for student_id, _ in matches]))
+    }
+    return [
+        {
+            "id": student_id,
+            "name": students[student_id].user.full_name,
+            "department": students[student_id].department.value
+            if students[student_id].department
+            else None,
+            "year": students[student_id].year.value if students[student_id].year else None,
+            "skills": students[student_id].skills or [],
+            "interests": students[student_id].interests or [],
+            "score": round(score, 4),
+            "matched": _matched(terms, matching_engine.terms_of.get(student_id, {})),
+        }
+        for student_id, score in matches
+        if student_id in students
+    ]
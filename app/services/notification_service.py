@@ -0,0 +1,241 @@
+"""Real-time notifications pushed to connected users.
+
+Services call ``notify`` in the transaction of a change (an application
+approved, a submission graded, ...), which queues the event in the outbox
+(see app.services.outbox_service). Once the change has committed, the outbox
+worker resolves the recipients and publishes the event through the
+configured broker (see app.utils.notification_broker) to every API process,
+and each process's ``NotificationHub`` fans it out to the WebSocket / SSE
+connections of the recipients. A user may be connected several times (tabs, devices); each
+connection gets every event.
+
+Every connection has a bounded queue. When a slow consumer lets it fill up,
+its backlog is replaced by a single ``resync`` event telling the client to
+reload its state from the REST endpoints, so one stalled client never holds
+an unbounded amount of memory or slows down delivery to anybody else.
+
+Events are best-effort: users who are not connected miss them and see the
+new state the next time they load it. Events published by the outbox carry
+an id derived from the outbox message, so a client can drop the duplicates
+an at-least-once retry may produce.
+"""
+
+import asyncio
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.models.outbox_models import OutboxMessage
+from app.database.models.project_models import TeamMember
+from app.database.models.student_models import Student
+from app.services.outbox_service import enqueue, outbox_handler
+from app.utils.logger import get_logger
+from app.utils.notification_broker import NotificationBroker, get_broker
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+RESYNC_EVENT = "resync"
+
+
+NOTIFICATION_TOPIC = "notification"
+
+
+def make_event(event_type: str, data: dict, event_id: Optional[str] = None) -> dict:
+    return {
+        "id": event_id or uuid.uuid4().hex,
+        "type": event_type,
+        "data": data,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+class Subscriber:
+    """One connection of a user, with its queue of pending events."""
+
+    def __init__(self, user_id: int, max_queued: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> bool:
+        """Queue an event without blocking; False if the backlog was discarded."""
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+            return True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.dropped += 1
+        self.queue.put_nowait(make_event(RESYNC_EVENT, {"dropped": self.dropped}))
+        return False
+
+    async def next_event(self) -> dict:
+        return await self.queue.get()
+
+
+class NotificationHub:
+    def __init__(self, broker: Optional[NotificationBroker] = None):
+        self._broker = broker
+        self.subscribers: Dict[int, Set[Subscriber]] = defaultdict(set)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    @property
+    def broker(self) -> NotificationBroker:
+        if self._broker is None:
+            self._broker = get_broker()
+        return self._broker
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        """Register a connection; must be called from the event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.loop is not loop:
+                if self.loop is None:
+                    self.broker.start(self._receive)
+                self.loop = loop
+            subscriber = Subscriber(user_id, settings.NOTIFICATIONS_QUEUE_SIZE)
+            self.subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            connections = self.subscribers.get(subscriber.user_id)
+            if connections is not None:
+                connections.discard(subscriber)
+                if not connections:
+                    del self.subscribers[subscriber.user_id]
+
+    def send(self, user_ids: Iterable[int], event: dict):
+        """Send an event to every connection of the given users, on any node.
+
+        Safe to call from any thread; broker errors are raised to the caller.
+        """
+        user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+        if not user_ids:
+            return
+        self.broker.publish({"user_ids": user_ids, "event": event})
+        self.published += 1
+
+    def publish(self, user_ids: Iterable[int], event_type: str, data: dict):
+        """Like ``send``, for callers outside a transaction; failures are only logged."""
+        try:
+            self.send(user_ids, make_event(event_type, data))
+        except Exception:
+            logger.exception(f"Failed to publish {event_type} notification")
+
+    def _receive(self, message: dict):
+        # Called by the broker from whichever thread received the message
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._fan_out, message)
+
+    def _fan_out(self, message: dict):
+        event = message["event"]
+        for user_id in message["user_ids"]:
+            for subscriber in list(self.subscribers.get(user_id, ())):
+                if subscriber.offer(event):
+                    self.delivered += 1
+                else:
+                    self.overflows += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.NOTIFICATIONS_BACKEND,
+            "connected_users": len(self.subscribers),
+            "connections": sum(len(connections) for connections in self.subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+notification_hub = NotificationHub()
+
+
+def notify(
+    db: Session,
+    event_type: str,
+    data: dict,
+    user_ids: Iterable[int] = (),
+    student_ids: Iterable[int] = (),
+    team_ids: Iterable[int] = (),
+    exclude_student_ids: Iterable[int] = (),
+    idempotency_key: Optional[str] = None,
+):
+    """Queue an event for the given users, students and members of teams.
+
+    Recipients are resolved by the outbox worker after the caller commits.
+    """
+    enqueue(
+        db,
+        NOTIFICATION_TOPIC,
+        {
+            "type": event_type,
+            "data": data,
+            "user_ids": list(user_ids),
+            "student_ids": list(student_ids),
+            "team_ids": list(team_ids),
+            "exclude_student_ids": list(exclude_student_ids),
+        },
+        idempotency_key=idempotency_key,
+    )
+
+
+def resolve_recipients(db: Session, payload: dict) -> Set[int]:
+    """User ids addressed by a notification payload, in at most two queries."""
+    student_ids = set(payload.get("student_ids") or [])
+    team_ids = payload.get("team_ids") or []
+    if team_ids:
+        student_ids.update(
+            db.execute(
+                select(TeamMember.student_id).where(TeamMember.team_id.in_(team_ids))
+            ).scalars()
+        )
+    student_ids.difference_update(payload.get("exclude_student_ids") or [])
+
+    user_ids = set(payload.get("user_ids") or [])
+    if student_ids:
+        user_ids.update(
+            db.execute(select(Student.user_id).where(Student.id.in_(student_ids))).scalars()
+        )
+    return user_ids
+
+
+@outbox_handler(NOTIFICATION_TOPIC)
+def _publish_notification(db: Session, message: OutboxMessage):
+    payload = message.payload
+    notification_hub.send(
+        resolve_recipients(db, payload),
+        make_event(payload["type"], payload["data"], event_id=f"outbox-{message.id}"),
+    )
+
+
+def notify_submission_graded(db: Session, submission, milestone):
+    """Tell the submitting team that their milestone submission was graded."""
+    if submission.id is None:
+        db.flush()
+    notify(
+        db,
+        "submission.graded",
+        {
+            "submission_id": submission.id,
+            "milestone_id": milestone.id,
+            "milestone_title": milestone.title,
+            "project_id": milestone.project_id,
+            "team_id": submission.team_id,
+            "grade": submission.grade,
+            "feedback": submission.feedback,
+        },
+        team_ids=[submission.team_id],
+    )
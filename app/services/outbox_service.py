@@ -0,0 +1,303 @@
+"""Transactional outbox for the side effects of a change.
+
+``enqueue`` adds an ``OutboxMessage`` to the caller's session, so the deferred
+work commits or rolls back together with the change that caused it: nothing
+is sent for a change that failed, and nothing is lost for one that
+committed. Handlers are registered per topic with ``outbox_handler`` by the
+services owning the work (notification fan-out, storage cleanup, ...).
+
+``OutboxWorker`` claims due messages, runs their handler and marks them done
+in the handler's transaction. It runs as a thread of every API process by
+default (``OUTBOX_WORKER_IN_PROCESS``) and is woken as soon as a transaction
+that enqueued work commits; ``python -m app.utils.outbox_worker`` runs it as
+a standalone process. Claims are leases, so several workers can share the
+table and a crashed worker's messages are picked up again once its lease
+expires.
+
+Delivery is at least once: a failing handler is retried with exponential
+backoff and parked as ``failed`` after OUTBOX_MAX_ATTEMPTS, so handlers must
+be idempotent. An ``idempotency_key`` turns enqueueing the same work twice
+into a no-op for as long as the message is kept (OUTBOX_RETENTION_HOURS).
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.db import SessionLocal
+from app.database.models.outbox_models import OutboxMessage, OutboxStatusEnum, utcnow
+from app.utils.logger import get_logger
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+Handler = Callable[[Session, OutboxMessage], None]
+HANDLERS: Dict[str, Handler] = {}
+PURGE_INTERVAL_SECONDS = 600
+MAX_ERROR_LENGTH = 2000
+
+
+def outbox_handler(topic: str):
+    """Register the function executing messages of ``topic``."""
+
+    def register(handler: Handler) -> Handler:
+        HANDLERS[topic] = handler
+        return handler
+
+    return register
+
+
+def enqueue(
+    db: Session,
+    topic: str,
+    payload: dict,
+    idempotency_key: Optional[str] = None,
+    delay_seconds: float = 0,
+) -> Optional[OutboxMessage]:
+    """Defer work to after the caller's transaction commits.
+
+    Returns None when a message with the same idempotency key already exists.
+    """
+    if idempotency_key is not None and db.query(OutboxMessage.id).filter(
+        OutboxMessage.idempotency_key == idempotency_key
+    ).first():
+        return None
+
+    message = OutboxMessage(
+        topic=topic,
+        payload=payload,
+        idempotency_key=idempotency_key,
+        status=OutboxStatusEnum.PENDING,
+        attempts=0,
+        available_at=utcnow() + timedelta(seconds=delay_seconds),
+    )
+    if idempotency_key is None:
+        db.add(message)
+    else:
+        try:
+            with db.begin_nested():
+                db.add(message)
+        except IntegrityError:
+            # The same key was enqueued concurrently
+            return None
+    db.info["outbox_enqueued"] = True
+    return message
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_worker(session):
+    if session.info.pop("outbox_enqueued", False):
+        outbox_worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session):
+    session.info.pop("outbox_enqueued", None)
+
+
+def retry_delay(attempts: int) -> float:
+    return min(
+        settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.OUTBOX_RETRY_MAX_SECONDS,
+    )
+
+
+class OutboxWorker:
+    def __init__(self, session_factory=SessionLocal, batch_size: int = None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+
+    def _due(self, now):
+        return or_(
+            and_(
+                OutboxMessage.status == OutboxStatusEnum.PENDING,
+                OutboxMessage.available_at <= now,
+            ),
+            # Leases of workers that died mid-message
+            and_(
+                OutboxMessage.status == OutboxStatusEnum.PROCESSING,
+                OutboxMessage.locked_until < now,
+            ),
+        )
+
+    def claim(self, db: Session) -> List[OutboxMessage]:
+        """Lease a batch of due messages to this worker."""
+        now = utcnow()
+        candidates = (
+            select(OutboxMessage.id)
+            .where(self._due(now))
+            .order_by(OutboxMessage.id)
+            .limit(self.batch_size)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+        ids = db.execute(candidates).scalars().all()
+        if not ids:
+            db.commit()
+            return []
+
+        # The due condition is re-checked, so of two workers racing for the
+        # same ids (no SKIP LOCKED on SQLite) only one wins each message
+        db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(ids), self._due(now))
+            .values(
+                status=OutboxStatusEnum.PROCESSING,
+                locked_by=self.worker_id,
+                locked_until=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+                attempts=OutboxMessage.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return (
+            db.query(OutboxMessage)
+            .filter(
+                OutboxMessage.id.in_(ids),
+                OutboxMessage.status == OutboxStatusEnum.PROCESSING,
+                OutboxMessage.locked_by == self.worker_id,
+            )
+            .order_by(OutboxMessage.id)
+            .all()
+        )
+
+    def execute(self, db: Session, message: OutboxMessage):
+        message_id, topic = message.id, message.topic
+        try:
+            handler = HANDLERS.get(topic)
+            if handler is None:
+                raise LookupError(f"No outbox handler for topic {topic!r}")
+            handler(db, message)
+            message.status = OutboxStatusEnum.DONE
+            message.processed_at = utcnow()
+            message.locked_by = None
+            message.locked_until = None
+            message.last_error = None
+            db.commit()
+            self.processed += 1
+        except Exception as exc:
+            db.rollback()
+            message = db.get(OutboxMessage, message_id)
+            if message is None:
+                return
+            message.last_error = f"{type(exc).__name__}: {exc}"[:MAX_ERROR_LENGTH]
+            message.locked_by = None
+            message.locked_until = None
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxStatusEnum.FAILED
+                message.processed_at = utcnow()
+                self.failed += 1
+                logger.exception(f"Outbox message {message_id} ({topic}) failed for good")
+            else:
+                message.status = OutboxStatusEnum.PENDING
+                message.available_at = utcnow() + timedelta(seconds=retry_delay(message.attempts))
+                self.retried += 1
+                logger.warning(
+                    f"Outbox message {message_id} ({topic}) failed, attempt "
+                    f"{message.attempts}: {message.last_error}"
+                )
+            db.commit()
+
+    def run_once(self) -> int:
+        """Process one batch of due messages. Returns how many were claimed."""
+        db = self.session_factory()
+        try:
+            messages = self.claim(db)
+            for message in messages:
+                self.execute(db, message)
+            if time.monotonic() - self._last_purge > PURGE_INTERVAL_SECONDS:
+                purge_processed(db)
+                self._last_purge = time.monotonic()
+            return len(messages)
+        finally:
+            db.close()
+
+    def run_forever(self):
+        while not self._stopped.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception:
+                logger.exception("Outbox worker iteration failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wake.wait(settings.OUTBOX_POLL_SECONDS)
+                self._wake.clear()
+
+    def wake(self):
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self.run_forever, name="outbox-worker", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": self._thread is not None,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+
+outbox_worker = OutboxWorker()
+
+
+def purge_processed(db: Session) -> int:
+    """Delete messages done longer ago than OUTBOX_RETENTION_HOURS; failed ones are kept."""
+    cutoff = utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+    result = db.execute(
+        delete(OutboxMessage).where(
+            OutboxMessage.status == OutboxStatusEnum.DONE,
+            OutboxMessage.processed_at < cutoff,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def outbox_stats(db: Session) -> dict:
+    """Queue depth per status and age of the oldest due message."""
+    counts = dict(
+        db.query(OutboxMessage.status, func.count(OutboxMessage.id))
+        .group_by(OutboxMessage.status)
+        .all()
+    )
+    oldest_pending = (
+        db.query(func.min(OutboxMessage.available_at))
+        .filter(OutboxMessage.status == OutboxStatusEnum.PENDING)
+        .scalar()
+    )
+    lag = (utcnow() - oldest_pending).total_seconds() if oldest_pending else 0.0
+    return {
+        **{status.value: counts.get(status, 0) for status in OutboxStatusEnum},
+        "oldest_pending_seconds": round(max(lag, 0.0), 3),
+        "worker": outbox_worker.stats(),
+    }
@@ -0,0 +1,252 @@
+"""Streaming gradebook export for professors.
+
+The gradebook has one row per milestone of every team working on the
+professor's projects (or on one project): the team's submission, its grade,
+the grade weighted by ``Milestone.weightage`` and the team's weighted total.
+
+Rows come from one ordered query read through a server-side cursor
+(``yield_per``); team members are merged in from a second ordered cursor.
+Rows are encoded and sent as they are read, and only the current team's rows
+are held (to put the team total on each of them), so memory stays flat
+however many submissions there are. XLSX is the exception on the output side:
+the workbook is written row by row to a temporary file, which is streamed once
+complete.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from itertools import groupby
+from typing import Iterator, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.database.db import SessionLocal
+from app.database.models.project_models import (
+    Milestone,
+    MilestoneSubmission,
+    Project,
+    ProjectTeam,
+    TeamMember,
+)
+from app.database.models.student_models import Student
+from app.database.models.user_models import User
+
+GRADEBOOK_COLUMNS = [
+    "project_id",
+    "project_title",
+    "team_id",
+    "team_name",
+    "team_members",
+    "milestone_id",
+    "milestone_title",
+    "due_date",
+    "weightage",
+    "submission_id",
+    "submitted_at",
+    "grade",
+    "weighted_score",
+    "feedback",
+    "team_graded_weightage",
+    "team_weighted_total",
+]
+GRADEBOOK_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+FETCH_SIZE = 1000
+FLUSH_BYTES = 64 * 1024
+
+
+def _scope(query, professor_id: int, project_id: Optional[int]):
+    query = query.where(Project.professor_id == professor_id)
+    if project_id is not None:
+        query = query.where(Project.id == project_id)
+    return query
+
+
+def _grade_rows(db: Session, professor_id: int, project_id: Optional[int]):
+    query = (
+        select(
+            Project.id.label("project_id"),
+            Project.title.label("project_title"),
+            ProjectTeam.id.label("team_id"),
+            ProjectTeam.name.label("team_name"),
+            Milestone.id.label("milestone_id"),
+            Milestone.title.label("milestone_title"),
+            Milestone.due_date,
+            Milestone.weightage,
+            MilestoneSubmission.id.label("submission_id"),
+            MilestoneSubmission.submitted_at,
+            MilestoneSubmission.grade,
+            MilestoneSubmission.feedback,
+        )
+        .select_from(Project)
+        .join(ProjectTeam, ProjectTeam.project_id == Project.id)
+        .join(Milestone, Milestone.project_id == Project.id)
+        .outerjoin(
+            MilestoneSubmission,
+            and_(
+                MilestoneSubmission.milestone_id == Milestone.id,
+                MilestoneSubmission.team_id == ProjectTeam.id,
+            ),
+        )
+        .order_by(ProjectTeam.id, Milestone.due_date.is_(None), Milestone.due_date, Milestone.id)
+    )
+    return db.execute(
+        _scope(query, professor_id, project_id).execution_options(yield_per=FETCH_SIZE)
+    )
+
+
+def _member_rows(db: Session, professor_id: int, project_id: Optional[int]):
+    query = (
+        select(TeamMember.team_id, User.full_name)
+        .select_from(TeamMember)
+        .join(Student, Student.id == TeamMember.student_id)
+        .join(User, User.id == Student.user_id)
+        .join(ProjectTeam, ProjectTeam.id == TeamMember.team_id)
+        .join(Project, Project.id == ProjectTeam.project_id)
+        .order_by(TeamMember.team_id, TeamMember.id)
+    )
+    return db.execute(
+        _scope(query, professor_id, project_id).execution_options(yield_per=FETCH_SIZE)
+    )
+
+
+def iter_gradebook(db: Session, professor_id: int, project_id: Optional[int] = None) -> Iterator[dict]:
+    """Gradebook rows in team, then milestone due date order."""
+    members = iter(_member_rows(db, professor_id, project_id))
+    member = next(members, None)
+
+    for team_id, team_rows in groupby(
+        _grade_rows(db, professor_id, project_id), key=lambda row: row.team_id
+    ):
+        team_rows = list(team_rows)
+        names: List[str] = []
+        # Both cursors are ordered by team id, so members are merged in one pass
+        while member is not None and member.team_id <= team_id:
+            if member.team_id == team_id:
+                names.append(member.full_name)
+            member = next(members, None)
+
+        graded = [row for row in team_rows if row.grade is not None]
+        graded_weightage = sum(row.weightage for row in graded)
+        weighted_total = sum(row.grade * row.weightage / 100 for row in graded)
+
+        for row in team_rows:
+            yield {
+                "project_id": row.project_id,
+                "project_title": row.project_title,
+                "team_id": row.team_id,
+                "team_name": row.team_name,
+                "team_members": "; ".join(names),
+                "milestone_id": row.milestone_id,
+                "milestone_title": row.milestone_title,
+                "due_date": row.due_date,
+                "weightage": row.weightage,
+                "submission_id": row.submission_id,
+                "submitted_at": row.submitted_at,
+                "grade": row.grade,
+                "weighted_score": (
+                    round(row.grade * row.weightage / 100, 2) if row.grade is not None else None
+                ),
+                "feedback": row.feedback,
+                "team_graded_weightage": graded_weightage,
+                "team_weighted_total": round(weighted_total, 2),
+            }
+
+
+def _text_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: Iterator[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(GRADEBOOK_COLUMNS)
+    for row in rows:
+        writer.writerow(
+            ["" if row[column] is None else _text_value(row[column]) for column in GRADEBOOK_COLUMNS]
+        )
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(rows: Iterator[dict]) -> Iterator[bytes]:
+    chunk = []
+    size = 0
+    for row in rows:
+        line = json.dumps({column: _text_value(value) for column, value in row.items()}) + "\n"
+        chunk.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(chunk).encode("utf-8")
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
+
+
+def _encode_xlsx(rows: Iterator[dict]) -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Gradebook")
+    sheet.append(GRADEBOOK_COLUMNS)
+    for row in rows:
+        sheet.append([row[column] for column in GRADEBOOK_COLUMNS])
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while chunk := output.read(FLUSH_BYTES):
+            yield chunk
+
+
+ENCODERS = {"csv": _encode_csv, "ndjson": _encode_ndjson, "xlsx": _encode_xlsx}
+
+
+def _stream(professor_id: int, project_id: Optional[int], format: str) -> Iterator[bytes]:
+    # The response body is sent after the request's session is closed, so the
+    # export reads through a session of its own
+    db = SessionLocal()
+    try:
+        yield from ENCODERS[format](iter_gradebook(db, professor_id, project_id))
+    finally:
+        db.close()
+
+
+def export_gradebook(
+    db: Session, professor_id: int, project_id: Optional[int] = None, format: str = "csv"
+) -> StreamingResponse:
+    """Stream the gradebook of a professor's projects, or of one of them."""
+    if format not in GRADEBOOK_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported export format")
+    if format == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:  # pragma: no cover - optional dependency
+            raise HTTPException(status_code=400, detail="XLSX export needs openpyxl: pip install openpyxl")
+    if project_id is not None:
+        owned = db.query(Project.id).filter(
+            Project.id == project_id, Project.professor_id == professor_id
+        ).first()
+        if not owned:
+            raise HTTPException(status_code=404, detail="Project not found or you don't have permission")
+
+    filename = f"gradebook-project-{project_id}" if project_id is not None else "gradebook"
+    return StreamingResponse(
+        _stream(professor_id, project_id, format),
+        media_type=GRADEBOOK_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
@@ -1,7 +1,8 @@
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Optional
 from fastapi import HTTPException, UploadFile
-import os
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database.models.project_models import (
@@ -19,7 +20,10 @@ from app.schemas.project_schemas import (
     MilestoneCreate,
     MilestoneSubmissionCreate,
 )
-from app.utils.file_utils import save_upload_file
+from app.services.notification_service import notify, notify_submission_graded
+from app.services.storage_service import store_upload
+from app.utils.file_utils import upload_filename
+from app.utils.response_cache import response_cache
 
 
 def add_milestone_to_project(
@@ -45,6 +49,7 @@ def add_milestone_to_project(
     
     db.add(new_milestone)
     db.commit()
+    response_cache.bump("project", project_id)
     db.refresh(new_milestone)
     
     return {"message": "Milestone added successfully", "milestone_id": new_milestone.id}
@@ -77,7 +82,9 @@ def provide_milestone_feedback(
     submission.feedback = feedback_data.feedback
     submission.grade = feedback_data.grade
     
+    notify_submission_graded(db, submission, milestone)
     db.commit()
+    response_cache.bump("project", milestone.project_id)
     db.refresh(submission)
     
     return {"message": "Feedback provided successfully"}
@@ -209,7 +216,9 @@ def submit_milestone(
     # Check if milestone deadline has passed
     if milestone.due_date and datetime.now(timezone.utc).date() > milestone.due_date:
         raise HTTPException(status_code=400, detail="Milestone deadline has passed")
-    
+
+    filenames = [upload_filename(file) for file in files or []]
+
     # Create the submission
     submission = MilestoneSubmission(
         team_id=team_id,
@@ -220,20 +229,19 @@ def submit_milestone(
     )
     
     db.add(submission)
-    db.commit()
-    db.refresh(submission)
+    db.flush()
     
-    # Save uploaded files if any
+    # Save uploaded files if any; identical content is stored only once.
+    # The submission and its documents commit together, so a failed upload
+    # leaves no half-submitted milestone behind
     if files:
-        upload_dir = os.path.join("uploads", "milestone_submissions", str(submission.id))
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        for file in files:
-            file_path = save_upload_file(file, upload_dir)
+        for file, filename in zip(files, filenames):
+            blob = store_upload(db, file)
             document = SubmissionDocument(
                 submission_id=submission.id,
-                filename=file.filename,
-                file_path=file_path
+                filename=filename,
+                file_path=blob.storage_key,
+                content_hash=blob.sha256
             )
             db.add(document)
     
@@ -243,7 +251,31 @@ def submit_milestone(
         final_submission_text += "\n\nLinks:\n" + "\n".join(links)
     
     submission.submission_text = final_submission_text
+
+    professor_user_id = (
+        db.query(Professor.user_id)
+        .join(Project, Project.professor_id == Professor.id)
+        .filter(Project.id == milestone.project_id)
+        .scalar()
+    )
+    notify(
+        db,
+        "submission.submitted",
+        {
+            "submission_id": submission.id,
+            "milestone_id": milestone.id,
+            "milestone_title": milestone.title,
+            "project_id": milestone.project_id,
+            "team_id": team_id,
+            "documents": len(files or []),
+        },
+        user_ids=[professor_user_id],
+        team_ids=[team_id],
+        exclude_student_ids=[student_id] if student_id else [],
+        idempotency_key=f"submission.submitted:{submission.id}",
+    )
     db.commit()
+    response_cache.bump("project", milestone.project_id)
     
     return {
         "message": "Milestone submitted successfully",
@@ -251,105 +283,106 @@ def submit_milestone(
     }
 
 
-def get_milestone_submissions(db: Session, professor_id: int, project_id: Optional[int] = None) -> List[dict]:
-    """Get all milestone submissions for a professor, optionally filtered by project."""
-    # Verify professor exists
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    if not professor:
-        raise HTTPException(status_code=404, detail="Professor not found")
-    
-    # Build query for projects owned by this professor
-    query = db.query(Project).filter(Project.professor_id == professor_id)
-    
-    # Filter by project_id if provided
+def get_milestone_submissions(
+    db: Session,
+    professor_id: int,
+    project_id: Optional[int] = None,
+    is_graded: Optional[bool] = None,
+    submitted_from: Optional[date] = None,
+    submitted_to: Optional[date] = None,
+) -> List[dict]:
+    """Get all milestone submissions for a professor, optionally filtered by
+    project, grading state and submission date (inclusive range).
+
+    Runs three queries however many submissions there are: the submissions
+    with their milestone and team, then the members of those teams and the
+    documents of those submissions.
+    """
+    projects = select(Project.id).where(Project.professor_id == professor_id)
     if project_id:
-        query = query.filter(Project.id == project_id)
-    
-    projects = query.all()
-    if not projects:
-        return []
-    
-    project_ids = [project.id for project in projects]
-    
-    # Get all milestones for these projects
-    milestones = db.query(Milestone).filter(Milestone.project_id.in_(project_ids)).all()
-    if not milestones:
+        projects = projects.where(Project.id == project_id)
+
+    # Submissions of teams no longer assigned to one of these projects are left out
+    query = (
+        db.query(MilestoneSubmission, Milestone, ProjectTeam)
+        .join(Milestone, MilestoneSubmission.milestone_id == Milestone.id)
+        .join(ProjectTeam, MilestoneSubmission.team_id == ProjectTeam.id)
+        .filter(
+            Milestone.project_id.in_(projects),
+            ProjectTeam.project_id.in_(projects),
+        )
+    )
+    if is_graded is not None:
+        query = query.filter(
+            MilestoneSubmission.grade.isnot(None)
+            if is_graded
+            else MilestoneSubmission.grade.is_(None)
+        )
+    if submitted_from:
+        query = query.filter(
+            MilestoneSubmission.submitted_at >= datetime.combine(submitted_from, time.min)
+        )
+    if submitted_to:
+        query = query.filter(
+            MilestoneSubmission.submitted_at
+            < datetime.combine(submitted_to + timedelta(days=1), time.min)
+        )
+
+    rows = query.order_by(MilestoneSubmission.id).all()
+    if not rows:
         return []
-    
-    milestone_ids = [milestone.id for milestone in milestones]
-    
-    # Get all submissions for these milestones
-    submissions = db.query(MilestoneSubmission).filter(
-        MilestoneSubmission.milestone_id.in_(milestone_ids)
-    ).all()
-    
-    # Create a lookup dictionary for milestones and teams
-    milestone_lookup = {m.id: m for m in milestones}
-    
-    teams = db.query(ProjectTeam).filter(ProjectTeam.project_id.in_(project_ids)).all()
-    team_lookup = {t.id: t for t in teams}
-    
-    # Build response
-    result = []
-    for submission in submissions:
-        milestone = milestone_lookup.get(submission.milestone_id)
-        team = team_lookup.get(submission.team_id)
-        
-        if not milestone or not team:
-            continue
-        
-        # Get team members
-        team_members_query = db.query(
-            TeamMember, Student, User
-        ).join(
-            Student, TeamMember.student_id == Student.id
-        ).join(
-            User, Student.user_id == User.id
-        ).filter(
-            TeamMember.team_id == team.id
-        ).all()
-        
-        team_members = [
+
+    # Teams repeat across submissions, so members are loaded once per team
+    team_ids = {team.id for _, _, team in rows}
+    members_by_team = defaultdict(list)
+    for member, student, user in (
+        db.query(TeamMember, Student, User)
+        .join(Student, TeamMember.student_id == Student.id)
+        .join(User, Student.user_id == User.id)
+        .filter(TeamMember.team_id.in_(team_ids))
+        .order_by(TeamMember.id)
+    ):
+        members_by_team[member.team_id].append(
             {
-                "id": member[0].id,
-                "student_id": member[1].id,
-                "name": member[2].full_name,
-                "email": member[2].email
+                "id": member.id,
+                "student_id": student.id,
+                "name": user.full_name,
+                "email": user.email
             }
-            for member in team_members_query
-        ]
-        
-        # Get submission documents
-        documents = db.query(SubmissionDocument).filter(
-            SubmissionDocument.submission_id == submission.id
-        ).all()
-        
-        submission_docs = [
+        )
+
+    documents_by_submission = defaultdict(list)
+    for doc in (
+        db.query(SubmissionDocument)
+        .filter(SubmissionDocument.submission_id.in_([submission.id for submission, _, _ in rows]))
+        .order_by(SubmissionDocument.id)
+    ):
+        documents_by_submission[doc.submission_id].append(
             {
                 "id": doc.id,
                 "filename": doc.filename,
                 "file_path": doc.file_path,
                 "uploaded_at": doc.uploaded_at
             }
-            for doc in documents
-        ]
-        
-        result.append({
+        )
+
+    return [
+        {
             "submission_id": submission.id,
             "milestone_id": milestone.id,
             "milestone_title": milestone.title,
             "project_id": milestone.project_id,
             "team_id": team.id,
             "team_name": team.name,
-            "team_members": team_members,
+            "team_members": members_by_team[team.id],
             "submitted_at": submission.submitted_at,
             "grade": submission.grade,
             "feedback": submission.feedback,
-            "documents": submission_docs,
+            "documents": documents_by_submission[submission.id],
             "is_graded": submission.grade is not None
-        })
-    
-    return result
+        }
+        for submission, milestone, team in rows
+    ]
 
 
 def update_milestone_submission_grade(
@@ -381,8 +414,10 @@ def update_milestone_submission_grade(
     # Update the submission
     submission.grade = grade
     submission.feedback = feedback
+    notify_submission_graded(db, submission, milestone)
     
     db.commit()
+    response_cache.bump("project", milestone.project_id)
     db.refresh(submission)
     
     return {
@@ -1,9 +1,13 @@
 # services/project_service.py
 
+import json
+import mimetypes
 import os
-from fastapi import HTTPException, UploadFile
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import HTTPException, Response, UploadFile
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy import String, cast, exists, select, update
+from sqlalchemy.orm import Session, aliased, joinedload
 from datetime import datetime, timezone
 
 from app.database.models.project_models import (
@@ -16,7 +20,10 @@ from app.database.models.project_models import (
     TeamApplication,
     StudentTeamApplication,
 )
+from app.database.models.catalog_models import ProjectCatalogEntry
+from app.database.models.professor_models import Professor
 from app.database.models.student_models import Student
+from app.database.models.user_models import User
 from app.schemas.project_schemas import (
     MilestoneCreate,
     ProjectCreate,
@@ -24,10 +31,31 @@ from app.schemas.project_schemas import (
     ProjectTeamCreate,
     MilestoneSubmissionCreate,
 )
-from app.schemas.enum_schemas import ProjectStatusEnum, TeamStatusEnum
+from app.schemas.enum_schemas import (
+    DepartmentEnum,
+    ProjectStatusEnum,
+    TeamStatusEnum,
+    YearEnum,
+)
+from app.services.matching_service import matching_engine
+from app.services.notification_service import notify, notify_submission_graded
+from app.services.outbox_service import enqueue
+from app.services.search_service import index_project, remove_project, search_projects
+from app.services.storage_service import (
+    GARBAGE_COLLECTION_TOPIC,
+    download_url,
+    local_path,
+    release_blobs,
+    store_upload,
+)
+from app.utils.file_utils import upload_filename
+from app.utils.http_cache import http_date, is_not_modified
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.response_cache import response_cache
+from app.utils.settings import settings
 
 
-async def create_project(db: Session, project_data: ProjectCreate, professor_id: int):
+def create_project(db: Session, project_data: ProjectCreate, professor_id: int):
     """Create a new project with milestones"""
     # Create project
     milestones_data = project_data.milestones
@@ -45,12 +73,36 @@ async def create_project(db: Session, project_data: ProjectCreate, professor_id:
 
     db.commit()
     db.refresh(new_project)
+    index_project(db, new_project)
     return new_project
 
 
-def get_all_projects_by_professor(db: Session, professor_id: int):
-    """Get all projects for a professor"""
-    return db.query(Project).filter(Project.professor_id == professor_id).all()
+def filter_projects_by_tags(query, tags: Optional[List[str]]):
+    """Keep projects tagged with every tag in ``tags``"""
+    for tag in tags or []:
+        # Tags are stored as a JSON array; match the serialized, quoted tag
+        query = query.filter(
+            cast(Project.tags, String).contains(json.dumps(tag), autoescape=True)
+        )
+    return query
+
+
+def get_all_projects_by_professor(
+    db: Session,
+    professor_id: int,
+    page: PageParams,
+    status: Optional[ProjectStatusEnum] = None,
+    year: Optional[YearEnum] = None,
+    tags: Optional[List[str]] = None,
+) -> Page:
+    """Get a page of projects for a professor"""
+    query = db.query(Project).filter(Project.professor_id == professor_id)
+    if status:
+        query = query.filter(Project.status == status)
+    if year:
+        query = query.filter(Project.year == year)
+    query = filter_projects_by_tags(query, tags)
+    return paginate(query, Project.id, page)
 
 
 def get_project_by_id(db: Session, project_id: int):
@@ -72,6 +124,7 @@ def update_project_status(
 
     project.status = status
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(project)
     return project
 
@@ -93,11 +146,13 @@ def update_project(
         setattr(project, key, value)
 
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(project)
+    index_project(db, project)
     return project
 
 
-async def add_resource_to_project(
+def add_resource_to_project(
     db: Session, project_id: int, file: UploadFile, professor_id: int
 ):
     """Add a resource file to project"""
@@ -109,30 +164,33 @@ async def add_resource_to_project(
             status_code=403, detail="Not authorized to update this project"
         )
 
-    # Create resources directory if it doesn't exist
-    upload_dir = f"uploads/projects/{project_id}/resources"
-    os.makedirs(upload_dir, exist_ok=True)
-
-    # Save file
-    file_path = f"{upload_dir}/{file.filename}"
-    contents = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    filename = upload_filename(file)
+    # Store the content once by hash; the original name is kept on the record
+    blob = store_upload(db, file)
 
     # Create resource record
     resource = ProjectResource(
         project_id=project_id,
-        filename=file.filename,
-        file_path=file_path,
+        filename=filename,
+        file_path=blob.storage_key,
+        content_hash=blob.sha256,
     )
     db.add(resource)
     db.commit()
+    response_cache.bump("project", resource.project_id)
     db.refresh(resource)
     return resource
 
 
-async def download_resource(db: Session, project_id: int, resource_id: int):
-    """Download a project resource"""
+def download_resource(
+    db: Session, project_id: int, resource_id: int, request_headers=None
+):
+    """Download a project resource.
+
+    Byte ranges (including multi-range) and If-Range are served by
+    FileResponse; If-None-Match/If-Modified-Since are answered with 304.
+    With a remote storage backend the client is redirected to a presigned URL.
+    """
     resource = (
         db.query(ProjectResource)
         .filter(
@@ -144,13 +202,44 @@ async def download_resource(db: Session, project_id: int, resource_id: int):
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
 
-    if not os.path.exists(resource.file_path):
+    if resource.content_hash:
+        # Remote backends serve the bytes themselves through a presigned URL
+        url = download_url(resource.file_path, resource.filename)
+        if url:
+            return RedirectResponse(url, status_code=307)
+        file_path = local_path(resource.file_path)
+    else:
+        file_path = resource.file_path
+
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Resource file not found")
 
+    # Content-addressed files get a strong ETag from their hash; legacy files
+    # fall back to one derived from mtime and size
+    if resource.content_hash:
+        etag = f'"{resource.content_hash}"'
+    else:
+        etag = f'"{int(stat_result.st_mtime):x}-{stat_result.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat_result.st_mtime),
+        "Cache-Control": settings.RESOURCE_CACHE_CONTROL,
+    }
+
+    if request_headers is not None and is_not_modified(
+        request_headers, etag, stat_result.st_mtime
+    ):
+        return Response(status_code=304, headers=headers)
+
     return FileResponse(
-        resource.file_path,
+        file_path,
         filename=resource.filename,
-        media_type="application/octet-stream",
+        media_type=mimetypes.guess_type(resource.filename)[0]
+        or "application/octet-stream",
+        headers=headers,
+        stat_result=stat_result,
     )
 
 
@@ -182,10 +271,113 @@ def create_team(db: Session, team_data: ProjectTeamCreate, student_id: int):
         db.add(member)
 
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(project)
     return project
 
 
+def lock_project(db: Session, project_id: int) -> Optional[Project]:
+    """Load a project and lock its row until the transaction ends.
+
+    Serializes the team assignment of a project across concurrent requests on
+    Postgres. SQLite has no row locks, but serializes writers on the database,
+    which the guarded updates below rely on.
+    """
+    return (
+        db.query(Project)
+        .filter(Project.id == project_id)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+
+def assign_approved_team(db: Session, project_id: int, team_id: int) -> dict:
+    """Make a team the approved team of a project and reject the competition.
+
+    Every step is a single set-based UPDATE; call with the project locked and
+    commit afterwards. Raises 400, with the transaction rolled back, when the
+    project already has another approved team. Returns the affected row
+    counts and the ids of the teams whose applications were rejected.
+    """
+    # Release competing teams first: project_id is unique per team
+    released_teams = db.execute(
+        update(ProjectTeam)
+        .where(
+            ProjectTeam.project_id == project_id,
+            ProjectTeam.id != team_id,
+            ProjectTeam.status != TeamStatusEnum.APPROVED,
+        )
+        .values(project_id=None, status=TeamStatusEnum.REJECTED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # The guard is part of the statement, so of two racing approvals only the
+    # first to write wins
+    other_team = aliased(ProjectTeam)
+    claimed = db.execute(
+        update(ProjectTeam)
+        .where(
+            ProjectTeam.id == team_id,
+            ~exists().where(
+                other_team.project_id == project_id, other_team.id != team_id
+            ),
+        )
+        .values(project_id=project_id, status=TeamStatusEnum.APPROVED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="This project already has an approved team"
+        )
+
+    competing = (
+        TeamApplication.project_id == project_id,
+        TeamApplication.team_id != team_id,
+        TeamApplication.status != TeamStatusEnum.REJECTED,
+    )
+    rejected_team_ids = (
+        db.execute(select(TeamApplication.team_id).where(*competing).distinct())
+        .scalars()
+        .all()
+    )
+    rejected_applications = db.execute(
+        update(TeamApplication)
+        .where(*competing)
+        .values(status=TeamStatusEnum.REJECTED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    approved_applications = db.execute(
+        update(TeamApplication)
+        .where(
+            TeamApplication.project_id == project_id,
+            TeamApplication.team_id == team_id,
+        )
+        .values(status=TeamStatusEnum.APPROVED)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return {
+        "approved_applications": approved_applications,
+        "rejected_applications": rejected_applications,
+        "released_teams": released_teams,
+        "rejected_team_ids": sorted(rejected_team_ids),
+    }
+
+
+def team_status_result(team: ProjectTeam, counts: dict) -> dict:
+    return {
+        "id": team.id,
+        "name": team.name,
+        "project_id": team.project_id,
+        "leader_id": team.leader_id,
+        "is_locked": team.is_locked,
+        "status": team.status,
+        **{key: value for key, value in counts.items() if key != "rejected_team_ids"},
+    }
+
+
 def update_team_status(
     db: Session, team_id: int, status: TeamStatusEnum, professor_id: int
 ):
@@ -202,7 +394,7 @@ def update_team_status(
             status_code=400, detail="Team is not associated with any project"
         )
 
-    project = db.query(Project).filter(Project.id == team.project_id).first()
+    project = lock_project(db, team.project_id)
 
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -214,46 +406,61 @@ def update_team_status(
             detail="Only the professor who created the project can update team status",
         )
 
-    # Update team status
-    team.status = status
+    # The team may have been rejected while waiting for the lock
+    db.refresh(team)
+    if team.project_id != project.id:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Team is no longer associated with this project"
+        )
 
-    # If approved, check for other approved teams
+    counts = {"approved_applications": 0, "rejected_applications": 0, "released_teams": 0}
+    rejected_team_ids = []
     if status == TeamStatusEnum.APPROVED:
-        # If there's already an approved team for this project, reject this one
-        existing_approved_team = (
-            db.query(ProjectTeam)
-            .filter(
-                ProjectTeam.project_id == project.id,
-                ProjectTeam.status == TeamStatusEnum.APPROVED,
-                ProjectTeam.id != team.id,
-            )
-            .first()
+        counts = assign_approved_team(db, project.id, team.id)
+        rejected_team_ids = counts["rejected_team_ids"]
+    else:
+        values = {"status": status}
+        if status == TeamStatusEnum.REJECTED:
+            # If rejected, remove the project_id from the team
+            values["project_id"] = None
+        db.execute(
+            update(ProjectTeam)
+            .where(ProjectTeam.id == team.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
         )
-
-        if existing_approved_team:
-            raise HTTPException(
-                status_code=400, detail="This project already has an approved team"
+        # Update the corresponding team application if it exists
+        updated = db.execute(
+            update(TeamApplication)
+            .where(
+                TeamApplication.team_id == team.id,
+                TeamApplication.project_id == project.id,
             )
-    elif status == TeamStatusEnum.REJECTED:
-        # If rejected, remove the project_id from the team
-        team.project_id = None
-
-    # Update the corresponding team application if it exists
-    application = (
-        db.query(TeamApplication)
-        .filter(
-            TeamApplication.team_id == team_id, TeamApplication.project_id == project.id
-        )
-        .first()
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if status == TeamStatusEnum.REJECTED:
+            counts["rejected_applications"] = updated
+
+    notify(
+        db,
+        "team.status_changed",
+        {"team_id": team.id, "project_id": project.id, "status": status.value},
+        team_ids=[team.id],
     )
-
-    if application:
-        application.status = status
-
+    if rejected_team_ids:
+        notify(
+            db,
+            "team_application.rejected",
+            {"project_id": project.id, "project_title": project.title},
+            team_ids=rejected_team_ids,
+        )
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(team)
 
-    return team
+    return team_status_result(team, counts)
 
 
 def add_milestone_to_project(
@@ -271,6 +478,7 @@ def add_milestone_to_project(
     new_milestone = Milestone(**milestone_data.dict(), project_id=project_id)
     db.add(new_milestone)
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(project)
     return project
 
@@ -313,7 +521,9 @@ def provide_milestone_feedback(
 
     submission.feedback = feedback_data.feedback
     submission.grade = feedback_data.grade
+    notify_submission_graded(db, submission, milestone)
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(submission)
     return submission
 
@@ -328,8 +538,27 @@ def delete_project(db: Session, project_id: int, professor_id: int):
             status_code=403, detail="Not authorized to delete this project"
         )
 
+    # Submissions are not cascaded from milestones, so remove them explicitly
+    # along with their documents before releasing the stored files
+    submissions = (
+        db.query(MilestoneSubmission)
+        .join(Milestone, MilestoneSubmission.milestone_id == Milestone.id)
+        .filter(Milestone.project_id == project_id)
+        .options(joinedload(MilestoneSubmission.documents))
+        .all()
+    )
+    hashes = [resource.content_hash for resource in project.resources]
+    for submission in submissions:
+        hashes.extend(document.content_hash for document in submission.documents)
+        db.delete(submission)
+
     db.delete(project)
+    release_blobs(db, hashes)
+    # Deleting the stored files may be slow (S3), so it happens after the response
+    enqueue(db, GARBAGE_COLLECTION_TOPIC, {})
     db.commit()
+    response_cache.bump("project", project_id)
+    remove_project(db, project_id)
 
 
 def get_detailed_project(db: Session, project_id: int):
@@ -585,6 +814,7 @@ def apply_team_to_project(db: Session, application_data: dict, student_id: int):
 
     db.add(new_application)
     db.commit()
+    response_cache.bump("project", new_application.project_id)
     db.refresh(new_application)
     return new_application
 
@@ -597,7 +827,7 @@ def approve_team_application(db: Session, application_id: int, professor_id: int
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    project = get_project_by_id(db, application.project_id)
+    project = lock_project(db, application.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -606,106 +836,127 @@ def approve_team_application(db: Session, application_id: int, professor_id: int
             status_code=403, detail="Not authorized to approve this application"
         )
 
-    # Check if project already has an approved team
-    if project.team and project.team.status == TeamStatusEnum.APPROVED:
-        raise HTTPException(
-            status_code=400, detail="Project already has an approved team"
-        )
-
-    # Update application status
-    application.status = TeamStatusEnum.APPROVED
-
-    # Assign team to project
-    team = application.team
-    team.project_id = project.id
-    team.status = TeamStatusEnum.APPROVED
-
-    # Reject all other applications for this project
-    other_applications = (
-        db.query(TeamApplication)
-        .filter(
-            TeamApplication.project_id == project.id,
-            TeamApplication.id != application.id,
-        )
-        .all()
+    # Assign the team to the project and reject all other applications; fails
+    # if the project already has an approved team
+    counts = assign_approved_team(db, project.id, application.team_id)
+
+    event = {"project_id": project.id, "project_title": project.title}
+    notify(
+        db,
+        "team_application.approved",
+        {**event, "application_id": application.id, "team_id": application.team_id},
+        team_ids=[application.team_id],
+        idempotency_key=f"team_application.approved:{application.id}",
+    )
+    notify(
+        db,
+        "team_application.rejected",
+        event,
+        team_ids=counts["rejected_team_ids"],
+        idempotency_key=f"team_application.rejected:{project.id}:{application.id}",
     )
-
-    for other_app in other_applications:
-        other_app.status = TeamStatusEnum.REJECTED
-
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(application)
-    return application
+    return {
+        "id": application.id,
+        "project_id": application.project_id,
+        "team_id": application.team_id,
+        "status": application.status,
+        "motivation": application.motivation,
+        "created_at": application.created_at,
+        "rejected_applications": counts["rejected_applications"],
+        "released_teams": counts["released_teams"],
+    }
 
 
 def get_available_projects_for_student(db: Session, student_id: int):
     """Get all available projects that the student is eligible for"""
-    from app.database.models.student_models import Student
-
     # Get student information to check eligibility
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    # Get all projects that are open or in progress
-    projects = (
-        db.query(Project)
+    applied_project_ids = get_applied_project_ids(db, student_id)
+
+    # Professor, department and deadline come precomputed from the catalog
+    entries = (
+        db.query(ProjectCatalogEntry)
         .filter(
-            Project.status.in_([ProjectStatusEnum.OPEN, ProjectStatusEnum.IN_PROGRESS])
+            ProjectCatalogEntry.status.in_(
+                [ProjectStatusEnum.OPEN, ProjectStatusEnum.IN_PROGRESS]
+            )
         )
+        .order_by(ProjectCatalogEntry.project_id)
         .all()
     )
 
-    # Format projects with eligibility information
-    result = []
-    for project in projects:
-        # Check if student has already applied to this project
-        has_applied = False
-        student_teams = get_student_teams(db, student_id)
-        student_team_ids = [team.id for team in student_teams]
-
-        if student_team_ids:
-            application = (
-                db.query(TeamApplication)
-                .filter(
-                    TeamApplication.project_id == project.id,
-                    TeamApplication.team_id.in_(student_team_ids),
-                )
-                .first()
-            )
-            has_applied = application is not None
-
-        # Check if deadline has passed (using the last milestone as deadline)
-        deadline_passed = False
-        due_date = None
-        if project.milestones:
-            due_date = max(milestone.due_date for milestone in project.milestones)
-            if due_date and due_date < datetime.now().date():
-                deadline_passed = True
+    today = datetime.now().date()
+    return [
+        format_catalog_entry(entry, applied_project_ids, today) for entry in entries
+    ]
+
+
+def format_catalog_entry(entry: ProjectCatalogEntry, applied_project_ids, today):
+    """Shape a catalog entry the way the student project list expects"""
+    # Check if deadline has passed (using the last milestone as deadline)
+    deadline_passed = bool(entry.deadline and entry.deadline < today)
+
+    # Determine if student is eligible (based on academic year)
+    is_eligible = True  # Default to eligible
+
+    return {
+        "id": entry.project_id,
+        "title": entry.title,
+        "summary": entry.summary,
+        "professor": entry.professor_name,
+        "department": entry.department.value if entry.department else None,
+        "yearEligibility": [entry.year.value],  # Convert to list for frontend
+        "teamSize": "2-4",  # Default team size
+        "tags": entry.tags if entry.tags else [],
+        "deadline": entry.deadline.isoformat() if entry.deadline else None,
+        "isEligible": is_eligible,
+        "hasApplied": entry.project_id in applied_project_ids,
+        "deadlinePassed": deadline_passed,
+        "status": entry.status.value,
+    }
 
-        # Determine if student is eligible (based on academic year)
-        is_eligible = True  # Default to eligible
 
-        # Format project data
-        project_data = {
-            "id": project.id,
-            "title": project.title,
-            "summary": project.description,
-            "professor": project.professor.user.full_name,
-            "department": project.professor.department.value,
-            "yearEligibility": [project.year.value],  # Convert to list for frontend
-            "teamSize": "2-4",  # Default team size
-            "tags": project.tags if project.tags else [],
-            "deadline": due_date.isoformat() if due_date else None,
-            "isEligible": is_eligible,
-            "hasApplied": has_applied,
-            "deadlinePassed": deadline_passed,
-            "status": project.status.value,
-        }
+def get_applied_project_ids(db: Session, student_id: int) -> set:
+    """Projects the student's teams have applied to, resolved in one query"""
+    student_team_ids = (
+        db.query(TeamMember.team_id)
+        .filter(TeamMember.student_id == student_id)
+        .scalar_subquery()
+    )
+    return {
+        project_id
+        for (project_id,) in db.query(TeamApplication.project_id)
+        .filter(TeamApplication.team_id.in_(student_team_ids))
+        .distinct()
+    }
 
-        result.append(project_data)
 
-    return result
+def search_projects_for_student(
+    db: Session,
+    student_id: int,
+    text: Optional[str],
+    limit: int,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+    status: Optional[ProjectStatusEnum] = None,
+    tags: Optional[List[str]] = None,
+):
+    """Search the project catalog, best matches first"""
+    results = search_projects(
+        db, text, limit, department=department, year=year, status=status, tags=tags
+    )
+    applied_project_ids = get_applied_project_ids(db, student_id)
+    today = datetime.now().date()
+    return [
+        {**format_catalog_entry(entry, applied_project_ids, today), "score": round(score, 4)}
+        for entry, score in results
+    ]
 
 
 def get_student_teams(db: Session, student_id: int):
@@ -764,136 +1015,154 @@ def withdraw_team_application(db: Session, application_id: int, student_id: int)
         )
 
     # Delete the application
+    project_id = application.project_id
     db.delete(application)
     db.commit()
+    response_cache.bump("project", project_id)
 
     return {"detail": "Application withdrawn successfully"}
 
 
 def get_student_active_projects(db: Session, student_id: int):
     """Get all projects that the student is actively working on"""
-    # Get teams where student is a member
-    teams = get_student_teams(db, student_id)
+    # Get teams where student is a member, with their project and professor
+    student_team_ids = (
+        db.query(TeamMember.team_id)
+        .filter(TeamMember.student_id == student_id)
+        .scalar_subquery()
+    )
+    teams = (
+        db.query(ProjectTeam)
+        .join(Project, ProjectTeam.project_id == Project.id)
+        .options(
+            joinedload(ProjectTeam.project)
+            .joinedload(Project.professor)
+            .joinedload(Professor.user)
+        )
+        .filter(ProjectTeam.id.in_(student_team_ids))
+        .all()
+    )
+    if not teams:
+        return []
+
+    team_ids = [team.id for team in teams]
+    project_ids = [team.project_id for team in teams]
+
+    # Load members, milestones and submissions for all teams at once
+    members_by_team = {}
+    member_rows = (
+        db.query(TeamMember, User)
+        .join(Student, TeamMember.student_id == Student.id)
+        .join(User, Student.user_id == User.id)
+        .filter(TeamMember.team_id.in_(team_ids))
+        .order_by(TeamMember.id)
+        .all()
+    )
+    for member, user in member_rows:
+        members_by_team.setdefault(member.team_id, []).append((member, user))
+
+    milestones_by_project = {}
+    for milestone in (
+        db.query(Milestone)
+        .filter(Milestone.project_id.in_(project_ids))
+        .order_by(Milestone.due_date)
+    ):
+        milestones_by_project.setdefault(milestone.project_id, []).append(milestone)
+
+    submissions = {
+        (submission.team_id, submission.milestone_id): submission
+        for submission in db.query(MilestoneSubmission).filter(
+            MilestoneSubmission.team_id.in_(team_ids)
+        )
+    }
 
     result = []
     for team in teams:
-        if team.project_id:
-            project = get_project_by_id(db, team.project_id)
-            if project:
-                team_members = (
-                    db.query(TeamMember).filter(TeamMember.team_id == team.id).all()
-                )
+        project = team.project
 
-                members = []
-                for member in team_members:
-                    student = (
-                        db.query(Student)
-                        .filter(Student.id == member.student_id)
-                        .first()
-                    )
-                    if student and student.user:
-                        members.append(
-                            {
-                                "id": student.id,
-                                "name": student.user.full_name,
-                                "email": student.user.email,
-                                "initials": "".join(
-                                    [
-                                        name[0].upper()
-                                        for name in student.user.full_name.split()
-                                        if name
-                                    ]
-                                )[:2],
-                                "isLeader": member.student_id == team.leader_id,
-                            }
-                        )
-
-                milestones = (
-                    db.query(Milestone)
-                    .filter(Milestone.project_id == project.id)
-                    .order_by(Milestone.due_date)
-                    .all()
-                )
+        members = []
+        for member, user in members_by_team.get(team.id, []):
+            members.append(
+                {
+                    "id": member.student_id,
+                    "name": user.full_name,
+                    "email": user.email,
+                    "initials": "".join(
+                        [name[0].upper() for name in user.full_name.split() if name]
+                    )[:2],
+                    "isLeader": member.student_id == team.leader_id,
+                }
+            )
 
-                # Include milestone data in response
-                milestone_data = []
-                for milestone in milestones:
-                    submission = (
-                        db.query(MilestoneSubmission)
-                        .filter_by(milestone_id=milestone.id, team_id=team.id)
-                        .first()
-                    )
-                    milestone_data.append(
-                        {
-                            "id": milestone.id,
-                            "title": milestone.title,
-                            "description": milestone.description,
-                            "dueDate": milestone.due_date,
-                            "isSubmitted": submission is not None,
-                            "submissionDate": submission.submitted_at
-                            if submission
-                            else None,
-                        }
-                    )
-
-                total_milestones = len(milestones)
-                completed_milestones = sum(
-                    1
-                    for m in milestones
-                    if db.query(MilestoneSubmission)
-                    .filter_by(milestone_id=m.id, team_id=team.id)
-                    .first()
+        milestones = milestones_by_project.get(project.id, [])
+
+        # Include milestone data in response
+        milestone_data = []
+        upcoming_deadlines = []
+        completed_milestones = 0
+        for milestone in milestones:
+            submission = submissions.get((team.id, milestone.id))
+            if submission:
+                completed_milestones += 1
+            elif milestone.due_date:
+                upcoming_deadlines.append(
+                    {"milestone": milestone.title, "date": milestone.due_date}
                 )
-                progress = (
-                    int(completed_milestones / total_milestones * 100)
-                    if total_milestones > 0
-                    else 0
-                )
-
-                upcoming_deadlines = []
-                for milestone in milestones:
-                    submission = (
-                        db.query(MilestoneSubmission)
-                        .filter_by(milestone_id=milestone.id, team_id=team.id)
-                        .first()
-                    )
-                    if not submission and milestone.due_date:
-                        upcoming_deadlines.append(
-                            {"milestone": milestone.title, "date": milestone.due_date}
-                        )
-
-                is_near_deadline = False
-                current_milestone = "Not started"
-                if upcoming_deadlines:
-                    current_milestone = upcoming_deadlines[0]["milestone"]
-                    # Add logic to check if deadline is within 7 days if needed
-
-                project_data = {
-                    "id": project.id,
-                    "title": project.title,
-                    "professor": project.professor.user.full_name
-                    if project.professor and project.professor.user
-                    else "Unknown",
-                    "status": project.status.value,
-                    "teamMembers": members,
-                    "currentMilestone": current_milestone,
-                    "progress": progress,
-                    "dueDates": upcoming_deadlines,
-                    "isTeamBased": True,
-                    "isNearDeadline": is_near_deadline,
-                    "isCompleted": project.status == ProjectStatusEnum.COMPLETED,
-                    "team": {"id": team.id, "name": team.name},
-                    "milestones": milestone_data,  # ✅ Added milestones
+            milestone_data.append(
+                {
+                    "id": milestone.id,
+                    "title": milestone.title,
+                    "description": milestone.description,
+                    "dueDate": milestone.due_date,
+                    "isSubmitted": submission is not None,
+                    "submissionDate": submission.submitted_at if submission else None,
                 }
+            )
 
-                result.append(project_data)
+        total_milestones = len(milestones)
+        progress = (
+            int(completed_milestones / total_milestones * 100)
+            if total_milestones > 0
+            else 0
+        )
+
+        is_near_deadline = False
+        current_milestone = "Not started"
+        if upcoming_deadlines:
+            current_milestone = upcoming_deadlines[0]["milestone"]
+            # Add logic to check if deadline is within 7 days if needed
+
+        project_data = {
+            "id": project.id,
+            "title": project.title,
+            "professor": project.professor.user.full_name
+            if project.professor and project.professor.user
+            else "Unknown",
+            "status": project.status.value,
+            "teamMembers": members,
+            "currentMilestone": current_milestone,
+            "progress": progress,
+            "dueDates": upcoming_deadlines,
+            "isTeamBased": True,
+            "isNearDeadline": is_near_deadline,
+            "isCompleted": project.status == ProjectStatusEnum.COMPLETED,
+            "team": {"id": team.id, "name": team.name},
+            "milestones": milestone_data,  # ✅ Added milestones
+        }
+
+        result.append(project_data)
 
     return result
 
 
-def get_all_teams(db: Session):
-    """Get all teams available for collaboration"""
-    teams = db.query(ProjectTeam).all()
+def get_all_teams(
+    db: Session, page: PageParams, status: Optional[TeamStatusEnum] = None
+) -> Page:
+    """Get a page of teams available for collaboration"""
+    query = db.query(ProjectTeam)
+    if status:
+        query = query.filter(ProjectTeam.status == status)
+    teams, next_cursor = paginate(query, ProjectTeam.id, page)
 
     result = []
     for team in teams:
@@ -933,12 +1202,22 @@ def get_all_teams(db: Session):
 
         result.append(team_data)
 
-    return result
+    return Page(result, next_cursor)
 
 
-def get_all_students_with_details(db: Session):
-    """Get all students with their skills and interests"""
-    students = db.query(Student).all()
+def get_all_students_with_details(
+    db: Session,
+    page: PageParams,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+) -> Page:
+    """Get a page of students with their skills and interests"""
+    query = db.query(Student).join(User, Student.user_id == User.id)
+    if department:
+        query = query.filter(Student.department == department)
+    if year:
+        query = query.filter(Student.year == year)
+    students, next_cursor = paginate(query, Student.id, page)
 
     result = []
     for student in students:
@@ -973,7 +1252,7 @@ def get_all_students_with_details(db: Session):
 
         result.append(student_data)
 
-    return result
+    return Page(result, next_cursor)
 
 
 def get_student_teams_detailed(db: Session, student_id: int):
@@ -1203,7 +1482,24 @@ def approve_student_application(db: Session, application_id: int, student_id: in
     new_member = TeamMember(team_id=team.id, student_id=application.student_id)
 
     db.add(new_member)
+    notify(
+        db,
+        "team_join_request.approved",
+        {"application_id": application.id, "team_id": team.id, "team_name": team.name},
+        student_ids=[application.student_id],
+        idempotency_key=f"team_join_request.approved:{application.id}",
+    )
+    notify(
+        db,
+        "team.member_joined",
+        {"team_id": team.id, "student_id": application.student_id},
+        team_ids=[team.id],
+        exclude_student_ids=[application.student_id],
+        idempotency_key=f"team.member_joined:{application.id}",
+    )
     db.commit()
+    if team.project_id:
+        response_cache.bump("project", team.project_id)
 
     return {"detail": "Application approved and student added to team"}
 
@@ -1234,6 +1530,13 @@ def reject_student_application(db: Session, application_id: int, student_id: int
 
     # Update application status
     application.status = TeamStatusEnum.REJECTED
+    notify(
+        db,
+        "team_join_request.rejected",
+        {"application_id": application.id, "team_id": team.id, "team_name": team.name},
+        student_ids=[application.student_id],
+        idempotency_key=f"team_join_request.rejected:{application.id}",
+    )
     db.commit()
 
     return {"detail": "Application rejected"}
@@ -1258,6 +1561,7 @@ def update_student_profile(db: Session, student_id: int, profile_data: dict):
 
     db.commit()
     db.refresh(student)
+    matching_engine.update_student(student)
 
     return student
 
@@ -1329,6 +1633,7 @@ def submit_milestone_feedback(
             raise HTTPException(status_code=400, detail=str(e))
 
     db.commit()
+    response_cache.bump("project", project.id)
     db.refresh(submission)
 
     return submission
@@ -1376,6 +1681,7 @@ def add_project_milestone(
 
     db.add(new_milestone)
     db.commit()
+    response_cache.bump("project", project_id)
     db.refresh(new_milestone)
 
     return new_milestone
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""Ranked search over the project catalog.
+
+On Postgres, matching and ranking use full-text search against GIN indexes
+on ``project_catalog`` (see migration 0006). Other databases use an
+in-process inverted index with BM25 ranking, loaded from the catalog on the
+first search and kept current by ``index_project``/``remove_project``, which
+the project service calls after committing a change. Each API process holds
+its own copy, so the fallback assumes a single process, as with SQLite.
+
+Query terms are prefix-matched and all of them must match. Title matches
+rank above tag matches, which rank above description matches. Tag filters
+match whole tags exactly, as in the professor project list.
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Text, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.database.models.catalog_models import ProjectCatalogEntry
+from app.schemas.enum_schemas import DepartmentEnum, ProjectStatusEnum, YearEnum
+
+TOKEN_PATTERN = re.compile(r"\w+")
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "summary": 1.0}
+# Terms that only share a prefix with a query term count for less than exact matches
+PREFIX_MATCH_WEIGHT = 0.5
+BM25_K1 = 1.2
+BM25_B = 0.75
+CANDIDATE_CHUNK_SIZE = 500
+DEFAULT_STATUSES = [ProjectStatusEnum.OPEN, ProjectStatusEnum.IN_PROGRESS]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """Thread-safe term -> {project_id: weighted term frequency} index."""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.tag_postings: Dict[str, Set[int]] = defaultdict(set)
+        self.documents: Dict[int, Tuple[Dict[str, float], List[str], float]] = {}
+        self.total_length = 0.0
+        self.loaded = False
+        self._vocabulary: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    def load(self, db: Session):
+        """Index every catalog row, once per process."""
+        with self._lock:
+            if self.loaded:
+                return
+            rows = db.query(
+                ProjectCatalogEntry.project_id,
+                ProjectCatalogEntry.title,
+                ProjectCatalogEntry.summary,
+                ProjectCatalogEntry.tags,
+            )
+            for project_id, title, summary, tags in rows:
+                self.add(project_id, title, summary, tags)
+            self.loaded = True
+
+    def add(self, project_id: int, title: str, summary: str, tags: Optional[List[str]]):
+        with self._lock:
+            self.remove(project_id)
+            frequencies: Dict[str, float] = defaultdict(float)
+            for field, text in (
+                ("title", title),
+                ("tags", " ".join(tags or [])),
+                ("summary", summary),
+            ):
+                for term in tokenize(text):
+                    frequencies[term] += FIELD_WEIGHTS[field]
+
+            length = sum(frequencies.values())
+            for term, frequency in frequencies.items():
+                self.postings[term][project_id] = frequency
+            tags = list(tags or [])
+            for tag in tags:
+                self.tag_postings[tag].add(project_id)
+            self.documents[project_id] = (frequencies, tags, length)
+            self.total_length += length
+            self._vocabulary = None
+
+    def remove(self, project_id: int):
+        with self._lock:
+            document = self.documents.pop(project_id, None)
+            if document is None:
+                return
+            frequencies, tags, length = document
+            for term in frequencies:
+                self.postings[term].pop(project_id, None)
+                if not self.postings[term]:
+                    del self.postings[term]
+            for tag in tags:
+                self.tag_postings[tag].discard(project_id)
+                if not self.tag_postings[tag]:
+                    del self.tag_postings[tag]
+            self.total_length -= length
+            self._vocabulary = None
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Indexed terms starting with ``term``, with their match weight."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        matches = []
+        position = bisect_left(vocabulary, term)
+        while position < len(vocabulary) and vocabulary[position].startswith(term):
+            candidate = vocabulary[position]
+            matches.append((candidate, 1.0 if candidate == term else PREFIX_MATCH_WEIGHT))
+            position += 1
+        return matches
+
+    def search(self, terms: List[str], tags: Optional[List[str]] = None) -> Dict[int, float]:
+        """BM25 scores of the documents matching every term and tag."""
+        with self._lock:
+            scores: Optional[Dict[int, float]] = None
+            document_count = len(self.documents)
+            average_length = self.total_length / document_count if document_count else 0.0
+
+            for term in terms:
+                term_scores: Dict[int, float] = {}
+                for candidate, weight in self._expand(term):
+                    postings = self.postings[candidate]
+                    idf = math.log(
+                        1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5)
+                    )
+                    for project_id, frequency in postings.items():
+                        length = self.documents[project_id][2]
+                        score = weight * idf * frequency * (BM25_K1 + 1) / (
+                            frequency
+                            + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                        )
+                        # Several expansions of one term count once, at their best
+                        term_scores[project_id] = max(term_scores.get(project_id, 0.0), score)
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        project_id: score + term_scores[project_id]
+                        for project_id, score in scores.items()
+                        if project_id in term_scores
+                    }
+                if not scores:
+                    return {}
+
+            for tag in tags or []:
+                tagged = self.tag_postings.get(tag, set())
+                if scores is None:
+                    scores = {project_id: 0.0 for project_id in tagged}
+                else:
+                    scores = {
+                        project_id: score
+                        for project_id, score in scores.items()
+                        if project_id in tagged
+                    }
+            return scores or {}
+
+
+project_search_index = InvertedIndex()
+
+
+def uses_full_text_search(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def index_project(db: Session, project):
+    """Reflect a committed project change in the in-process index."""
+    if uses_full_text_search(db) or not project_search_index.loaded:
+        return
+    project_search_index.add(project.id, project.title, project.description, project.tags)
+
+
+def remove_project(db: Session, project_id: int):
+    if uses_full_text_search(db) or not project_search_index.loaded:
+        return
+    project_search_index.remove(project_id)
+
+
+def _filtered_catalog(
+    db: Session,
+    department: Optional[DepartmentEnum],
+    year: Optional[YearEnum],
+    status: Optional[ProjectStatusEnum],
+):
+    query = db.query(ProjectCatalogEntry)
+    if status:
+        query = query.filter(ProjectCatalogEntry.status == status)
+    else:
+        query = query.filter(ProjectCatalogEntry.status.in_(DEFAULT_STATUSES))
+    if department:
+        query = query.filter(ProjectCatalogEntry.department == department)
+    if year:
+        query = query.filter(ProjectCatalogEntry.year == year)
+    return query
+
+
+def _search_vector():
+    """Weighted document vector; must match the expression of ix_project_catalog_search."""
+    english = literal_column("'english'::regconfig")
+    return (
+        func.setweight(
+            func.to_tsvector(english, func.coalesce(ProjectCatalogEntry.title, "")),
+            literal_column("'A'"),
+        )
+        .op("||")(
+            func.setweight(
+                func.to_tsvector(
+                    english, func.coalesce(cast(ProjectCatalogEntry.tags, Text), "")
+                ),
+                literal_column("'B'"),
+            )
+        )
+        .op("||")(
+            func.setweight(
+                func.to_tsvector(english, ProjectCatalogEntry.summary),
+                literal_column("'C'"),
+            )
+        )
+    )
+
+
+def _postgres_search(
+    query, terms: List[str], tags: Optional[List[str]], limit: int
+) -> List[Tuple[ProjectCatalogEntry, float]]:
+    if tags:
+        query = query.filter(
+            cast(ProjectCatalogEntry.tags, JSONB).contains(tags)
+        )
+    if not terms:
+        return [
+            (entry, 0.0)
+            for entry in query.order_by(ProjectCatalogEntry.project_id).limit(limit)
+        ]
+
+    # Every term is prefix-matched: "mach learn" -> 'mach':* & 'learn':*
+    ts_query = func.to_tsquery(
+        literal_column("'english'::regconfig"), " & ".join(f"{term}:*" for term in terms)
+    )
+    vector = _search_vector()
+    rank = func.ts_rank_cd(vector, ts_query).label("rank")
+    rows = (
+        query.add_columns(rank)
+        .filter(vector.op("@@")(ts_query))
+        .order_by(rank.desc(), ProjectCatalogEntry.project_id)
+        .limit(limit)
+        .all()
+    )
+    return [(entry, float(score)) for entry, score in rows]
+
+
+def _ranked_entries(
+    query, scores: Dict[int, float], limit: int
+) -> List[Tuple[ProjectCatalogEntry, float]]:
+    """Load the best-scoring candidates that pass the SQL filters, in rank order."""
+    ranked_ids = sorted(scores, key=lambda project_id: (-scores[project_id], project_id))
+    results = []
+    for start in range(0, len(ranked_ids), CANDIDATE_CHUNK_SIZE):
+        chunk = ranked_ids[start : start + CANDIDATE_CHUNK_SIZE]
+        entries = {
+            entry.project_id: entry
+            for entry in query.filter(ProjectCatalogEntry.project_id.in_(chunk))
+        }
+        for project_id in chunk:
+            if project_id in entries:
+                results.append((entries[project_id], scores[project_id]))
+                if len(results) == limit:
+                    return results
+    return results
+
+
+def search_projects(
+    db: Session,
+    text: Optional[str],
+    limit: int,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+    status: Optional[ProjectStatusEnum] = None,
+    tags: Optional[Iterable[str]] = None,
+) -> List[Tuple[ProjectCatalogEntry, float]]:
+    """Catalog entries matching the search text and filters, best first."""
+    terms = tokenize(text)
+    tags = list(tags or [])
+    query = _filtered_catalog(db, department, year, status)
+
+    if uses_full_text_search(db):
+        return _postgres_search(query, terms, tags, limit)
+
+    if not terms and not tags:
+        return [
+            (entry, 0.0)
+            for entry in query.order_by(ProjectCatalogEntry.project_id).limit(limit)
+        ]
+
+    project_search_index.load(db)
+    return _ranked_entries(query, project_search_index.search(terms, tags), limit)
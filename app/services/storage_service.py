@@ -0,0 +1,256 @@
+"""Content-addressed, deduplicating storage for uploaded files.
+
+Uploads are stored once per distinct SHA-256 in the configured object
+storage backend (see ``app.utils.object_storage``) and shared by every
+``ProjectResource``/``SubmissionDocument`` row that references them through
+``content_hash``. ``StoredBlob.ref_count`` tracks those rows; blobs whose
+count drops to zero are garbage-collected, either directly or through an
+outbox message (``GARBAGE_COLLECTION_TOPIC``) after the releasing commit.
+
+Each blob row has an object key of its own, so deleting the object of a
+collected row never removes content that a newer row for the same hash
+points at. Objects written by a transaction that does not commit are deleted
+when it ends; ``sweep_orphaned_objects`` removes any left behind by a process
+that died before that.
+"""
+
+import os
+import time
+import uuid
+from typing import Iterable, List, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.models.project_models import ProjectResource, SubmissionDocument
+from app.database.models.outbox_models import OutboxMessage
+from app.database.models.storage_models import StoredBlob
+from app.services.outbox_service import outbox_handler
+from app.utils.file_utils import stream_upload_to_file
+from app.utils.logger import get_logger
+from app.utils.object_storage import get_storage
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+GARBAGE_COLLECTION_TOPIC = "storage.collect_garbage"
+BLOB_PREFIX = "blobs/"
+
+_last_sweep = float("-inf")
+
+
+def blob_key(sha256: str) -> str:
+    """A new object key for content with this hash."""
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}-{uuid.uuid4().hex[:12]}"
+
+
+def _add_reference(db: Session, sha256: str) -> Optional[StoredBlob]:
+    """Atomically bump the reference count of an existing blob."""
+    result = db.execute(
+        update(StoredBlob)
+        .where(StoredBlob.sha256 == sha256)
+        .values(ref_count=StoredBlob.ref_count + 1)
+    )
+    if result.rowcount == 0:
+        return None
+    return db.query(StoredBlob).filter(StoredBlob.sha256 == sha256).one()
+
+
+def store_upload(db: Session, upload_file: UploadFile) -> StoredBlob:
+    """Store an upload, reusing the existing blob when the content is known.
+
+    The returned blob already counts the caller's reference; the caller must
+    save a row with ``content_hash=blob.sha256`` in the same transaction.
+    """
+    staged = stream_upload_to_file(
+        upload_file, settings.STORAGE_STAGING_DIR, uuid.uuid4().hex
+    )
+    try:
+        return add_blob_reference(
+            db,
+            staged.sha256,
+            staged.size,
+            staged.path,
+            content_type=upload_file.content_type,
+            move=True,
+        )
+    finally:
+        if os.path.exists(staged.path):
+            os.remove(staged.path)
+
+
+def add_blob_reference(
+    db: Session,
+    sha256: str,
+    size: int,
+    source_path: str,
+    content_type: Optional[str] = None,
+    move: bool = False,
+) -> StoredBlob:
+    """Count a new reference to the content of ``source_path``.
+
+    The file is only written to the storage backend when the hash is new, and
+    deleted again if the transaction does not commit.
+    """
+    blob = _add_reference(db, sha256)
+    if blob is not None:
+        return blob
+
+    key = blob_key(sha256)
+    get_storage().put_file(key, source_path, content_type=content_type, move=move)
+    db.info.setdefault("storage_uncommitted_keys", []).append(key)
+
+    blob = StoredBlob(sha256=sha256, size=size, storage_key=key, ref_count=1)
+    try:
+        with db.begin_nested():
+            db.add(blob)
+    except IntegrityError:
+        # Another request stored the same content first; share its object
+        db.info["storage_uncommitted_keys"].remove(key)
+        _delete_objects([key])
+        blob = _add_reference(db, sha256)
+    return blob
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_committed_objects(session):
+    # Also dispatched when a savepoint is released
+    if not session.in_nested_transaction():
+        session.info.pop("storage_uncommitted_keys", None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _delete_uncommitted_objects(session, transaction):
+    # Reached without a commit when the transaction was rolled back or closed
+    if transaction.parent is None:
+        _delete_objects(session.info.pop("storage_uncommitted_keys", ()))
+
+
+def _delete_objects(keys: Iterable[str]):
+    storage = get_storage()
+    for key in keys:
+        try:
+            storage.delete(key)
+        except Exception as exc:
+            # Left for sweep_orphaned_objects
+            logger.warning(f"Could not delete stored object {key}: {exc}")
+
+
+def download_url(key: str, filename: str) -> Optional[str]:
+    """Presigned URL for fetching the object directly from the backend, if supported."""
+    return get_storage().presigned_url(
+        key, filename, settings.S3_PRESIGNED_URL_EXPIRES_SECONDS
+    )
+
+
+def local_path(key: str) -> Optional[str]:
+    return get_storage().local_path(key)
+
+
+def release_blobs(db: Session, hashes: Iterable[Optional[str]]):
+    """Drop one reference per hash; rows without a hash are legacy files and skipped."""
+    for sha256 in hashes:
+        if sha256:
+            db.execute(
+                update(StoredBlob)
+                .where(StoredBlob.sha256 == sha256)
+                .values(ref_count=StoredBlob.ref_count - 1)
+            )
+
+
+def collect_garbage(db: Session) -> int:
+    """Delete blobs no longer referenced by any row. Returns the number removed.
+
+    Each row is deleted only if its count is still zero, so a blob an upload
+    re-references meanwhile keeps both its row and its object.
+    """
+    candidates = (
+        db.query(StoredBlob.id, StoredBlob.storage_key)
+        .filter(StoredBlob.ref_count <= 0)
+        .all()
+    )
+    keys: List[str] = []
+    for blob_id, key in candidates:
+        result = db.execute(
+            delete(StoredBlob)
+            .where(StoredBlob.id == blob_id, StoredBlob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            keys.append(key)
+    db.commit()
+
+    _delete_objects(keys)
+    if keys:
+        logger.info(f"Garbage-collected {len(keys)} unreferenced blobs")
+    return len(keys)
+
+
+def sweep_orphaned_objects(db: Session, grace_seconds: Optional[int] = None) -> int:
+    """Delete stored objects no blob row points at. Returns the number removed.
+
+    Only objects older than ``grace_seconds`` (STORAGE_ORPHAN_GRACE_SECONDS)
+    are considered, so uploads whose transaction is still open are kept.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.STORAGE_ORPHAN_GRACE_SECONDS
+    cutoff = time.time() - grace_seconds
+    stale = [
+        key
+        for key, modified in get_storage().list_objects(BLOB_PREFIX)
+        if modified < cutoff
+    ]
+
+    referenced = set()
+    for start in range(0, len(stale), 500):
+        referenced.update(
+            db.scalars(
+                select(StoredBlob.storage_key).where(
+                    StoredBlob.storage_key.in_(stale[start : start + 500])
+                )
+            )
+        )
+    orphans = [key for key in stale if key not in referenced]
+
+    _delete_objects(orphans)
+    if orphans:
+        logger.info(f"Deleted {len(orphans)} stored objects without a blob row")
+    return len(orphans)
+
+
+@outbox_handler(GARBAGE_COLLECTION_TOPIC)
+def _collect_garbage(db: Session, message: OutboxMessage):
+    global _last_sweep
+    collect_garbage(db)
+    if time.monotonic() - _last_sweep >= settings.STORAGE_ORPHAN_SWEEP_SECONDS:
+        _last_sweep = time.monotonic()
+        sweep_orphaned_objects(db)
+
+
+def storage_stats(db: Session) -> dict:
+    """Report how much space deduplication saves."""
+    blobs, stored_bytes, logical_bytes, references = db.query(
+        func.count(StoredBlob.id),
+        func.coalesce(func.sum(StoredBlob.size), 0),
+        func.coalesce(func.sum(StoredBlob.size * StoredBlob.ref_count), 0),
+        func.coalesce(func.sum(StoredBlob.ref_count), 0),
+    ).one()
+    legacy_files = (
+        db.query(func.count(ProjectResource.id))
+        .filter(ProjectResource.content_hash.is_(None))
+        .scalar()
+        + db.query(func.count(SubmissionDocument.id))
+        .filter(SubmissionDocument.content_hash.is_(None))
+        .scalar()
+    )
+    return {
+        "blobs": blobs,
+        "references": references,
+        "stored_bytes": stored_bytes,
+        "logical_bytes": logical_bytes,
+        "bytes_saved": logical_bytes - stored_bytes,
+        "dedup_ratio": round(logical_bytes / stored_bytes, 3) if stored_bytes else 1.0,
+        "legacy_files": legacy_files,
+    }
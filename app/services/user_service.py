@@ -1,13 +1,64 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.database.db import get_db
 from app.database.models import Admin, Professor, Student, User
+from app.database.models.project_models import (
+    Project,
+    ProjectTeam,
+    TeamApplication,
+    TeamMember,
+)
+from app.schemas.enum_schemas import DepartmentEnum, YearEnum
 from app.schemas.user_schemas import RoleEnum
+from app.services.matching_service import matching_engine
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.response_cache import response_cache
+
+
+def get_users(db: Session, page: PageParams) -> Page:
+    return paginate(db.query(User), User.id, page)
+
+
+def get_students(
+    db: Session,
+    page: PageParams,
+    department: Optional[DepartmentEnum] = None,
+    year: Optional[YearEnum] = None,
+) -> Page:
+    query = db.query(Student)
+    if department:
+        query = query.filter(Student.department == department)
+    if year:
+        query = query.filter(Student.year == year)
+    return paginate(query, Student.id, page)
 
 
-def get_users(db: Session):
-    return db.query(User).all()
+def _projects_showing(db: Session, student_id: Optional[int], professor_id: Optional[int]) -> set:
+    """Ids of the projects whose detail renders the given student or professor."""
+    project_ids = set()
+    if student_id is not None:
+        team_ids = db.query(TeamMember.team_id).filter(TeamMember.student_id == student_id)
+        project_ids.update(
+            project_id
+            for (project_id,) in db.query(ProjectTeam.project_id).filter(
+                ProjectTeam.id.in_(team_ids), ProjectTeam.project_id.isnot(None)
+            )
+        )
+        project_ids.update(
+            project_id
+            for (project_id,) in db.query(TeamApplication.project_id).filter(
+                TeamApplication.team_id.in_(team_ids)
+            )
+        )
+    if professor_id is not None:
+        project_ids.update(
+            project_id
+            for (project_id,) in db.query(Project.id).filter(Project.professor_id == professor_id)
+        )
+    return project_ids
 
 
 def delete_user(user_id: int, db: Session = Depends(get_db)):
@@ -15,18 +66,26 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    student_id = professor_id = None
     if user.role == RoleEnum.student:
         student = db.query(Student).filter(Student.user_id == user.id).first()
         if student:
+            student_id = student.id
             db.delete(student)
     elif user.role == RoleEnum.professor:
         prof = db.query(Professor).filter(Professor.user_id == user.id).first()
         if prof:
+            professor_id = prof.id
             db.delete(prof)
     elif user.role == RoleEnum.admin:
         admin = db.query(Admin).filter(Admin.user_id == user.id).first()
         if admin:
             db.delete(admin)
+    project_ids = _projects_showing(db, student_id, professor_id)
     db.delete(user)
     db.commit()
+    for project_id in project_ids:
+        response_cache.bump("project", project_id)
+    if student_id is not None:
+        matching_engine.remove_student(student_id)
     return {"detail": f"User {user.username} and related data deleted"}
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -7,6 +9,7 @@ from app.database.db import get_db
 from app.database.models.professor_models import Professor
 from app.database.models.student_models import Student
 from app.database.models.user_models import User
+from app.utils.identity_cache import identity_cache
 from app.utils.settings import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -21,41 +24,43 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    user = get_user_from_token(db, token)
+    if not user:
+        raise credentials_exception
+    return user
+
+
+def get_user_from_token(db: Session, token: Optional[str]) -> Optional[User]:
+    """The user an access token belongs to, or None if it is not valid."""
+    if not token:
+        return None
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise credentials_exception
-    return user
+        return None
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    return identity_cache.get_user(db, int(user_id))
 
 
-def get_current_professor(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
-) -> Professor:
+def get_current_professor(current_user: User = Depends(get_current_user)) -> Professor:
     if current_user.role != "professor":
         raise HTTPException(status_code=403, detail="Only professors allowed")
 
-    professor = db.query(Professor).filter(Professor.user_id == current_user.id).first()
+    professor = current_user.professor
     if not professor:
         raise HTTPException(status_code=404, detail="Professor not found")
     return professor
 
 
-def get_current_student(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
-) -> Student:
+def get_current_student(current_user: User = Depends(get_current_user)) -> Student:
     if current_user.role != "student":
         raise HTTPException(status_code=403, detail="Only students allowed")
 
-    student = db.query(Student).filter(Student.user_id == current_user.id).first()
+    student = current_user.student
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
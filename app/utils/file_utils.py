@@ -1,12 +1,95 @@
 """Utility functions for file handling."""
 
+import hashlib
 import os
-import shutil
-from fastapi import UploadFile
+import tempfile
+from dataclasses import dataclass
+from fastapi import HTTPException, UploadFile
 from pathlib import Path
 from typing import Optional
 import uuid
 
+from app.utils.settings import settings
+
+
+@dataclass
+class StoredFile:
+    path: str
+    size: int
+    sha256: str
+
+
+def upload_filename(upload_file: UploadFile) -> str:
+    """
+    Name to record for an uploaded file: the last component of the client's
+    file name, with any directories (``/`` or ``\\``) dropped.
+
+    Raises:
+        HTTPException: 400 if no usable file name is left (empty, ``.``, ``..``
+            or a name ending in a separator)
+    """
+    name = (upload_file.filename or "").replace("\\", "/").rsplit("/", 1)[-1].strip()
+    if name in ("", ".", ".."):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file name {upload_file.filename!r}",
+        )
+    return name
+
+
+def stream_upload_to_file(
+    upload_file: UploadFile,
+    destination_folder: str,
+    filename: str,
+    max_bytes: int = None,
+) -> StoredFile:
+    """
+    Stream an uploaded file to disk in fixed-size chunks.
+
+    The data is written to a temporary file in the destination folder, hashed
+    with SHA-256 in the same pass and atomically renamed into place once
+    complete, so a partial or rejected upload never appears at the final path.
+    Blocking I/O: call from a sync route (FastAPI's threadpool), not the event loop.
+
+    Args:
+        upload_file: The uploaded file
+        destination_folder: The folder where the file should be saved
+        filename: Name of the file inside destination_folder
+        max_bytes: Per-file size limit, defaults to MAX_UPLOAD_FILE_BYTES
+
+    Returns:
+        The stored file's path, size and SHA-256 hex digest
+
+    Raises:
+        HTTPException: 413 if the file exceeds the size limit
+    """
+    max_bytes = max_bytes or settings.MAX_UPLOAD_FILE_BYTES
+    os.makedirs(destination_folder, exist_ok=True)
+    file_path = os.path.join(destination_folder, filename)
+
+    digest = hashlib.sha256()
+    size = 0
+    upload_file.file.seek(0)
+    fd, temp_path = tempfile.mkstemp(dir=destination_folder, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := upload_file.file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File {upload_file.filename} exceeds the {max_bytes} byte limit",
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return StoredFile(path=file_path, size=size, sha256=digest.hexdigest())
+
 
 def save_upload_file(upload_file: UploadFile, destination_folder: str, filename: Optional[str] = None) -> str:
     """
@@ -20,9 +103,6 @@ def save_upload_file(upload_file: UploadFile, destination_folder: str, filename:
     Returns:
         The path to the saved file
     """
-    # Create the destination folder if it doesn't exist
-    os.makedirs(destination_folder, exist_ok=True)
-    
     # Generate a unique filename if not provided
     if not filename:
         # Get the file extension
@@ -30,14 +110,10 @@ def save_upload_file(upload_file: UploadFile, destination_folder: str, filename:
         # Generate a unique filename
         filename = f"{uuid.uuid4()}{ext}"
     
-    # Create the full file path
-    file_path = os.path.join(destination_folder, filename)
-    
     # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+    stored = stream_upload_to_file(upload_file, destination_folder, filename)
     
     # Reset the file pointer
     upload_file.file.seek(0)
     
-    return file_path
+    return stored.path
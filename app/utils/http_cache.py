@@ -0,0 +1,46 @@
+"""HTTP validators and conditional-request handling."""
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+
+def _strip_weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    target = _strip_weak(etag)
+    return any(
+        _strip_weak(candidate.strip()) == target
+        for candidate in if_none_match.split(",")
+    )
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def is_not_modified(
+    headers, etag: Optional[str] = None, last_modified: Optional[float] = None
+) -> bool:
+    """Whether a GET/HEAD with these request headers should get a 304.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the request carries no entity tag.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= since
+    return False
@@ -0,0 +1,255 @@
+"""Cache of resolved user identities for the auth dependencies.
+
+Entries hold plain column snapshots of a user and their student/professor row,
+keyed by user id. On a hit the snapshots are merged into the request's session
+without touching the database, so routes keep receiving regular ORM objects.
+
+Entries are invalidated when a session commits a change to one of the cached
+rows; bulk UPDATE/DELETE statements on their tables start a new generation of
+keys, which drops every entry at once.
+
+The default backend is a bounded, TTL-based in-process LRU. A shared backend
+(e.g. Redis) can be plugged in with ``identity_cache.set_backend``; snapshots
+only contain picklable column values. The generation and the invalidation
+epoch are stored in the backend as well, so an invalidation made by one worker
+reaches every worker sharing it.
+"""
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, Optional, Protocol
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from app.database.models.professor_models import Professor
+from app.database.models.student_models import Student
+from app.database.models.user_models import User
+from app.utils.settings import settings
+
+
+GENERATION_KEY = "identity:generation"
+EPOCH_KEY = "identity:epoch"
+# Outlives the entries; a lost generation only empties the cache
+STATE_TTL_SECONDS = 30 * 24 * 3600
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[Any]: ...
+
+    def set(self, key: str, value: Any, ttl: int) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class InMemoryTTLCache:
+    """Thread-safe LRU cache whose entries expire after their TTL."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _snapshot(instance) -> Optional[Dict[str, Any]]:
+    if instance is None:
+        return None
+    return {
+        attr.key: getattr(instance, attr.key)
+        for attr in inspect(instance).mapper.column_attrs
+    }
+
+
+def _restore(db: Session, model, snapshot: Optional[Dict[str, Any]]):
+    """Copy a snapshot into the session as a persistent instance without a query."""
+    if snapshot is None:
+        return None
+    identity_key = inspect(model).identity_key_from_primary_key([snapshot["id"]])
+    existing = db.identity_map.get(identity_key)
+    if existing is not None:
+        return existing
+
+    instance = model(**copy.deepcopy(snapshot))
+    make_transient_to_detached(instance)
+    # merge() copies the state into an instance owned by the session, so the
+    # session never holds on to the object built from the cache entry
+    return db.merge(instance, load=False)
+
+
+class IdentityCache:
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend: CacheBackend):
+        self.backend = backend
+
+    def _generation(self) -> str:
+        """Part of every key; replaced to drop all entries at once."""
+        generation = self.backend.get(GENERATION_KEY)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.backend.set(GENERATION_KEY, generation, STATE_TTL_SECONDS)
+        return generation
+
+    def _epoch(self) -> Optional[str]:
+        """Replaced by every invalidation; a load that raced with one is not stored."""
+        return self.backend.get(EPOCH_KEY)
+
+    def _bump_epoch(self):
+        self.backend.set(EPOCH_KEY, uuid.uuid4().hex, STATE_TTL_SECONDS)
+
+    @staticmethod
+    def _key(generation: str, user_id: int) -> str:
+        return f"identity:{generation}:{user_id}"
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_user(self, db: Session, user_id: int) -> Optional[User]:
+        """Return the user with its student/professor row loaded, or None."""
+        if not settings.IDENTITY_CACHE_ENABLED:
+            return self._load(db, user_id)
+
+        key = self._key(self._generation(), user_id)
+        entry = self.backend.get(key)
+        if entry is not None:
+            self._count("hits")
+            user = _restore(db, User, entry["user"])
+            set_committed_value(user, "student", _restore(db, Student, entry["student"]))
+            set_committed_value(
+                user, "professor", _restore(db, Professor, entry["professor"])
+            )
+            return user
+
+        self._count("misses")
+        epoch = self._epoch()
+        user = self._load(db, user_id)
+        if user is not None and epoch == self._epoch():
+            self.backend.set(
+                key,
+                {
+                    "user": _snapshot(user),
+                    "student": _snapshot(user.student),
+                    "professor": _snapshot(user.professor),
+                },
+                self.ttl,
+            )
+        return user
+
+    @staticmethod
+    def _load(db: Session, user_id: int) -> Optional[User]:
+        # The role rows are loaded in the same round-trip as the user
+        return (
+            db.query(User)
+            .options(joinedload(User.student), joinedload(User.professor))
+            .filter(User.id == user_id)
+            .first()
+        )
+
+    def invalidate(self, user_id: int):
+        self._count("invalidations")
+        self._bump_epoch()
+        self.backend.delete(self._key(self._generation(), user_id))
+
+    def invalidate_all(self):
+        self._count("invalidations")
+        self._bump_epoch()
+        self.backend.set(GENERATION_KEY, uuid.uuid4().hex, STATE_TTL_SECONDS)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "invalidations": invalidations,
+            "entries": len(self.backend) if hasattr(self.backend, "__len__") else None,
+        }
+
+
+identity_cache = IdentityCache(
+    InMemoryTTLCache(settings.IDENTITY_CACHE_MAX_ENTRIES),
+    settings.IDENTITY_CACHE_TTL_SECONDS,
+)
+
+
+CACHED_TABLES = {User.__table__, Student.__table__, Professor.__table__}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_identities(session, flush_context):
+    user_ids = session.info.setdefault("identity_cache_user_ids", set())
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, User):
+            user_ids.add(instance.id)
+        elif isinstance(instance, (Student, Professor)):
+            user_ids.add(instance.user_id)
+            # A role row moved to another user changes both identities
+            previous = inspect(instance).attrs.user_id.history.deleted
+            user_ids.update(previous)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and getattr(
+        orm_execute_state.statement, "table", None
+    ) in CACHED_TABLES:
+        orm_execute_state.session.info["identity_cache_all"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    # Also dispatched when a savepoint is released
+    if session.in_nested_transaction():
+        return
+    if session.info.pop("identity_cache_all", False):
+        identity_cache.invalidate_all()
+    for user_id in session.info.pop("identity_cache_user_ids", ()):
+        if user_id is not None:
+            identity_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_identities(session):
+    session.info.pop("identity_cache_all", None)
+    session.info.pop("identity_cache_user_ids", None)
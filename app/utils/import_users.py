@@ -0,0 +1,48 @@
+"""Create students and professors in bulk from a CSV or JSON file.
+
+    python -m app.utils.import_users cohort.csv
+    python -m app.utils.import_users cohort.json --chunk-size 1000
+
+Rows use the fields of ``/api/auth/register`` (username, fullname, email,
+password, role, department, year, title). The per-row error report is printed
+as JSON; the exit status is 1 if any row failed.
+"""
+
+import argparse
+import json
+import sys
+
+from app.database.db import SessionLocal
+from app.database.migrate import upgrade_database
+from app.services.import_service import ImportFormatError, detect_format, import_users
+
+
+def main(args) -> int:
+    try:
+        file_format = detect_format(args.path, args.format)
+    except ImportFormatError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    upgrade_database()
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            report = import_users(db, stream, file_format, args.chunk_size)
+    finally:
+        db.close()
+
+    print(json.dumps(report, indent=2))
+    return 1 if report["failed"] or report["aborted"] else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import students and professors")
+    parser.add_argument("path", help="CSV or JSON file of users")
+    parser.add_argument("--format", choices=["csv", "json"], help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per transaction")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
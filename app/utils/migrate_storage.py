@@ -0,0 +1,153 @@
+"""Move existing uploads into the configured storage backend.
+
+Usage (STORAGE_BACKEND and the S3_* settings select the target):
+
+    python -m app.utils.migrate_storage [--delete-local]
+
+Blobs already tracked in ``stored_blobs`` are copied from the local uploads
+directory when the target does not have them yet. Files uploaded before
+content-addressed storage (rows without ``content_hash``) are hashed,
+deduplicated into blobs and their rows repointed. Several legacy rows may
+share one file; with ``--delete-local`` it is removed once none of them is
+left to migrate. The command commits as it goes and can be re-run after an
+interruption.
+"""
+
+import argparse
+import hashlib
+import mimetypes
+import os
+
+from app.database.db import SessionLocal
+from app.database.migrate import upgrade_database
+from app.database.models import ProjectResource, StoredBlob, SubmissionDocument
+from app.services.storage_service import add_blob_reference
+from app.utils.logger import get_logger
+from app.utils.object_storage import LocalStorage, get_storage
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+LEGACY_MODELS = (ProjectResource, SubmissionDocument)
+
+
+def hash_file(path: str):
+    sha256 = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+            size += len(chunk)
+    return sha256.hexdigest(), size
+
+
+def migrate_blobs(db, storage, delete_local: bool) -> dict:
+    """Copy tracked blobs from the local uploads directory to the target backend."""
+    local = LocalStorage(settings.STORAGE_LOCAL_ROOT)
+    target_is_local = isinstance(storage, LocalStorage)
+    counts = {"copied": 0, "present": 0, "missing": 0}
+
+    for blob in db.query(StoredBlob).order_by(StoredBlob.id).yield_per(500):
+        key = blob.storage_key
+        if storage.exists(key):
+            counts["present"] += 1
+        elif local.exists(key):
+            storage.put_file(key, local.local_path(key))
+            counts["copied"] += 1
+        else:
+            logger.warning(f"Blob {blob.sha256} has no file at {key}")
+            counts["missing"] += 1
+            continue
+
+        if delete_local and not target_is_local:
+            local.delete(key)
+    return counts
+
+
+def legacy_rows_use(db, path: str) -> bool:
+    """Whether a row not migrated yet still points at the local file ``path``."""
+    return any(
+        db.query(model.id)
+        .filter(model.content_hash.is_(None), model.file_path == path)
+        .first()
+        is not None
+        for model in LEGACY_MODELS
+    )
+
+
+def migrate_legacy_files(db, model, delete_local: bool, batch_size: int) -> dict:
+    """Deduplicate files stored before content addressing into blobs."""
+    counts = {"migrated": 0, "missing": 0}
+    last_id = 0
+    while True:
+        rows = (
+            db.query(model)
+            .filter(model.content_hash.is_(None), model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return counts
+
+        # Uploads of the same name to one project share a path; hash it once
+        hashes = {}
+        for row in rows:
+            last_id = row.id
+            if not os.path.isfile(row.file_path):
+                logger.warning(f"{model.__tablename__} {row.id}: no file at {row.file_path}")
+                counts["missing"] += 1
+                continue
+
+            if row.file_path not in hashes:
+                hashes[row.file_path] = hash_file(row.file_path)
+            sha256, size = hashes[row.file_path]
+            blob = add_blob_reference(
+                db,
+                sha256,
+                size,
+                row.file_path,
+                content_type=mimetypes.guess_type(row.filename)[0],
+            )
+            row.file_path = blob.storage_key
+            row.content_hash = sha256
+            counts["migrated"] += 1
+        db.commit()
+
+        # Originals are only removed once the rows pointing at the blobs are
+        # saved and no row still waiting for migration shares them
+        if delete_local:
+            for path in hashes:
+                if not legacy_rows_use(db, path):
+                    os.remove(path)
+
+
+def migrate(args):
+    upgrade_database()
+    storage = get_storage()
+    db = SessionLocal()
+    try:
+        blobs = migrate_blobs(db, storage, args.delete_local)
+        print(f"blobs: {blobs}")
+        for model in LEGACY_MODELS:
+            counts = migrate_legacy_files(db, model, args.delete_local, args.batch_size)
+            print(f"{model.__tablename__}: {counts}")
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Move uploaded files into the configured storage backend"
+    )
+    parser.add_argument(
+        "--delete-local",
+        action="store_true",
+        help="remove local copies once they are stored in the backend",
+    )
+    parser.add_argument("--batch-size", type=int, default=200)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    migrate(parse_args())
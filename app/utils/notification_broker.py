@@ -0,0 +1,134 @@
+"""Message brokers carrying notification events between API processes.
+
+A message is a JSON-serializable dict (recipient user ids plus the event).
+``LocalBroker`` hands messages straight to the publishing process's own
+subscribers, which is all a single API process needs. ``PostgresBroker``
+publishes with ``pg_notify`` and every process ``LISTEN``s on the channel,
+so a user connected to any node receives events published on any other,
+without infrastructure beyond the database.
+
+Select the backend with ``NOTIFICATIONS_BACKEND`` (``local`` or ``postgres``).
+"""
+
+import json
+import select
+import threading
+from functools import lru_cache
+from typing import Callable, Optional, Protocol
+
+from sqlalchemy import create_engine, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.pool import NullPool
+
+from app.utils.logger import get_logger
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+Deliver = Callable[[dict], None]
+
+# pg_notify payloads are limited to 8000 bytes
+MAX_POSTGRES_PAYLOAD = 7900
+
+
+class NotificationBroker(Protocol):
+    def publish(self, message: dict) -> None: ...
+
+    def start(self, deliver: Deliver) -> None:
+        """Begin passing received messages to ``deliver`` (from any thread)."""
+        ...
+
+    def stop(self) -> None: ...
+
+
+class LocalBroker:
+    def __init__(self):
+        self.deliver: Optional[Deliver] = None
+
+    def publish(self, message: dict) -> None:
+        if self.deliver is not None:
+            self.deliver(message)
+
+    def start(self, deliver: Deliver) -> None:
+        self.deliver = deliver
+
+    def stop(self) -> None:
+        self.deliver = None
+
+
+class PostgresBroker:
+    def __init__(self, url: str, channel: str, reconnect_seconds: float = 5.0):
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        # Publishing borrows short-lived connections; listening holds one of its
+        # own for the life of the process, outside the application pool
+        self.engine = create_engine(url, poolclass=NullPool)
+        self.deliver: Optional[Deliver] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, message: dict) -> None:
+        payload = json.dumps(message, separators=(",", ":"), default=str)
+        if len(payload.encode("utf-8")) > MAX_POSTGRES_PAYLOAD:
+            logger.warning(f"Dropped notification of {len(payload)} bytes, over the pg_notify limit")
+            return
+        with self.engine.connect() as connection:
+            connection.execute(sql_select(func.pg_notify(self.channel, payload)))
+            connection.commit()
+
+    def start(self, deliver: Deliver) -> None:
+        self.deliver = deliver
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._listen_forever, name="notification-listener", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread = None
+
+    def _listen_forever(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("Notification listener failed, reconnecting")
+                self._stopped.wait(self.reconnect_seconds)
+
+    def _listen(self):
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while not self._stopped.is_set():
+                # Wake up regularly to notice stop() and dead connections
+                if select.select([dbapi_connection], [], [], 5.0) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    if self.deliver is not None:
+                        self.deliver(json.loads(notify.payload))
+        finally:
+            connection.close()
+
+
+def create_broker(backend: str = None) -> NotificationBroker:
+    backend = backend or settings.NOTIFICATIONS_BACKEND
+    if backend == "local":
+        return LocalBroker()
+    if backend == "postgres":
+        if not settings.DATABASE_URL.startswith("postgresql"):
+            raise RuntimeError("NOTIFICATIONS_BACKEND=postgres requires a Postgres DATABASE_URL")
+        return PostgresBroker(settings.DATABASE_URL, settings.NOTIFICATIONS_CHANNEL)
+    raise RuntimeError(f"Unknown NOTIFICATIONS_BACKEND {backend!r}")
+
+
+@lru_cache(maxsize=1)
+def get_broker() -> NotificationBroker:
+    """The configured broker, created on first use."""
+    return create_broker()
@@ -0,0 +1,205 @@
+"""Object storage backends for uploaded file content.
+
+Files are addressed by a backend-independent key such as
+``blobs/ab/cd/<sha256>-<suffix>``. ``LocalStorage`` keeps them under a directory on
+disk; ``S3Storage`` keeps them in an S3-compatible bucket (AWS S3, MinIO, ...)
+so several API nodes can share them, and hands out presigned URLs so
+downloads bypass the API process.
+
+Select the backend with ``STORAGE_BACKEND`` (``local`` or ``s3``).
+"""
+
+import mimetypes
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Iterator, Optional, Protocol, Tuple
+from urllib.parse import quote
+
+from app.utils.settings import settings
+
+
+class StorageBackend(Protocol):
+    def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None, move: bool = False
+    ) -> None: ...
+
+    def exists(self, key: str) -> bool: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def list_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        """Keys under ``prefix`` with their last-modified time (epoch seconds)."""
+        ...
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Path on this node's disk, or None when the object is remote."""
+        ...
+
+    def presigned_url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        """Time-limited direct download URL, or None when unsupported."""
+        ...
+
+
+class LocalStorage:
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None, move: bool = False
+    ) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if move:
+            os.replace(source_path, path)
+            return
+
+        # Copy next to the target first so the object appears atomically
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        for directory, _, filenames in os.walk(self._path(prefix)):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                try:
+                    modified = os.path.getmtime(path)
+                except FileNotFoundError:
+                    continue
+                yield os.path.relpath(path, self.root).replace(os.sep, "/"), modified
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def presigned_url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        return None
+
+
+class S3Storage:
+    """S3-compatible bucket; large files are uploaded with multipart transfers."""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        multipart_threshold: int = 64 * 1024 * 1024,
+        multipart_chunk_size: int = 16 * 1024 * 1024,
+    ):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config
+        except ImportError:  # pragma: no cover - optional dependency
+            raise RuntimeError("STORAGE_BACKEND=s3 needs boto3: pip install boto3")
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            # Path-style addressing works with MinIO and other local stand-ins
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunk_size,
+        )
+
+    def put_file(
+        self, key: str, source_path: str, content_type: Optional[str] = None, move: bool = False
+    ) -> None:
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.client.upload_file(
+            source_path,
+            self.bucket,
+            key,
+            ExtraArgs=extra_args,
+            Config=self.transfer_config,
+        )
+        if move:
+            os.remove(source_path)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_objects(self, prefix: str) -> Iterator[Tuple[str, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"], item["LastModified"].timestamp()
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def presigned_url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        # Objects are keyed by hash, so name and type are set per download
+        params = {
+            "Bucket": self.bucket,
+            "Key": key,
+            "ResponseContentDisposition": f"attachment; filename*=utf-8''{quote(filename)}",
+            "ResponseContentType": mimetypes.guess_type(filename)[0]
+            or "application/octet-stream",
+        }
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
+
+def create_storage(backend: str = None) -> StorageBackend:
+    backend = backend or settings.STORAGE_BACKEND
+    if backend == "local":
+        return LocalStorage(settings.STORAGE_LOCAL_ROOT)
+    if backend == "s3":
+        if not settings.S3_BUCKET:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunk_size=settings.S3_MULTIPART_CHUNK_SIZE,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND {backend!r}")
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """The configured backend, created on first use."""
+    return create_storage()
@@ -0,0 +1,62 @@
+"""Run the outbox worker as a standalone process.
+
+    python -m app.utils.outbox_worker
+    python -m app.utils.outbox_worker --once
+
+Set OUTBOX_WORKER_IN_PROCESS=false on the API processes when running it, so
+queued work is delivered from here only. Notifications published from this
+process reach API processes through the broker, so it needs
+NOTIFICATIONS_BACKEND=postgres.
+"""
+
+import argparse
+import json
+import signal
+import sys
+
+from app.database.db import SessionLocal
+from app.database.migrate import upgrade_database
+# Importing the services registers their outbox handlers
+from app.services import notification_service, storage_service  # noqa: F401
+from app.services.outbox_service import outbox_stats, outbox_worker
+from app.utils.logger import get_logger
+from app.utils.settings import settings
+
+logger = get_logger(__name__)
+
+
+def main(args) -> int:
+    upgrade_database()
+    if settings.NOTIFICATIONS_BACKEND == "local":
+        logger.warning(
+            "NOTIFICATIONS_BACKEND is local: notifications sent by this worker "
+            "will not reach users connected to the API processes"
+        )
+
+    if args.once:
+        while outbox_worker.run_once() == outbox_worker.batch_size:
+            pass
+        db = SessionLocal()
+        try:
+            print(json.dumps(outbox_stats(db), indent=2))
+        finally:
+            db.close()
+        return 0
+
+    signal.signal(signal.SIGTERM, lambda *_: outbox_worker.stop(timeout=0))
+    logger.info(f"Outbox worker {outbox_worker.worker_id} started")
+    try:
+        outbox_worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Deliver queued outbox messages")
+    parser.add_argument("--once", action="store_true", help="process the due messages and exit")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
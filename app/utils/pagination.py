@@ -0,0 +1,82 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by primary key and resumed from the last id seen, so a page
+costs the same regardless of how deep into the table it is. The cursor for
+the next page is returned in the ``X-Next-Cursor`` response header, keeping
+response bodies plain lists.
+
+Every request gets at most ``limit`` rows (DEFAULT_PAGE_SIZE unless given,
+capped at MAX_PAGE_SIZE); clients read the full list by following the cursor.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Query, Response
+
+from app.utils.settings import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass
+class PageParams:
+    after_id: Optional[int]
+    limit: int
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return last_id
+
+
+def pagination_params(
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+) -> PageParams:
+    """Dependency parsing the ``cursor`` and ``limit`` query parameters."""
+    return PageParams(after_id=decode_cursor(cursor) if cursor else None, limit=limit)
+
+
+def paginate(
+    query,
+    id_column,
+    page: PageParams,
+    key: Callable[[Any], int] = lambda row: row.id,
+) -> Page:
+    """Fetch one page of ``query`` ordered by ``id_column``."""
+    if page.after_id is not None:
+        query = query.filter(id_column > page.after_id)
+    rows = query.order_by(id_column).limit(page.limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return Page(rows, next_cursor)
+
+
+def set_next_cursor(response: Response, page: Page) -> List[Any]:
+    """Expose the next-page cursor on the response and return the page items."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -0,0 +1,44 @@
+"""Rebuild or verify the student project catalog (``project_catalog``).
+
+    python -m app.utils.rebuild_catalog          # recompute every row
+    python -m app.utils.rebuild_catalog --check  # report drift, exit 1 if any
+
+The catalog is normally maintained incrementally (see app.database.catalog);
+rebuild after bulk loads or if the check reports drift.
+"""
+
+import argparse
+import sys
+
+from app.database.catalog import check_catalog, rebuild_catalog
+from app.database.db import SessionLocal
+from app.database.migrate import upgrade_database
+
+
+def main(args) -> int:
+    upgrade_database()
+    db = SessionLocal()
+    try:
+        if args.check:
+            report = check_catalog(db)
+            print(report)
+            return 1 if report["missing"] or report["extra"] or report["stale"] else 0
+
+        print(f"Rebuilt project catalog: {rebuild_catalog(db)} rows")
+        return 0
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the student project catalog")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only compare the catalog with the base tables",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,202 @@
+"""Cache of rendered GET responses, validated with ETags.
+
+Responses are keyed by route, query parameters and caller role, and carry a
+strong ETag derived from the version of the entity they render (e.g. a
+project). Write paths call ``bump`` after committing, which gives the entity
+a new version: cached bodies and ETags of the old version stop matching, so
+nothing needs to be invalidated key by key. A request whose If-None-Match
+matches the current version gets a 304 before any database work.
+
+Versions and bodies live in process memory; the bodies in an LRU bounded by
+RESPONSE_CACHE_MAX_BYTES. Versions expire after RESPONSE_CACHE_TTL_SECONDS
+like the bodies, which bounds how long another API process can serve a
+response rendered before a write it did not see.
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+
+from app.utils.http_cache import is_not_modified
+from app.utils.identity_cache import InMemoryTTLCache
+from app.utils.settings import settings
+
+CACHE_CONTROL = "private, no-cache"
+
+
+class ResponseLRU:
+    """Thread-safe LRU of response bodies, bounded by their total size."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, etag, body = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def set(self, key: str, etag: str, body: bytes, ttl: int) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, etag, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[2])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def caller_role(request: Request) -> str:
+    """Role claim of the request's access token; responses may differ per role."""
+    authorization = request.headers.get("authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return "anonymous"
+    try:
+        payload = jwt.decode(
+            authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return "anonymous"
+    return str(payload.get("role") or "anonymous")
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: int, max_versions: int = 100000):
+        self.ttl = ttl
+        self.bodies = ResponseLRU(max_bytes)
+        # version key -> (version, monotonic time of the bump)
+        self.versions = InMemoryTTLCache(max_versions)
+        # Versions are unique across processes and restarts, so a client's
+        # ETag from an expired version can never match a new one by accident
+        self._prefix = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.uncacheable = 0
+        self.bumps = 0
+
+    @staticmethod
+    def _version_key(entity: str, entity_id) -> str:
+        return f"{entity}:{entity_id}"
+
+    def _new_version(self, key: str, bumped_at: float) -> Tuple[str, float]:
+        entry = (f"{self._prefix}.{next(self._counter)}", bumped_at)
+        self.versions.set(key, entry, self.ttl)
+        return entry
+
+    def version(self, entity: str, entity_id) -> Tuple[str, float]:
+        """Current version of an entity and when it was last bumped."""
+        key = self._version_key(entity, entity_id)
+        with self._lock:
+            entry = self.versions.get(key)
+            if entry is None:
+                # Unknown here: treat as possibly just written
+                entry = self._new_version(key, time.monotonic())
+            return entry
+
+    def bump(self, entity: str, entity_id):
+        """Give an entity a new version; call after committing a change to it."""
+        with self._lock:
+            self._new_version(self._version_key(entity, entity_id), time.monotonic())
+        self.bumps += 1
+
+    def respond(
+        self,
+        request: Request,
+        entity: str,
+        entity_id,
+        build: Callable[[], Any],
+        db=None,
+    ) -> Response:
+        """Serve a GET from the cache, or render it with ``build`` and cache it.
+
+        ``db`` is the session ``build`` reads through. Responses read from a
+        replica within its lag bound of the last bump may predate the write,
+        so they are sent without an ETag and not cached.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return JSONResponse(jsonable_encoder(build()))
+
+        key = f"{request.url.path}?{request.url.query}|{caller_role(request)}"
+        version, bumped_at = self.version(entity, entity_id)
+        digest = hashlib.blake2b(f"{key}|{version}".encode(), digest_size=12).hexdigest()
+        etag = f'"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if is_not_modified(request.headers, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        cached = self.bodies.get(key)
+        if cached is not None and cached[0] == etag:
+            self.hits += 1
+            return Response(
+                cached[1], media_type="application/json", headers={**headers, "X-Cache": "HIT"}
+            )
+
+        self.misses += 1
+        body = JSONResponse(jsonable_encoder(build())).body
+        if getattr(db, "reads_from_replica", False) and (
+            time.monotonic() - bumped_at < settings.DB_REPLICA_MAX_LAG_SECONDS
+        ):
+            self.uncacheable += 1
+            return Response(body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+        self.bodies.set(key, etag, body, self.ttl)
+        return Response(
+            body, media_type="application/json", headers={**headers, "X-Cache": "MISS"}
+        )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.not_modified
+        return {
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.not_modified) / lookups, 4) if lookups else 0.0
+            ),
+            "uncacheable": self.uncacheable,
+            "bumps": self.bumps,
+            "entries": len(self.bodies),
+            "bytes": self.bodies.size,
+            "max_bytes": self.bodies.max_bytes,
+            "evictions": self.bodies.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL_SECONDS
+)
@@ -1,9 +1,29 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from app.utils.settings import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, so a small dedicated pool keeps hashing off the
+# event loop and out of the threadpool that serves every other request
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending_hashes = 0
+# Bulk imports hash on a separate, smaller pool: a chunk of hundreds of jobs
+# never queues ahead of logins, which stay under the pending limit below
+_import_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.IMPORT_HASH_WORKERS, thread_name_prefix="import-hash"
+)
+
 
 def hash_password(password: str):
     return pwd_context.hash(password)
@@ -11,6 +31,36 @@ def hash_password(password: str):
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
+def hash_passwords(passwords: list) -> list:
+    """Hash many passwords in parallel on the import pool (blocking)."""
+    return list(_import_hash_executor.map(hash_password, passwords))
+
+async def _run_hash_job(fn, *args):
+    """Run a bcrypt call on the password pool, shedding load when it is backed up."""
+    global _pending_hashes
+    if _pending_hashes >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_hashes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _pending_hashes -= 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash_job(pwd_context.hash, password)
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new hash when the stored cost is outdated."""
+    return await _run_hash_job(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -0,0 +1,327 @@
+"""Populate the database with a synthetic, production-sized dataset.
+
+Usage (DATABASE_URL selects SQLite or Postgres, as for the app):
+
+    python -m app.utils.seed_data --students 50000 --projects 5000
+
+Rows are inserted in chunks with executemany, and every seeded user shares the
+password given by ``--password`` so the data can be logged into. The project
+catalog is rebuilt at the end. Submission documents are created as rows only;
+no files are written to ``uploads/``.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, insert, text
+
+from app.database.catalog import rebuild_catalog
+from app.database.db import SessionLocal, engine
+from app.database.migrate import upgrade_database
+from app.database.models import (
+    Milestone,
+    MilestoneSubmission,
+    Professor,
+    Project,
+    ProjectTeam,
+    Student,
+    SubmissionDocument,
+    TeamMember,
+    User,
+)
+from app.database.models.project_models import StudentTeamApplication, TeamApplication
+from app.database.models.user_models import RoleEnum
+from app.schemas.enum_schemas import (
+    DepartmentEnum,
+    ProjectStatusEnum,
+    TeamStatusEnum,
+    TitleEnum,
+    YearEnum,
+)
+from app.utils.logger import get_logger
+from app.utils.security import hash_password
+
+logger = get_logger(__name__)
+
+SKILLS = [
+    "python", "java", "c++", "javascript", "react", "sql", "docker", "kubernetes",
+    "pytorch", "tensorflow", "matlab", "embedded", "verilog", "figma", "rust", "go",
+]
+INTERESTS = [
+    "machine learning", "web development", "robotics", "iot", "security",
+    "computer vision", "nlp", "cloud", "blockchain", "power systems", "vlsi", "hci",
+]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Meera", "Rohan", "Sara", "Kabir", "Anaya", "Vihaan", "Zoya"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Reddy", "Das", "Gupta", "Nair", "Singh", "Bose"]
+
+
+class Seeder:
+    def __init__(self, db, rng: random.Random, chunk_size: int):
+        self.db = db
+        self.rng = rng
+        self.chunk_size = chunk_size
+
+    def next_id(self, model) -> int:
+        return (self.db.query(func.max(model.id)).scalar() or 0) + 1
+
+    def bulk_insert(self, model, rows):
+        for start in range(0, len(rows), self.chunk_size):
+            self.db.execute(insert(model), rows[start : start + self.chunk_size])
+            self.db.commit()
+        logger.info(f"Inserted {len(rows)} {model.__tablename__}")
+
+    def full_name(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def users(self, role: RoleEnum, count: int, hashed_password: str) -> list:
+        first_id = self.next_id(User)
+        rows = [
+            {
+                "id": user_id,
+                "username": f"{role.value}{user_id}",
+                "full_name": self.full_name(),
+                "email": f"{role.value}{user_id}@seed.projecthub.dev",
+                "hashed_password": hashed_password,
+                "role": role,
+            }
+            for user_id in range(first_id, first_id + count)
+        ]
+        self.bulk_insert(User, rows)
+        return [row["id"] for row in rows]
+
+    def students(self, user_ids: list) -> list:
+        first_id = self.next_id(Student)
+        rows = [
+            {
+                "id": first_id + i,
+                "user_id": user_id,
+                "department": self.rng.choice(list(DepartmentEnum)),
+                "year": self.rng.choice(list(YearEnum)),
+                "skills": self.rng.sample(SKILLS, self.rng.randint(2, 6)),
+                "interests": self.rng.sample(INTERESTS, self.rng.randint(1, 4)),
+                "availability": self.rng.choice(["Full-time", "Part-time", "Weekends"]),
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+        self.bulk_insert(Student, rows)
+        return [row["id"] for row in rows]
+
+    def professors(self, user_ids: list) -> list:
+        first_id = self.next_id(Professor)
+        rows = [
+            {
+                "id": first_id + i,
+                "user_id": user_id,
+                "department": self.rng.choice(list(DepartmentEnum)),
+                "title": self.rng.choice(list(TitleEnum)),
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+        self.bulk_insert(Professor, rows)
+        return [row["id"] for row in rows]
+
+    def projects(self, professor_ids: list, count: int) -> list:
+        first_id = self.next_id(Project)
+        now = datetime.now(timezone.utc)
+        statuses = [ProjectStatusEnum.OPEN] * 6 + [ProjectStatusEnum.IN_PROGRESS] * 3 + [
+            ProjectStatusEnum.COMPLETED
+        ]
+        rows = [
+            {
+                "id": project_id,
+                "title": f"{self.rng.choice(INTERESTS).title()} project {project_id}",
+                "description": " ".join(self.rng.sample(INTERESTS + SKILLS, 8)),
+                "year": self.rng.choice(list(YearEnum)),
+                "tags": self.rng.sample(SKILLS + INTERESTS, self.rng.randint(1, 5)),
+                "status": self.rng.choice(statuses),
+                "professor_id": self.rng.choice(professor_ids),
+                "created_at": now,
+            }
+            for project_id in range(first_id, first_id + count)
+        ]
+        self.bulk_insert(Project, rows)
+        return [row["id"] for row in rows]
+
+    def milestones(self, project_ids: list, per_project: int) -> dict:
+        first_id = self.next_id(Milestone)
+        rows = []
+        milestones_by_project = {}
+        start = date.today() - timedelta(days=60)
+        for project_id in project_ids:
+            for n in range(per_project):
+                milestone_id = first_id + len(rows)
+                rows.append(
+                    {
+                        "id": milestone_id,
+                        "title": f"Milestone {n + 1}",
+                        "description": "Deliverable for this phase",
+                        "due_date": start + timedelta(days=14 * n + self.rng.randint(0, 7)),
+                        "weightage": round(100 / per_project, 2),
+                        "project_id": project_id,
+                    }
+                )
+                milestones_by_project.setdefault(project_id, []).append(milestone_id)
+        self.bulk_insert(Milestone, rows)
+        return milestones_by_project
+
+    def teams(self, student_ids: list, project_ids: list, team_size: int) -> list:
+        """Group students into teams; the first teams are assigned to projects."""
+        first_id = self.next_id(ProjectTeam)
+        shuffled = self.rng.sample(student_ids, len(student_ids))
+        groups = [
+            shuffled[i : i + team_size]
+            for i in range(0, len(shuffled) - team_size + 1, team_size)
+        ]
+        assigned_projects = self.rng.sample(project_ids, min(len(project_ids), len(groups) // 2))
+
+        team_rows, member_rows = [], []
+        for i, members in enumerate(groups):
+            team_id = first_id + i
+            project_id = assigned_projects[i] if i < len(assigned_projects) else None
+            team_rows.append(
+                {
+                    "id": team_id,
+                    "name": f"Team {team_id}",
+                    "project_id": project_id,
+                    "leader_id": members[0],
+                    "is_locked": False,
+                    "status": TeamStatusEnum.APPROVED if project_id else TeamStatusEnum.PENDING,
+                }
+            )
+            member_rows.extend({"team_id": team_id, "student_id": s} for s in members)
+
+        self.bulk_insert(ProjectTeam, team_rows)
+        self.bulk_insert(TeamMember, member_rows)
+        return team_rows
+
+    def applications(self, teams: list, project_ids: list, per_team: int, student_ids: list):
+        now = datetime.now(timezone.utc)
+        team_rows, student_rows = [], []
+        for team in teams:
+            if team["project_id"]:
+                team_rows.append(
+                    {
+                        "project_id": team["project_id"],
+                        "team_id": team["id"],
+                        "status": TeamStatusEnum.APPROVED,
+                        "motivation": None,
+                        "created_at": now,
+                    }
+                )
+                continue
+            for project_id in self.rng.sample(project_ids, min(per_team, len(project_ids))):
+                team_rows.append(
+                    {
+                        "project_id": project_id,
+                        "team_id": team["id"],
+                        "status": TeamStatusEnum.PENDING,
+                        "motivation": "We would like to work on this project.",
+                        "created_at": now,
+                    }
+                )
+            student_rows.append(
+                {
+                    "team_id": team["id"],
+                    "student_id": self.rng.choice(student_ids),
+                    "status": TeamStatusEnum.PENDING,
+                    "message": "I'd like to join your team.",
+                    "created_at": now,
+                }
+            )
+        self.bulk_insert(TeamApplication, team_rows)
+        self.bulk_insert(StudentTeamApplication, student_rows)
+
+    def submissions(self, teams: list, milestones_by_project: dict, ratio: float, documents: int):
+        first_id = self.next_id(MilestoneSubmission)
+        now = datetime.now(timezone.utc)
+        submission_rows, document_rows = [], []
+        for team in teams:
+            for milestone_id in milestones_by_project.get(team["project_id"], []):
+                if self.rng.random() > ratio:
+                    continue
+                submission_id = first_id + len(submission_rows)
+                graded = self.rng.random() < 0.5
+                submission_rows.append(
+                    {
+                        "id": submission_id,
+                        "team_id": team["id"],
+                        "milestone_id": milestone_id,
+                        "submitted_at": now,
+                        "grade": round(self.rng.uniform(40, 100), 1) if graded else None,
+                        "feedback": "Good progress." if graded else None,
+                    }
+                )
+                for n in range(documents):
+                    document_rows.append(
+                        {
+                            "submission_id": submission_id,
+                            "filename": f"report_{n + 1}.pdf",
+                            "file_path": f"uploads/milestone_submissions/{submission_id}/report_{n + 1}.pdf",
+                            "uploaded_at": now,
+                        }
+                    )
+        self.bulk_insert(MilestoneSubmission, submission_rows)
+        self.bulk_insert(SubmissionDocument, document_rows)
+
+
+def reset_postgres_sequences(db):
+    """Explicit ids bypass Postgres sequences; move them past the seeded rows."""
+    for model in (User, Student, Professor, Project, Milestone, ProjectTeam, MilestoneSubmission):
+        table = model.__tablename__
+        db.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            )
+        )
+    db.commit()
+
+
+def seed(args):
+    upgrade_database()
+    rng = random.Random(args.seed)
+    hashed_password = hash_password(args.password)
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        seeder = Seeder(db, rng, args.chunk_size)
+        student_ids = seeder.students(seeder.users(RoleEnum.student, args.students, hashed_password))
+        professor_ids = seeder.professors(
+            seeder.users(RoleEnum.professor, args.professors, hashed_password)
+        )
+        project_ids = seeder.projects(professor_ids, args.projects)
+        milestones_by_project = seeder.milestones(project_ids, args.milestones)
+        teams = seeder.teams(student_ids, project_ids, args.team_size)
+        seeder.applications(teams, project_ids, args.applications, student_ids)
+        seeder.submissions(teams, milestones_by_project, args.submission_ratio, args.documents)
+        if engine.dialect.name == "postgresql":
+            reset_postgres_sequences(db)
+        # Bulk inserts bypass the incremental catalog maintenance
+        rebuild_catalog(db)
+    finally:
+        db.close()
+
+    logger.info(f"Seeding finished in {time.perf_counter() - started:.1f}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed ProjectHub with synthetic data")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--professors", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--milestones", type=int, default=5, help="milestones per project")
+    parser.add_argument("--team-size", type=int, default=4)
+    parser.add_argument("--applications", type=int, default=3, help="project applications per unassigned team")
+    parser.add_argument("--submission-ratio", type=float, default=0.6, help="share of milestones submitted")
+    parser.add_argument("--documents", type=int, default=2, help="documents per submission")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    seed(parse_args())
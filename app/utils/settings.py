@@ -1,3 +1,6 @@
+import os
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,5 +10,88 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
 
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Uploads
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_UPLOAD_FILE_BYTES: int = 512 * 1024 * 1024
+    MAX_UPLOAD_REQUEST_BYTES: int = 1024 * 1024 * 1024
+
+    # Bulk user import; its hashes run on their own pool, leaving the login
+    # pool's workers free
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_HASH_WORKERS: int = max(1, (os.cpu_count() or 1) // 2)
+
+    # Object storage for uploaded files
+    STORAGE_BACKEND: str = "local"
+    STORAGE_LOCAL_ROOT: str = "uploads"
+    STORAGE_STAGING_DIR: str = os.path.join("uploads", "staging")
+    # Objects no row points at (e.g. left by a crash mid-upload) are deleted
+    # once older than the grace period, at most once per sweep interval
+    STORAGE_ORPHAN_GRACE_SECONDS: int = 24 * 3600
+    STORAGE_ORPHAN_SWEEP_SECONDS: int = 3600
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_MULTIPART_THRESHOLD: int = 64 * 1024 * 1024
+    S3_MULTIPART_CHUNK_SIZE: int = 16 * 1024 * 1024
+    S3_PRESIGNED_URL_EXPIRES_SECONDS: int = 900
+
+    # Resource downloads
+    RESOURCE_CACHE_CONTROL: str = "public, max-age=3600"
+
+    # Real-time notifications
+    NOTIFICATIONS_BACKEND: str = "local"
+    NOTIFICATIONS_CHANNEL: str = "projecthub_notifications"
+    NOTIFICATIONS_QUEUE_SIZE: int = 100
+    NOTIFICATIONS_HEARTBEAT_SECONDS: int = 15
+
+    # Transactional outbox
+    OUTBOX_WORKER_IN_PROCESS: bool = True
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_SECONDS: float = 5.0
+    OUTBOX_LEASE_SECONDS: int = 60
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: float = 2.0
+    OUTBOX_RETRY_MAX_SECONDS: float = 600.0
+    OUTBOX_RETENTION_HOURS: int = 24
+
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Read replicas (comma-separated URLs; reads use the primary when empty)
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_POLICY: str = "round_robin"
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    # List endpoint pagination
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+
+    # Authenticated identity cache
+    IDENTITY_CACHE_ENABLED: bool = True
+    IDENTITY_CACHE_TTL_SECONDS: int = 60
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+
+    # HTTP response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Database instrumentation
+    DB_METRICS_HEADERS: bool = False
+    DB_QUERY_BUDGET_STRICT: bool = False
+
 
 settings = Settings()
\ No newline at end of file
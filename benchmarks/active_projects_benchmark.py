@@ -0,0 +1,187 @@
+"""Measure get_student_active_projects on a reproducible fixture.
+
+Seeds a throwaway SQLite database with one student on ``--teams`` assigned
+teams of ``--members`` members each, every project with ``--milestones``
+milestones and every other milestone submitted, then times the service call
+and counts its DB statements.
+
+    python -m benchmarks.active_projects_benchmark --calls 500
+    python -m benchmarks.active_projects_benchmark --teams 3 --milestones 40
+
+The default fixture is the 4 members x 20 milestones case; the statement
+count should not grow with either number.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+# Settings are read at import time; never seed into a configured database
+_TMP = tempfile.mkdtemp(prefix="projecthub-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/bench.db"
+
+from sqlalchemy import event  # noqa: E402
+
+from app.database.db import SessionLocal, engine  # noqa: E402
+from app.database.migrate import upgrade_database  # noqa: E402
+from app.database.models import (  # noqa: E402
+    Milestone,
+    MilestoneSubmission,
+    Professor,
+    Project,
+    ProjectTeam,
+    Student,
+    TeamMember,
+    User,
+)
+from app.schemas.enum_schemas import (  # noqa: E402
+    DepartmentEnum,
+    ProjectStatusEnum,
+    TeamStatusEnum,
+    TitleEnum,
+    YearEnum,
+)
+from app.services.project_service import get_student_active_projects  # noqa: E402
+
+from benchmarks.api_benchmark import percentile  # noqa: E402
+
+
+def make_user(db, role: str, n: int) -> User:
+    user = User(
+        username=f"{role}{n}",
+        full_name=f"Bench {role.title()} {n}",
+        email=f"{role}{n}@bench.example",
+        hashed_password="not-a-real-hash",
+        role=role,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_student(db, n: int) -> Student:
+    student = Student(
+        user_id=make_user(db, "student", n).id,
+        department=DepartmentEnum.CSE,
+        year=YearEnum.FOURTH,
+    )
+    db.add(student)
+    db.flush()
+    return student
+
+
+def seed(teams: int, members: int, milestones: int) -> int:
+    """Create the fixture and return the measured student's id."""
+    db = SessionLocal()
+    try:
+        professor = Professor(
+            user_id=make_user(db, "professor", 1).id,
+            department=DepartmentEnum.CSE,
+            title=TitleEnum.PROF,
+        )
+        db.add(professor)
+        db.flush()
+
+        student = make_student(db, 1)
+        student_count = 1
+        for t in range(teams):
+            project = Project(
+                title=f"Bench project {t + 1}",
+                description="Benchmark project",
+                year=YearEnum.FOURTH,
+                status=ProjectStatusEnum.IN_PROGRESS,
+                tags=["python"],
+                professor_id=professor.id,
+            )
+            db.add(project)
+            db.flush()
+            team = ProjectTeam(
+                name=f"Bench team {t + 1}",
+                leader_id=student.id,
+                project_id=project.id,
+                status=TeamStatusEnum.APPROVED,
+            )
+            db.add(team)
+            db.flush()
+
+            team_members = [student]
+            for _ in range(members - 1):
+                student_count += 1
+                team_members.append(make_student(db, student_count))
+            db.add_all(TeamMember(team_id=team.id, student_id=member.id) for member in team_members)
+
+            for m in range(milestones):
+                milestone = Milestone(
+                    title=f"Milestone {m + 1}",
+                    description="",
+                    due_date=date(2030, 1, 1) + timedelta(days=7 * m),
+                    weightage=100 / milestones,
+                    project_id=project.id,
+                )
+                db.add(milestone)
+                db.flush()
+                if m % 2 == 0:
+                    db.add(MilestoneSubmission(team_id=team.id, milestone_id=milestone.id))
+        db.commit()
+        return student.id
+    finally:
+        db.close()
+
+
+def measure(student_id: int, calls: int):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    latencies = []
+    try:
+        for _ in range(calls):
+            # A fresh session per call, as each request gets one
+            db = SessionLocal()
+            try:
+                del statements[:]
+                started = time.perf_counter()
+                projects = get_student_active_projects(db, student_id)
+                latencies.append(time.perf_counter() - started)
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return projects, latencies, len(statements)
+
+
+def main(args):
+    upgrade_database()
+    student_id = seed(args.teams, args.members, args.milestones)
+    # Warm up the connection pool and statement caches before measuring
+    measure(student_id, args.warmup)
+    projects, latencies, statements = measure(student_id, args.calls)
+
+    ms = [latency * 1000 for latency in latencies]
+    print(
+        f"teams: {args.teams}, members: {args.members}, milestones: {args.milestones}, "
+        f"projects returned: {len(projects)}"
+    )
+    print(f"calls: {len(ms)}, statements per call: {statements}")
+    print(
+        f"latency ms p50 {percentile(ms, 50):.2f} "
+        f"p95 {percentile(ms, 95):.2f} p99 {percentile(ms, 99):.2f}"
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark get_student_active_projects")
+    parser.add_argument("--teams", type=int, default=1, help="assigned teams of the student")
+    parser.add_argument("--members", type=int, default=4)
+    parser.add_argument("--milestones", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
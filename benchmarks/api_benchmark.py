@@ -0,0 +1,197 @@
+"""Load-test the key API endpoints in-process.
+
+Drives the real FastAPI app through an in-process ASGI client against the
+database selected by DATABASE_URL (seed it first with app.utils.seed_data) and
+reports latency percentiles, throughput and DB statements per request.
+
+    python -m benchmarks.api_benchmark --requests 200 --concurrency 10
+
+Requires httpx (already needed by FastAPI's TestClient).
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional benchmark dependency
+    raise SystemExit("The benchmark needs httpx: pip install httpx")
+
+from app.database.db import SessionLocal
+from app.database.models import Professor, Project, ProjectTeam, Student, TeamMember
+from app.utils.security import create_access_token
+from app.utils.settings import settings
+
+
+@dataclass
+class Identities:
+    student_tokens: List[str]
+    professor_tokens: List[str]
+    project_ids: List[int]
+
+
+@dataclass
+class Endpoint:
+    name: str
+    role: str
+    path: Callable[[random.Random, Identities], str]
+
+
+@dataclass
+class Result:
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    wall_time: float = 0.0
+
+
+ENDPOINTS = [
+    Endpoint("available projects", "student", lambda rng, ids: "/api/projects/available"),
+    Endpoint("student active projects", "student", lambda rng, ids: "/api/projects/student/active"),
+    Endpoint("student milestones", "student", lambda rng, ids: "/api/projects/student/milestones"),
+    Endpoint("all teams", "student", lambda rng, ids: "/api/projects/teams/all"),
+    Endpoint("all students", "student", lambda rng, ids: "/api/projects/students/all"),
+    Endpoint("professor projects", "professor", lambda rng, ids: "/api/projects/list"),
+    Endpoint(
+        "professor submissions", "professor", lambda rng, ids: "/api/projects/professor/submissions"
+    ),
+    Endpoint(
+        "project detail",
+        "student",
+        lambda rng, ids: f"/api/projects/get/{rng.choice(ids.project_ids)}",
+    ),
+]
+
+
+def token_for(user_id: int, role: str) -> str:
+    return create_access_token({"sub": str(user_id), "role": role})
+
+
+def load_identities(sample_size: int) -> Identities:
+    """Pick students on assigned teams and professors who own projects."""
+    db = SessionLocal()
+    try:
+        student_user_ids = [
+            user_id
+            for (user_id,) in db.query(Student.user_id)
+            .join(TeamMember, TeamMember.student_id == Student.id)
+            .join(ProjectTeam, ProjectTeam.id == TeamMember.team_id)
+            .filter(ProjectTeam.project_id.isnot(None))
+            .limit(sample_size)
+        ]
+        professor_user_ids = [
+            user_id
+            for (user_id,) in db.query(Professor.user_id)
+            .join(Project, Project.professor_id == Professor.id)
+            .distinct()
+            .limit(sample_size)
+        ]
+        project_ids = [project_id for (project_id,) in db.query(Project.id).limit(sample_size * 10)]
+    finally:
+        db.close()
+
+    if not (student_user_ids and professor_user_ids and project_ids):
+        raise SystemExit("Database has no seeded data; run python -m app.utils.seed_data first")
+
+    return Identities(
+        student_tokens=[token_for(uid, "student") for uid in student_user_ids],
+        professor_tokens=[token_for(uid, "professor") for uid in professor_user_ids],
+        project_ids=project_ids,
+    )
+
+
+async def run_endpoint(
+    client, endpoint: Endpoint, identities: Identities, requests: int, concurrency: int, seed: int
+) -> Result:
+    rng = random.Random(seed)
+    tokens = identities.student_tokens if endpoint.role == "student" else identities.professor_tokens
+    jobs = [(endpoint.path(rng, identities), rng.choice(tokens)) for _ in range(requests)]
+    result = Result(endpoint.name)
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def worker():
+        while not queue.empty():
+            path, token = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            result.latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                result.errors += 1
+            if "X-DB-Queries" in response.headers:
+                result.queries.append(int(response.headers["X-DB-Queries"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(result: Result) -> Dict[str, str]:
+    ms = [latency * 1000 for latency in result.latencies]
+    return {
+        "endpoint": result.name,
+        "p50 ms": f"{percentile(ms, 50):.1f}",
+        "p95 ms": f"{percentile(ms, 95):.1f}",
+        "p99 ms": f"{percentile(ms, 99):.1f}",
+        "req/s": f"{len(ms) / result.wall_time:.1f}",
+        "queries": f"{statistics.mean(result.queries):.1f}" if result.queries else "-",
+        "errors": str(result.errors),
+    }
+
+
+def print_table(rows: List[Dict[str, str]]):
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(row[c]) for row in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(row[c].ljust(widths[c]) for c in columns))
+
+
+async def main(args):
+    settings.DB_METRICS_HEADERS = True
+    from main import app  # imported late so the settings above apply
+
+    identities = load_identities(args.sample_users)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results = []
+        for endpoint in ENDPOINTS:
+            if args.only and endpoint.name not in args.only:
+                continue
+            # Warm up connections and caches before measuring
+            await run_endpoint(client, endpoint, identities, args.concurrency, args.concurrency, args.seed)
+            results.append(
+                await run_endpoint(
+                    client, endpoint, identities, args.requests, args.concurrency, args.seed
+                )
+            )
+
+    print_table([summarize(result) for result in results])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ProjectHub API endpoints")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--sample-users", type=int, default=50)
+    parser.add_argument("--only", nargs="*", help="endpoint names to run")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,178 @@
+"""Show the query plans of hot lookups with and without the 0002 indexes.
+
+Seeds a throwaway SQLite database with app.utils.seed_data, prints the
+EXPLAIN QUERY PLAN of the lookups that migration 0002 added indexes for,
+drops those indexes and prints the plans again. Plans that say ``SCAN`` where
+they said ``SEARCH ... USING INDEX`` read the whole table.
+
+    python -m benchmarks.index_explain
+    python -m benchmarks.index_explain --students 20000 --projects 2000
+"""
+
+import argparse
+import os
+import tempfile
+
+# Settings are read at import time; indexes are only ever dropped from a
+# database created here
+_TMP = tempfile.mkdtemp(prefix="projecthub-explain-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/explain.db"
+
+from sqlalchemy import select, text  # noqa: E402
+
+from app.database.db import engine  # noqa: E402
+from app.database.models import (  # noqa: E402
+    Milestone,
+    MilestoneSubmission,
+    Project,
+    ProjectResource,
+    ProjectTeam,
+    SubmissionDocument,
+    TeamMember,
+)
+from app.database.models.project_models import (  # noqa: E402
+    StudentTeamApplication,
+    TeamApplication,
+)
+from app.schemas.enum_schemas import ProjectStatusEnum  # noqa: E402
+from app.utils import seed_data  # noqa: E402
+
+# Created by migrations/versions/0002_add_foreign_key_and_filter_indexes.py
+MIGRATION_0002_INDEXES = (
+    "ix_milestone_submissions_team_id",
+    "ix_milestones_project_id_due_date",
+    "ix_project_resources_project_id",
+    "ix_project_teams_leader_id",
+    "ix_projects_professor_id_status",
+    "ix_projects_status",
+    "ix_student_team_applications_student_id",
+    "ix_student_team_applications_team_id_student_id",
+    "ix_submission_documents_submission_id",
+    "ix_team_applications_project_id_team_id",
+    "ix_team_applications_team_id",
+    "ix_team_members_student_id",
+    "ix_team_members_team_id_student_id",
+)
+
+
+def first(connection, column):
+    return connection.execute(select(column).where(column.isnot(None)).limit(1)).scalar()
+
+
+def lookups(connection):
+    """(name, statement) pairs for the lookups behind the hot endpoints."""
+    student_id = first(connection, TeamMember.student_id)
+    team_id = first(connection, MilestoneSubmission.team_id)
+    project_id = first(connection, Milestone.project_id)
+    professor_id = first(connection, Project.professor_id)
+    submission_id = first(connection, SubmissionDocument.submission_id)
+    return [
+        (
+            "teams of a student",
+            select(TeamMember.team_id).where(TeamMember.student_id == student_id),
+        ),
+        (
+            "members of a team",
+            select(TeamMember.student_id).where(TeamMember.team_id == team_id),
+        ),
+        (
+            "milestones of a project by due date",
+            select(Milestone.id)
+            .where(Milestone.project_id == project_id)
+            .order_by(Milestone.due_date),
+        ),
+        (
+            "submissions of a team",
+            select(MilestoneSubmission.id).where(MilestoneSubmission.team_id == team_id),
+        ),
+        (
+            "documents of a submission",
+            select(SubmissionDocument.id).where(
+                SubmissionDocument.submission_id == submission_id
+            ),
+        ),
+        (
+            "resources of a project",
+            select(ProjectResource.id).where(ProjectResource.project_id == project_id),
+        ),
+        (
+            "open projects",
+            select(Project.id).where(Project.status == ProjectStatusEnum.OPEN),
+        ),
+        (
+            "professor's projects by status",
+            select(Project.id).where(
+                Project.professor_id == professor_id,
+                Project.status == ProjectStatusEnum.OPEN,
+            ),
+        ),
+        (
+            "teams led by a student",
+            select(ProjectTeam.id).where(ProjectTeam.leader_id == student_id),
+        ),
+        (
+            "applications of a team",
+            select(TeamApplication.id).where(TeamApplication.team_id == team_id),
+        ),
+        (
+            "team application to a project",
+            select(TeamApplication.id).where(
+                TeamApplication.project_id == project_id, TeamApplication.team_id == team_id
+            ),
+        ),
+        (
+            "join requests of a student",
+            select(StudentTeamApplication.id).where(
+                StudentTeamApplication.student_id == student_id
+            ),
+        ),
+    ]
+
+
+def print_plans(connection, statements, title: str):
+    print(f"== {title}")
+    for name, statement in statements:
+        sql = str(
+            statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        )
+        plan = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        print(name)
+        for row in plan:
+            print(f"    {row[-1]}")
+    print()
+
+
+def main(args):
+    seed_data.seed(
+        seed_data.parse_args(
+            [
+                "--students", str(args.students),
+                "--professors", str(args.professors),
+                "--projects", str(args.projects),
+                "--seed", str(args.seed),
+            ]
+        )
+    )
+
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+        statements = lookups(connection)
+        print_plans(connection, statements, "with the 0002 indexes")
+
+        for name in MIGRATION_0002_INDEXES:
+            connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text("ANALYZE"))
+        print_plans(connection, statements, "without the 0002 indexes")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN hot lookups with and without the 0002 indexes")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--professors", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
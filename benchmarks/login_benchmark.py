@@ -0,0 +1,106 @@
+"""Measure login throughput under concurrency.
+
+Fires concurrent POST /api/auth/login requests for seeded users while a
+background probe hits a cheap authenticated endpoint, showing how much bcrypt
+work slows down the rest of the API.
+
+    python -m benchmarks.login_benchmark --logins 200 --concurrency 20
+
+Seeded users share the password from app.utils.seed_data (``password123``).
+"""
+
+import argparse
+import asyncio
+import time
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional benchmark dependency
+    raise SystemExit("The benchmark needs httpx: pip install httpx")
+
+from app.database.db import SessionLocal
+from app.database.models import User
+from app.utils.security import create_access_token
+from app.utils.settings import settings
+
+from benchmarks.api_benchmark import percentile
+
+
+async def login_worker(client, queue: asyncio.Queue, password: str, latencies: list, errors: list):
+    while not queue.empty():
+        email = queue.get_nowait()
+        started = time.perf_counter()
+        response = await client.post(
+            "/api/auth/login", json={"email": email, "password": password}
+        )
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def probe(client, token: str, stop: asyncio.Event, latencies: list):
+    """Measure a cheap endpoint's latency while logins are running."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/api/projects/teams/all?limit=1", headers={"Authorization": f"Bearer {token}"})
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def main(args):
+    from main import app  # imported late so DATABASE_URL from the environment applies
+
+    db = SessionLocal()
+    try:
+        users = db.query(User.id, User.email, User.role).filter(User.role == "student").limit(args.logins).all()
+    finally:
+        db.close()
+    if not users:
+        raise SystemExit("Database has no seeded students; run python -m app.utils.seed_data first")
+
+    probe_token = create_access_token({"sub": str(users[0].id), "role": "student"})
+    queue = asyncio.Queue()
+    for i in range(args.logins):
+        queue.put_nowait(users[i % len(users)].email)
+
+    login_latencies, probe_latencies, errors = [], [], []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        probe_task = asyncio.create_task(probe(client, probe_token, stop, probe_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                login_worker(client, queue, args.password, login_latencies, errors)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    login_ms = [latency * 1000 for latency in login_latencies]
+    probe_ms = [latency * 1000 for latency in probe_latencies]
+    print(f"bcrypt rounds: {settings.BCRYPT_ROUNDS}, hash workers: {settings.PASSWORD_HASH_WORKERS}")
+    print(f"logins: {len(login_ms)} in {elapsed:.2f}s ({len(login_ms) / elapsed:.1f}/s), errors: {len(errors)}")
+    print(
+        f"login latency ms p50 {percentile(login_ms, 50):.1f} "
+        f"p95 {percentile(login_ms, 95):.1f} p99 {percentile(login_ms, 99):.1f}"
+    )
+    if probe_ms:
+        print(
+            f"other endpoint latency ms p50 {percentile(probe_ms, 50):.1f} "
+            f"p95 {percentile(probe_ms, 95):.1f} p99 {percentile(probe_ms, 99):.1f}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark login throughput")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--password", default="password123")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
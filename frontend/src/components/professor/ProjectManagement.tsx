@@ -24,6 +24,7 @@ import {
 import { Input } from "@/components/ui/input";
 import { toast } from "sonner";
 import { CreateProject } from "./CreateProject";
+import { fetchAllPages } from "@/utils/api";
 
 interface ProjectManagementProps {
   onViewDetails?: (projectId: number) => void;
@@ -44,7 +45,7 @@ export const ProjectManagement = ({
           throw new Error("No token found");
         }
 
-        const response = await fetch(
+        const data = await fetchAllPages(
           "http://localhost:8000/api/projects/list",
           {
             method: "GET",
@@ -53,12 +54,6 @@ export const ProjectManagement = ({
             },
           }
         );
-
-        if (!response.ok) {
-          throw new Error("Failed to fetch projects");
-        }
-
-        const data = await response.json();
         setProjects(data);
       } catch (error) {
         console.error("Error fetching projects:", error);
@@ -13,6 +13,7 @@ import { Textarea } from "@/components/ui/textarea";
 import { useToast } from "@/components/ui/use-toast";
 import axios from "axios";
 import {useAuth} from "@/contexts/AuthContext"
+import { fetchAllPages } from "@/utils/api";
 
 // Team and student interfaces
 interface Team {
@@ -76,12 +77,12 @@ export const CollaboratorFinder = () => {
     const fetchTeams = async () => {
       try {
         const token = localStorage.getItem('token');
-        const response = await axios.get('http://localhost:8000/api/projects/teams/all', {
+        const allTeams = await fetchAllPages<Team>('http://localhost:8000/api/projects/teams/all', {
           headers: {
             Authorization: `Bearer ${token}`
           }
         });
-        setTeams(response.data);
+        setTeams(allTeams);
         setLoading(prev => ({ ...prev, teams: false }));
       } catch (error) {
         console.error('Error fetching teams:', error);
@@ -102,12 +103,12 @@ export const CollaboratorFinder = () => {
     const fetchStudents = async () => {
       try {
         const token = localStorage.getItem('token');
-        const response = await axios.get('http://localhost:8000/api/projects/students/all', {
+        const allStudents = await fetchAllPages<Student>('http://localhost:8000/api/projects/students/all', {
           headers: {
             Authorization: `Bearer ${token}`
           }
         });
-        setStudents(response.data);
+        setStudents(allStudents);
         setLoading(prev => ({ ...prev, students: false }));
       } catch (error) {
         console.error('Error fetching students:', error);
@@ -257,12 +258,12 @@ export const CollaboratorFinder = () => {
       setMyTeams(myTeamsResponse.data);
 
       // Refresh all teams
-      const allTeamsResponse = await axios.get('http://localhost:8000/api/projects/teams/all', {
+      const allTeams = await fetchAllPages<Team>('http://localhost:8000/api/projects/teams/all', {
         headers: {
           Authorization: `Bearer ${token}`
         }
       });
-      setTeams(allTeamsResponse.data);
+      setTeams(allTeams);
 
       setCreateTeamDialogOpen(false);
       setNewTeamName("");
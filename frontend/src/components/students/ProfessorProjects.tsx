@@ -43,6 +43,7 @@ import { Textarea } from "@/components/ui/textarea";
 import { toast } from "sonner";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { useNavigate } from "react-router-dom";
+import { fetchAllPages } from "@/utils/api";
 
 export const ProfessorProjects = () => {
   const [searchQuery, setSearchQuery] = useState("");
@@ -120,17 +121,16 @@ export const ProfessorProjects = () => {
         }
 
         // Fetch available students for team creation
-        const studentsResponse = await fetch(
+        const studentsData = await fetchAllPages<any>(
           "http://localhost:8000/api/projects/students/all",
           {
             headers: {
               Authorization: `Bearer ${token}`,
             },
           }
-        );
+        ).catch(() => null);
 
-        if (studentsResponse.ok) {
-          const studentsData = await studentsResponse.json();
+        if (studentsData) {
           setAvailableStudents(studentsData);
         }
       } catch (error) {
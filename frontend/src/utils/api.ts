@@ -28,3 +28,32 @@ export const fetchWithAuth = async (url: string, options: RequestInit = {}) => {
 
   return response.json();
 };
+
+// Largest page the list endpoints serve (MAX_PAGE_SIZE on the API)
+const PAGE_SIZE = 200;
+
+/**
+ * Fetch every item of a paginated list endpoint, following the cursor the
+ * API returns in the X-Next-Cursor header until the last page
+ */
+export const fetchAllPages = async <T>(url: string, options: RequestInit = {}): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+
+  do {
+    const pageUrl = new URL(url);
+    pageUrl.searchParams.set('limit', String(PAGE_SIZE));
+    if (cursor) {
+      pageUrl.searchParams.set('cursor', cursor);
+    }
+
+    const response = await fetch(pageUrl.toString(), options);
+    if (!response.ok) {
+      throw new Error(`Request to ${url} failed with status ${response.status}`);
+    }
+    items.push(...(await response.json()));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+
+  return items;
+};
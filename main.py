@@ -1,31 +1,53 @@
 """This is the main entry point for my FastAPI application"""
 
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # from app.database.models import *
-from app.database.db import Base, engine
+from app.database.db import replica_set
+from app.database.instrumentation import db_metrics_middleware
+from app.database.replicas import read_your_writes_middleware
+from app.database.migrate import upgrade_database
 from app.routes import (
     admin_router,
     auth_router,
+    notification_router,
     project_router,
     user_router,
 )
+from app.services.outbox_service import outbox_worker
+from app.utils.request_limits import RequestSizeLimitMiddleware
+from app.utils.settings import settings
+
+# Bring the database schema up to date
+upgrade_database()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deliver queued side effects (notifications, storage cleanup) from this
+    # process unless a standalone worker does it
+    if settings.OUTBOX_WORKER_IN_PROCESS:
+        outbox_worker.start()
+    yield
+    outbox_worker.stop()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="ProjectHub API",
     description="API for Final Year Project Assistance System",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(auth_router.router)
 app.include_router(admin_router.router)
 app.include_router(user_router.router)
 app.include_router(project_router.router)
+app.include_router(notification_router.router)
 
 # Configure CORS
 app.add_middleware(
@@ -34,8 +56,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-DB-Queries",
+        "X-DB-Time-ms",
+        "X-DB-Rows",
+        "X-Next-Cursor",
+        "ETag",
+        "X-Cache",
+        "Accept-Ranges",
+        "Content-Range",
+    ],
 )
 
+app.middleware("http")(db_metrics_middleware)
+app.middleware("http")(read_your_writes_middleware(replica_set))
+app.add_middleware(RequestSizeLimitMiddleware)
+
 
 if __name__ == "__main__":
     uvicorn.run(app, port=8000, host="0.0.0.0")
@@ -0,0 +1,49 @@
+"""add project search indexes
+
+Postgres only: a GIN index over the weighted full-text vector of the
+catalog and one over its tags. Other databases search with the in-process
+index in app.services.search_service.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:52:07.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must stay identical to search_service._search_vector() for the planner to use it
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(CAST(tags AS TEXT), '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, summary), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        f"CREATE INDEX ix_project_catalog_search ON project_catalog USING GIN (({SEARCH_VECTOR}))"
+    )
+    op.execute(
+        "CREATE INDEX ix_project_catalog_tags ON project_catalog USING GIN ((CAST(tags AS JSONB)))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_project_catalog_tags")
+    op.execute("DROP INDEX IF EXISTS ix_project_catalog_search")
@@ -0,0 +1,177 @@
+"""Shared fixtures: a throwaway SQLite database and factories for its rows.
+
+Settings are read at import time, so the environment is prepared before any
+application module is imported.
+"""
+
+import itertools
+import os
+import tempfile
+from datetime import date, timedelta
+
+_TMP = tempfile.mkdtemp(prefix="projecthub-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["STORAGE_LOCAL_ROOT"] = os.path.join(_TMP, "uploads")
+os.environ["STORAGE_STAGING_DIR"] = os.path.join(_TMP, "uploads", "staging")
+os.environ["OUTBOX_WORKER_IN_PROCESS"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from main import app  # noqa: E402  (creates the schema)
+from app.database.db import SessionLocal, engine  # noqa: E402
+from app.database.models.professor_models import Professor  # noqa: E402
+from app.database.models.project_models import (  # noqa: E402
+    Milestone,
+    Project,
+    ProjectTeam,
+    TeamApplication,
+    TeamMember,
+)
+from app.database.models.student_models import Student  # noqa: E402
+from app.database.models.user_models import RoleEnum, User  # noqa: E402
+from app.schemas.enum_schemas import (  # noqa: E402
+    DepartmentEnum,
+    ProjectStatusEnum,
+    TeamStatusEnum,
+    TitleEnum,
+    YearEnum,
+)
+from app.utils.security import create_access_token  # noqa: E402
+
+_sequence = itertools.count(1)
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def count_queries():
+    """Count the statements sent to the database; use as a context manager."""
+
+    class _Counting:
+        def __enter__(self):
+            self.counter = QueryCounter()
+            event.listen(engine, "before_cursor_execute", self.counter)
+            return self.counter
+
+        def __exit__(self, *exc):
+            event.remove(engine, "before_cursor_execute", self.counter)
+
+    return _Counting
+
+
+def make_user(db, role: RoleEnum, **fields) -> User:
+    n = next(_sequence)
+    user = User(
+        username=fields.pop("username", f"user{n}"),
+        full_name=fields.pop("full_name", f"User {n}"),
+        email=fields.pop("email", f"user{n}@example.com"),
+        hashed_password=fields.pop("hashed_password", "not-a-real-hash"),
+        role=role,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_student(db, **fields) -> Student:
+    user = make_user(db, RoleEnum.student)
+    student = Student(
+        user_id=user.id,
+        department=fields.pop("department", DepartmentEnum.CSE),
+        year=fields.pop("year", YearEnum.FOURTH),
+        **fields,
+    )
+    db.add(student)
+    db.commit()
+    return student
+
+
+def make_professor(db) -> Professor:
+    user = make_user(db, RoleEnum.professor)
+    professor = Professor(
+        user_id=user.id, department=DepartmentEnum.CSE, title=TitleEnum.PROF
+    )
+    db.add(professor)
+    db.commit()
+    return professor
+
+
+def make_project(db, professor: Professor, milestones: int = 1, **fields) -> Project:
+    n = next(_sequence)
+    project = Project(
+        title=fields.pop("title", f"Project {n}"),
+        description=fields.pop("description", "A project"),
+        year=fields.pop("year", YearEnum.FOURTH),
+        status=fields.pop("status", ProjectStatusEnum.OPEN),
+        tags=fields.pop("tags", ["python"]),
+        professor_id=professor.id,
+        **fields,
+    )
+    db.add(project)
+    db.flush()
+    for index in range(milestones):
+        db.add(
+            Milestone(
+                title=f"Milestone {index + 1}",
+                description="",
+                due_date=date.today() + timedelta(days=30 * (index + 1)),
+                weightage=100 / milestones,
+                project_id=project.id,
+            )
+        )
+    db.commit()
+    return project
+
+
+def make_team(db, leader: Student, members=(), project: Project = None, status=TeamStatusEnum.PENDING) -> ProjectTeam:
+    team = ProjectTeam(
+        name=f"Team {next(_sequence)}",
+        leader_id=leader.id,
+        project_id=project.id if project else None,
+        status=status,
+    )
+    db.add(team)
+    db.flush()
+    for student in (leader, *members):
+        db.add(TeamMember(team_id=team.id, student_id=student.id))
+    db.commit()
+    return team
+
+
+def apply_team(db, team: ProjectTeam, project: Project) -> TeamApplication:
+    application = TeamApplication(
+        project_id=project.id, team_id=team.id, status=TeamStatusEnum.PENDING
+    )
+    db.add(application)
+    db.commit()
+    return application
+
+
+def auth_headers(user_id: int, role: str) -> dict:
+    token = create_access_token({"sub": str(user_id), "role": role})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,58 @@
+import threading
+
+from app.services import auth_service
+from app.utils import security
+
+
+def registration(email):
+    return {
+        "username": email.split("@")[0],
+        "fullname": "New Student",
+        "email": email,
+        "password": "correct horse",
+        "role": "student",
+        "department": "CSE",
+        "year": "4th Year",
+    }
+
+
+def test_register_and_login(client):
+    response = client.post("/api/auth/register", json=registration("fresh@example.com"))
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    response = client.post(
+        "/api/auth/login", json={"email": "fresh@example.com", "password": "correct horse"}
+    )
+    assert response.status_code == 200
+
+
+def test_duplicate_email_is_rejected_before_hashing(client, monkeypatch):
+    assert client.post(
+        "/api/auth/register", json=registration("taken@example.com")
+    ).status_code == 200
+
+    hashed = []
+
+    async def counting_hash(password):
+        hashed.append(password)
+        return "unused"
+
+    monkeypatch.setattr(auth_service, "hash_password_async", counting_hash)
+    response = client.post("/api/auth/register", json=registration("taken@example.com"))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+    assert hashed == []
+
+
+def test_bulk_hashes_stay_off_the_login_pool(monkeypatch):
+    threads = []
+
+    def recording_hash(password):
+        threads.append(threading.current_thread().name)
+        return password
+
+    monkeypatch.setattr(security, "hash_password", recording_hash)
+    assert security.hash_passwords(["a", "b", "c"]) == ["a", "b", "c"]
+    assert threads and all(name.startswith("import-hash") for name in threads)
@@ -0,0 +1,26 @@
+from app.services.project_service import get_available_projects_for_student
+
+from conftest import apply_team, make_professor, make_project, make_student, make_team
+
+
+def test_available_projects_issue_a_fixed_number_of_queries(db, count_queries):
+    professor = make_professor(db)
+    student = make_student(db)
+    applied = make_project(db, professor, milestones=2)
+    team = make_team(db, student)
+    apply_team(db, team, applied)
+
+    with count_queries() as few:
+        get_available_projects_for_student(db, student.id)
+
+    for _ in range(5):
+        make_project(db, professor, milestones=3)
+    db.expire_all()
+
+    with count_queries() as many:
+        projects = get_available_projects_for_student(db, student.id)
+
+    assert many.count == few.count
+    by_id = {project["id"]: project for project in projects}
+    assert by_id[applied.id]["hasApplied"] is True
+    assert sum(project["hasApplied"] for project in projects) == 1
@@ -0,0 +1,33 @@
+from app.database.catalog import check_catalog
+from app.database.models.catalog_models import ProjectCatalogEntry
+from app.database.models.user_models import User
+
+from conftest import make_professor, make_project
+
+
+def catalog_entry(db, project):
+    db.expire_all()
+    return db.get(ProjectCatalogEntry, project.id)
+
+
+def test_deleted_professor_is_cleared_from_the_catalog(client, db):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+    assert catalog_entry(db, project).professor_name
+
+    assert client.delete(f"/api/users/users/{professor.user_id}").status_code == 200
+
+    assert catalog_entry(db, project).professor_name is None
+    assert project.id not in check_catalog(db)["stale"]
+
+
+def test_deleted_professor_user_is_cleared_from_the_catalog(db):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+    assert catalog_entry(db, project).professor_name
+
+    db.delete(db.get(User, professor.user_id))
+    db.commit()
+
+    assert catalog_entry(db, project).professor_name is None
+    assert project.id not in check_catalog(db)["stale"]
@@ -0,0 +1,29 @@
+from app.database.models.project_models import MilestoneSubmission
+from app.schemas.enum_schemas import TeamStatusEnum
+from app.services.project.gradebook_service import iter_gradebook
+
+from conftest import make_professor, make_project, make_student, make_team
+
+
+def test_gradebook_counts_only_the_team_own_submissions(db):
+    professor = make_professor(db)
+    project = make_project(db, professor, milestones=2)
+    first, second = project.milestones
+
+    # A team that submitted and was then released from the project
+    released = make_team(db, make_student(db))
+    db.add(MilestoneSubmission(team_id=released.id, milestone_id=first.id, grade=40))
+    current = make_team(db, make_student(db), project=project, status=TeamStatusEnum.APPROVED)
+    db.add(MilestoneSubmission(team_id=current.id, milestone_id=second.id, grade=90))
+    db.commit()
+
+    rows = list(iter_gradebook(db, professor.id, project.id))
+
+    assert {row["team_id"] for row in rows} == {current.id}
+    by_milestone = {row["milestone_id"]: row for row in rows}
+    assert len(by_milestone) == 2
+    assert by_milestone[first.id]["submission_id"] is None
+    assert by_milestone[first.id]["grade"] is None
+    assert by_milestone[second.id]["grade"] == 90
+    assert rows[0]["team_graded_weightage"] == second.weightage
+    assert rows[0]["team_weighted_total"] == round(90 * second.weightage / 100, 2)
@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import update
+
+from app.database.db import SessionLocal
+from app.database.models.student_models import Student
+from app.database.models.user_models import User
+from app.utils.identity_cache import IdentityCache, InMemoryTTLCache, identity_cache
+
+from conftest import make_student
+
+
+def cached_user(user_id):
+    session = SessionLocal()
+    try:
+        user = identity_cache.get_user(session, user_id)
+        return user.full_name, user.student.skills if user.student else None
+    finally:
+        session.close()
+
+
+def test_hits_do_not_query_the_database(db, count_queries):
+    student = make_student(db)
+    cached_user(student.user_id)
+
+    session = SessionLocal()
+    try:
+        with count_queries() as queries:
+            user = identity_cache.get_user(session, student.user_id)
+            assert user.student.id == student.id
+        assert queries.count == 0
+        assert user in session
+    finally:
+        session.close()
+
+
+def test_committed_changes_invalidate_the_entry(db):
+    student = make_student(db, skills=["c"])
+    assert cached_user(student.user_id) == (student.user.full_name, ["c"])
+
+    student.skills = ["rust"]
+    student.user.full_name = "Renamed"
+    db.commit()
+
+    assert cached_user(student.user_id) == ("Renamed", ["rust"])
+
+
+def test_bulk_updates_invalidate_every_entry(db):
+    student = make_student(db)
+    cached_user(student.user_id)
+
+    db.execute(update(User).where(User.id == student.user_id).values(full_name="Bulk"))
+    db.execute(update(Student).where(Student.id == student.id).values(skills=["go"]))
+    db.commit()
+
+    assert cached_user(student.user_id) == ("Bulk", ["go"])
+
+
+def test_rolled_back_changes_keep_the_entry(db):
+    student = make_student(db)
+    cached_user(student.user_id)
+    invalidations = identity_cache.invalidations
+
+    student.skills = ["never saved"]
+    db.flush()
+    db.rollback()
+
+    assert identity_cache.invalidations == invalidations
+
+
+def test_counters_are_exact_under_concurrency(db):
+    student = make_student(db)
+    before = identity_cache.hits + identity_cache.misses
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(cached_user, [student.user_id] * 200))
+
+    assert identity_cache.hits + identity_cache.misses - before == 200
+
+
+def test_invalidations_reach_workers_sharing_the_backend(db):
+    student = make_student(db)
+    backend = InMemoryTTLCache(100)
+    workers = [IdentityCache(backend, ttl=60), IdentityCache(backend, ttl=60)]
+
+    def full_name(worker):
+        session = SessionLocal()
+        try:
+            return worker.get_user(session, student.user_id).full_name
+        finally:
+            session.close()
+
+    assert full_name(workers[0]) == student.user.full_name
+    db.execute(update(User).where(User.id == student.user_id).values(full_name="Shared"))
+    db.commit()
+    # The change is committed and invalidated on the other worker
+    workers[1].invalidate_all()
+    assert full_name(workers[0]) == "Shared"
+    assert workers[0].misses == 2
+
+    db.execute(update(User).where(User.id == student.user_id).values(full_name="Single"))
+    db.commit()
+    workers[1].invalidate(student.user_id)
+    assert full_name(workers[0]) == "Single"
@@ -0,0 +1,34 @@
+import io
+import json
+
+from app.database.models.student_models import Student
+from app.database.models.user_models import User
+from app.services.import_service import import_users
+from app.services.matching_service import matching_engine
+
+from test_auth import registration
+
+
+def student_id(db, email):
+    return db.query(Student.id).join(User).filter(User.email == email).scalar()
+
+
+def test_registered_students_join_the_loaded_matrix(client, db):
+    matching_engine.load(db)
+
+    response = client.post("/api/auth/register", json=registration("matched@example.com"))
+    assert response.status_code == 200
+
+    assert student_id(db, "matched@example.com") in matching_engine.row_of
+
+
+def test_imported_students_join_the_loaded_matrix(db):
+    matching_engine.load(db)
+    rows = [registration(f"imported{n}@example.com") for n in range(3)]
+    stream = io.BytesIO("\n".join(json.dumps(row) for row in rows).encode())
+
+    report = import_users(db, stream, "json", chunk_size=2)
+    assert report["created"] == 3
+
+    for row in rows:
+        assert student_id(db, row["email"]) in matching_engine.row_of
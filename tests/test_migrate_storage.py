@@ -0,0 +1,49 @@
+import uuid
+
+from app.database.models.project_models import (
+    MilestoneSubmission,
+    ProjectResource,
+    SubmissionDocument,
+)
+from app.schemas.enum_schemas import TeamStatusEnum
+from app.utils.migrate_storage import migrate_legacy_files
+from app.utils.object_storage import get_storage
+
+from conftest import make_professor, make_project, make_student, make_team
+
+
+def test_shared_legacy_files_are_removed_after_their_last_row(db, tmp_path):
+    legacy = tmp_path / "slides.pdf"
+    legacy.write_bytes(uuid.uuid4().bytes * 32)
+    professor = make_professor(db)
+    project = make_project(db, professor)
+    resources = [
+        ProjectResource(project_id=project.id, filename="slides.pdf", file_path=str(legacy))
+        for _ in range(3)
+    ]
+    db.add_all(resources)
+    team = make_team(db, make_student(db), project=project, status=TeamStatusEnum.APPROVED)
+    submission = MilestoneSubmission(team_id=team.id, milestone_id=project.milestones[0].id)
+    db.add(submission)
+    db.flush()
+    document = SubmissionDocument(
+        submission_id=submission.id, filename="slides.pdf", file_path=str(legacy)
+    )
+    db.add(document)
+    db.commit()
+
+    # Batches of one: the shared path spans several batches
+    counts = migrate_legacy_files(db, ProjectResource, delete_local=True, batch_size=1)
+    assert counts["missing"] == 0
+    assert counts["migrated"] >= 3
+    # The submission document has not been migrated yet
+    assert legacy.exists()
+
+    migrate_legacy_files(db, SubmissionDocument, delete_local=True, batch_size=1)
+    assert not legacy.exists()
+
+    db.expire_all()
+    keys = {row.file_path for row in (*resources, document)}
+    assert len(keys) == 1
+    assert all(row.content_hash for row in (*resources, document))
+    assert get_storage().exists(keys.pop())
@@ -0,0 +1,51 @@
+from app.database.models.user_models import User
+from app.utils.settings import settings
+
+from conftest import make_student
+
+
+def test_lists_default_to_one_page(client, db):
+    for _ in range(settings.DEFAULT_PAGE_SIZE + 5):
+        make_student(db)
+
+    response = client.get("/api/users/users")
+    assert response.status_code == 200
+    assert len(response.json()) == settings.DEFAULT_PAGE_SIZE
+    assert response.headers["X-Next-Cursor"]
+
+
+def test_limit_is_capped(client):
+    response = client.get("/api/users/users", params={"limit": settings.MAX_PAGE_SIZE + 1})
+    assert response.status_code == 422
+
+
+def test_pages_follow_the_next_cursor(client, db):
+    for _ in range(7):
+        make_student(db)
+    total = db.query(User).count()
+
+    seen = []
+    params = {"limit": 5}
+    while True:
+        response = client.get("/api/users/users", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 5
+        seen.extend(user["id"] for user in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"cursor": cursor, "limit": 5}
+
+    assert len(seen) == total
+    assert seen == sorted(set(seen))
+
+
+def test_next_cursor_header_is_exposed_to_browsers(client):
+    response = client.get(
+        "/api/users/users",
+        params={"limit": 1},
+        headers={"Origin": "http://localhost:5173"},
+    )
+    exposed = response.headers["access-control-expose-headers"]
+    assert "X-Next-Cursor" in exposed
@@ -0,0 +1,136 @@
+from fastapi.encoders import jsonable_encoder
+
+from app.database.models.project_models import (
+    Milestone,
+    MilestoneSubmission,
+    Project,
+    ProjectTeam,
+    SubmissionDocument,
+    TeamMember,
+)
+from app.schemas.enum_schemas import TeamStatusEnum
+
+from conftest import auth_headers, make_professor, make_project, make_student, make_team
+
+
+def reference_submissions(db, professor_id):
+    """The per-row listing the endpoint used to build, as the expected output."""
+    project_ids = [
+        project.id for project in db.query(Project).filter(Project.professor_id == professor_id)
+    ]
+    milestones = {
+        milestone.id: milestone
+        for milestone in db.query(Milestone).filter(Milestone.project_id.in_(project_ids))
+    }
+    teams = {
+        team.id: team
+        for team in db.query(ProjectTeam).filter(ProjectTeam.project_id.in_(project_ids))
+    }
+    result = []
+    for submission in db.query(MilestoneSubmission).filter(
+        MilestoneSubmission.milestone_id.in_(milestones)
+    ).order_by(MilestoneSubmission.id):
+        milestone = milestones[submission.milestone_id]
+        team = teams.get(submission.team_id)
+        if team is None:
+            continue
+        members = (
+            db.query(TeamMember).filter(TeamMember.team_id == team.id).order_by(TeamMember.id)
+        )
+        documents = (
+            db.query(SubmissionDocument)
+            .filter(SubmissionDocument.submission_id == submission.id)
+            .order_by(SubmissionDocument.id)
+        )
+        result.append(
+            {
+                "submission_id": submission.id,
+                "milestone_id": milestone.id,
+                "milestone_title": milestone.title,
+                "project_id": milestone.project_id,
+                "team_id": team.id,
+                "team_name": team.name,
+                "team_members": [
+                    {
+                        "id": member.id,
+                        "student_id": member.student.id,
+                        "name": member.student.user.full_name,
+                        "email": member.student.user.email,
+                    }
+                    for member in members
+                ],
+                "submitted_at": submission.submitted_at,
+                "grade": submission.grade,
+                "feedback": submission.feedback,
+                "documents": [
+                    {
+                        "id": doc.id,
+                        "filename": doc.filename,
+                        "file_path": doc.file_path,
+                        "uploaded_at": doc.uploaded_at,
+                    }
+                    for doc in documents
+                ],
+                "is_graded": submission.grade is not None,
+            }
+        )
+    return jsonable_encoder(result)
+
+
+def submit_all(db, project, team, documents=2):
+    for milestone in project.milestones:
+        submission = MilestoneSubmission(team_id=team.id, milestone_id=milestone.id)
+        db.add(submission)
+        db.flush()
+        for n in range(documents):
+            db.add(
+                SubmissionDocument(
+                    submission_id=submission.id,
+                    filename=f"report_{n}.pdf",
+                    file_path=f"legacy/report_{submission.id}_{n}.pdf",
+                )
+            )
+    db.commit()
+
+
+def assigned_project(db, professor, milestones):
+    project = make_project(db, professor, milestones=milestones)
+    leader = make_student(db)
+    team = make_team(
+        db, leader, members=[make_student(db)], project=project, status=TeamStatusEnum.APPROVED
+    )
+    return project, team
+
+
+def test_professor_submissions_issue_a_fixed_number_of_queries(client, db, count_queries):
+    professor = make_professor(db)
+    headers = auth_headers(professor.user_id, "professor")
+    project, team = assigned_project(db, professor, milestones=1)
+    submit_all(db, project, team)
+    # Resolve the professor once so the identity cache is warm for both requests
+    client.get("/api/projects/professor/submissions", headers=headers)
+
+    with count_queries() as few:
+        response = client.get("/api/projects/professor/submissions", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    for _ in range(3):
+        project, team = assigned_project(db, professor, milestones=3)
+        submit_all(db, project, team)
+    # A team released from its project after submitting is not listed
+    project, team = assigned_project(db, professor, milestones=1)
+    submit_all(db, project, team)
+    team.project_id = None
+    team.status = TeamStatusEnum.REJECTED
+    db.commit()
+
+    with count_queries() as many:
+        response = client.get("/api/projects/professor/submissions", headers=headers)
+    assert response.status_code == 200
+    submissions = response.json()
+    assert len(submissions) == 10
+    assert all(len(submission["documents"]) == 2 for submission in submissions)
+    assert submissions == reference_submissions(db, professor.id)
+
+    assert many.count == few.count
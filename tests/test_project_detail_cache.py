@@ -0,0 +1,50 @@
+from conftest import (
+    apply_team,
+    auth_headers,
+    make_professor,
+    make_project,
+    make_student,
+    make_team,
+)
+
+
+def detail(client, project, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(f"/api/projects/get/{project.id}", headers=headers)
+
+
+def test_unchanged_detail_is_not_modified(client, db):
+    project = make_project(db, make_professor(db))
+    etag = detail(client, project).headers["ETag"]
+
+    assert detail(client, project, etag).status_code == 304
+
+
+def test_withdrawn_application_invalidates_the_detail(client, db):
+    project = make_project(db, make_professor(db))
+    leader = make_student(db)
+    team = make_team(db, leader)
+    application = apply_team(db, team, project)
+
+    before = detail(client, project)
+    assert [t["id"] for t in before.json()["teams"]] == [team.id]
+
+    response = client.post(
+        f"/api/projects/applications/withdraw/{application.id}",
+        headers=auth_headers(leader.user_id, "student"),
+    )
+    assert response.status_code == 200
+
+    after = detail(client, project, before.headers["ETag"])
+    assert after.status_code == 200
+    assert after.json()["teams"] == []
+
+
+def test_deleted_professor_invalidates_their_project_details(client, db):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+    etag = detail(client, project).headers["ETag"]
+
+    assert client.delete(f"/api/users/users/{professor.user_id}").status_code == 200
+
+    assert detail(client, project, etag).status_code == 200
@@ -0,0 +1,58 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.database.models.project_models import ProjectResource
+from app.utils.file_utils import upload_filename
+
+from conftest import auth_headers, make_professor, make_project
+
+
+def upload(client, professor, project, filename):
+    return client.post(
+        f"/api/projects/resources/{project.id}",
+        files={"file": (filename, b"resource contents", "application/pdf")},
+        headers=auth_headers(professor.user_id, "professor"),
+    )
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [
+        ("report.pdf", "report.pdf"),
+        ("notes/report.pdf", "report.pdf"),
+        ("C:\\Users\\me\\report.pdf", "report.pdf"),
+        ("../../report.pdf", "report.pdf"),
+    ],
+)
+def test_upload_filename_keeps_the_last_component(filename, expected):
+    assert upload_filename(UploadFile(io.BytesIO(), filename=filename)) == expected
+
+
+@pytest.mark.parametrize("filename", [None, "", " ", ".", "..", "notes/", "notes\\..", "a/../"])
+def test_upload_filename_rejects_names_without_a_file(filename):
+    with pytest.raises(HTTPException) as raised:
+        upload_filename(UploadFile(io.BytesIO(), filename=filename))
+    assert raised.value.status_code == 400
+
+
+def test_resource_upload_records_the_base_name(client, db):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+
+    response = upload(client, professor, project, "slides/intro.pdf")
+
+    assert response.status_code == 200
+    assert response.json()["filename"] == "intro.pdf"
+
+
+@pytest.mark.parametrize("filename", ["..", "slides/", "slides/.."])
+def test_resource_upload_without_a_file_name_is_a_bad_request(client, db, filename):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+
+    response = upload(client, professor, project, filename)
+
+    assert response.status_code == 400
+    assert db.query(ProjectResource).filter_by(project_id=project.id).count() == 0
@@ -0,0 +1,119 @@
+import io
+import os
+import time
+import uuid
+
+from sqlalchemy import event, text
+
+from app.database.db import SessionLocal, engine
+from app.database.models.storage_models import StoredBlob
+from app.services.storage_service import (
+    collect_garbage,
+    store_upload,
+    sweep_orphaned_objects,
+)
+from app.utils.object_storage import get_storage
+from fastapi import UploadFile
+
+
+def upload_of(content: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename="notes.txt")
+
+
+def unique_content() -> bytes:
+    return uuid.uuid4().bytes * 64
+
+
+def test_committed_uploads_are_kept_and_deduplicated(db):
+    content = unique_content()
+    first = store_upload(db, upload_of(content))
+    db.commit()
+    second = store_upload(db, upload_of(content))
+    db.commit()
+
+    assert second.storage_key == first.storage_key
+    assert second.ref_count == 2
+    assert get_storage().exists(first.storage_key)
+
+
+def test_rolled_back_uploads_leave_no_object(db):
+    blob = store_upload(db, upload_of(unique_content()))
+    key = blob.storage_key
+    assert get_storage().exists(key)
+
+    db.rollback()
+
+    assert not get_storage().exists(key)
+
+
+def test_uploads_of_a_session_closed_without_commit_leave_no_object():
+    session = SessionLocal()
+    key = store_upload(session, upload_of(unique_content())).storage_key
+    session.close()
+
+    assert not get_storage().exists(key)
+
+
+def test_garbage_collection_deletes_unreferenced_blobs(db):
+    blob = store_upload(db, upload_of(unique_content()))
+    blob.ref_count = 0
+    db.commit()
+    key = blob.storage_key
+
+    assert collect_garbage(db) >= 1
+    assert db.query(StoredBlob).filter_by(storage_key=key).count() == 0
+    assert not get_storage().exists(key)
+
+
+def test_garbage_collection_keeps_blobs_referenced_during_the_scan(db):
+    blob = store_upload(db, upload_of(unique_content()))
+    blob.ref_count = 0
+    db.commit()
+    blob_id, key = blob.id, blob.storage_key
+
+    raced = []
+
+    def upload_references_blob(conn, cursor, statement, *args):
+        # Another request re-uses the content between the scan and the delete
+        if statement.startswith("DELETE FROM stored_blobs") and not raced:
+            raced.append(statement)
+            with engine.begin() as other:
+                other.execute(
+                    text("UPDATE stored_blobs SET ref_count = ref_count + 1 WHERE id = :id"),
+                    {"id": blob_id},
+                )
+
+    event.listen(engine, "before_cursor_execute", upload_references_blob)
+    try:
+        collect_garbage(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", upload_references_blob)
+
+    assert raced
+    db.expire_all()
+    assert db.get(StoredBlob, blob_id).ref_count == 1
+    assert get_storage().exists(key)
+
+
+def test_sweep_deletes_old_objects_without_a_row(db, tmp_path):
+    storage = get_storage()
+    source = tmp_path / "orphan"
+
+    def put(key, age):
+        source.write_bytes(b"orphaned")
+        storage.put_file(key, str(source))
+        modified = time.time() - age
+        os.utime(storage.local_path(key), (modified, modified))
+
+    old_orphan = f"blobs/00/00/{uuid.uuid4().hex}"
+    new_orphan = f"blobs/00/00/{uuid.uuid4().hex}"
+    put(old_orphan, age=7200)
+    put(new_orphan, age=0)
+    referenced = store_upload(db, upload_of(unique_content()))
+    db.commit()
+    os.utime(storage.local_path(referenced.storage_key), (0, 0))
+
+    assert sweep_orphaned_objects(db, grace_seconds=3600) == 1
+    assert not storage.exists(old_orphan)
+    assert storage.exists(new_orphan)
+    assert storage.exists(referenced.storage_key)
@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from app.database.db import SessionLocal
+from app.database.models.project_models import ProjectTeam, TeamApplication
+from app.schemas.enum_schemas import TeamStatusEnum
+from app.services.project_service import approve_team_application
+
+from conftest import apply_team, make_professor, make_project, make_student, make_team
+
+
+@pytest.mark.parametrize("attempt", range(5))
+def test_concurrent_approvals_have_exactly_one_winner(db, attempt):
+    professor = make_professor(db)
+    project = make_project(db, professor)
+    applications = [
+        apply_team(db, make_team(db, make_student(db)), project).id for _ in range(2)
+    ]
+    start = threading.Barrier(len(applications))
+
+    def approve(application_id):
+        session = SessionLocal()
+        try:
+            start.wait()
+            return approve_team_application(session, application_id, professor.id)
+        except HTTPException as exc:
+            return exc
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=len(applications)) as pool:
+        results = list(pool.map(approve, applications))
+
+    winners = [result for result in results if isinstance(result, dict)]
+    losers = [result for result in results if isinstance(result, HTTPException)]
+    assert len(winners) == 1
+    assert len(losers) == 1
+    assert losers[0].status_code == 400
+    assert losers[0].detail == "This project already has an approved team"
+
+    db.expire_all()
+    assigned = db.query(ProjectTeam).filter(ProjectTeam.project_id == project.id).all()
+    assert [team.id for team in assigned] == [winners[0]["team_id"]]
+    assert assigned[0].status == TeamStatusEnum.APPROVED
+    statuses = {
+        application.id: application.status
+        for application in db.query(TeamApplication).filter(
+            TeamApplication.project_id == project.id
+        )
+    }
+    assert statuses[winners[0]["id"]] == TeamStatusEnum.APPROVED
+    assert sorted(statuses.values()) == sorted(
+        [TeamStatusEnum.APPROVED, TeamStatusEnum.REJECTED]
+    )